@@ -0,0 +1,174 @@
+"""
+Micro-benchmark of the example parsers against the previous regex implementation.
+
+Compares, on the answers in bench/data/recorded_responses.json:
+
+    legacy   the nested lazy DOTALL regexes plus per-field re.sub passes that
+             _parse_examples / generate_word_examples used before
+    parser   example_parser.LabeledExampleParser plus the single-pass cleaners
+
+Only extraction and text cleaning are timed; validation is the same for both.
+It also reports whether both produce the same examples, and times both on
+malformed answers of growing size to show how the cost scales.
+
+Usage:
+    python bench/bench_parser.py
+    python bench/bench_parser.py --number 2000 --sizes 2000 8000 32000
+
+Reference run (1 vCPU sandbox, Python 3.9, --number 3000):
+
+    recorded answer                      legacy µs   parser µs   speedup   same
+    examples/plain                           61.6        39.5      1.6x    yes
+    examples/markdown                        97.2        59.6      1.6x    no (1)
+    examples/numbered_without_context        66.9        48.2      1.4x    yes
+    examples/truncated                       84.2        49.7      1.7x    yes
+    homonym_examples/kiku                    41.1        26.3      1.6x    yes
+    word_examples/nomu                       42.8        33.3      1.3x    yes
+
+    (1) with bold labels ("**Japanese:**") the legacy regexes keep the "**"
+        markers in every field; the parser strips them.
+
+    malformed answer ("Context:" blocks without the other labels)
+    size (chars)     legacy ms    parser ms
+    2000                 6.00         0.06
+    8000                81.40         0.16
+    32000             1367.56         0.72
+
+The legacy cost grows quadratically on malformed input because every
+"Context:" restarts a scan to the end of the text; the parser stays linear.
+"""
+import os
+import re
+import sys
+import json
+import timeit
+import argparse
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "japan"))
+
+from example_parser import (  # noqa: E402
+    EXAMPLE_PARSER, NUMBERED_EXAMPLE_PARSER, HOMONYM_EXAMPLE_PARSER, WORD_EXAMPLE_PARSER,
+    clean_japanese_sentence, clean_korean_translation
+)
+
+DATA_PATH = os.path.join(REPO_DIR, "bench", "data", "recorded_responses.json")
+
+
+# ---------------------------------------------------------------------------
+# Previous implementation (extraction and cleaning only)
+# ---------------------------------------------------------------------------
+
+def legacy_clean_example(context: str, japanese: str, korean: str) -> dict:
+    japanese = re.sub(r'\s*\([^)]*\)', '', japanese)
+    korean = re.sub(r'[ぁ-んァ-ン一-龥]', '', korean)
+    korean = re.sub(r'\d+\.\s*\*+', '', korean)
+    korean = re.sub(r'^\d+\.\s*', '', korean)
+    korean = re.sub(r'\n{2,}', '\n', korean)
+    return {"context": context.strip(), "japanese": japanese.strip(), "korean": korean.strip()}
+
+
+def legacy_examples(text: str) -> list:
+    main_pattern = r'(?:\d+\.\s*)?Context:\s*(.*?)\s*Japanese:\s*(.*?)\s*Korean:\s*(.*?)(?=\s*(?:\d+\.\s*)?Context:|\s*$)'
+    examples = [legacy_clean_example(*match) for match in re.findall(main_pattern, text, re.DOTALL)]
+    if not examples:
+        numbered_pattern = r'(\d+)\.[\s\n]+(.*?)[\s\n]+Japanese:[\s\n]+(.*?)[\s\n]+Korean:[\s\n]+(.*?)(?=[\s\n]+\d+\.|\s*$)'
+        examples = [legacy_clean_example(*match[1:]) for match in re.findall(numbered_pattern, text, re.DOTALL)]
+    return examples
+
+
+def legacy_homonym_examples(text: str) -> list:
+    pattern = r'(?:\d+\.\s*)?Context:\s*(.*?)\s*Japanese:\s*(.*?)\s*Korean:\s*(.*?)\s*Explanation:\s*(.*?)(?=\s*(?:\d+\.\s*)?Context:|\s*$)'
+    examples = []
+    for context, japanese, korean, explanation in re.findall(pattern, text, re.DOTALL):
+        explanation = explanation.strip().split('\n')[0].strip()
+        examples.append({"japanese": japanese.strip(), "korean": korean.strip(), "explanation": explanation})
+    return examples
+
+
+def legacy_word_examples(text: str) -> list:
+    pattern = r'(?:\d+\.\s*)?Japanese:\s*(.*?)\s*Korean:\s*(.*?)\s*Explanation:\s*(.*?)(?=\s*(?:\d+\.\s*)?Japanese:|\s*$)'
+    return [
+        {"japanese": japanese.strip(), "korean": korean.strip(), "explanation": explanation.strip()}
+        for japanese, korean, explanation in re.findall(pattern, text, re.DOTALL)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Current implementation
+# ---------------------------------------------------------------------------
+
+def clean_example(match: dict) -> dict:
+    return {
+        "context": match["context"],
+        "japanese": clean_japanese_sentence(match["japanese"]).strip(),
+        "korean": clean_korean_translation(match["korean"]).strip(),
+    }
+
+
+def parser_examples(text: str) -> list:
+    examples = [clean_example(match) for match in EXAMPLE_PARSER.parse(text)]
+    if not examples:
+        examples = [clean_example(match) for match in NUMBERED_EXAMPLE_PARSER.parse_numbered(text, "context")]
+    return examples
+
+
+def parser_homonym_examples(text: str) -> list:
+    return [
+        {"japanese": match["japanese"], "korean": match["korean"], "explanation": match["explanation"].split('\n')[0].strip()}
+        for match in HOMONYM_EXAMPLE_PARSER.parse(text)
+    ]
+
+
+def parser_word_examples(text: str) -> list:
+    return WORD_EXAMPLE_PARSER.parse(text)
+
+
+IMPLEMENTATIONS = {
+    "examples": (legacy_examples, parser_examples),
+    "homonym_examples": (legacy_homonym_examples, parser_homonym_examples),
+    "word_examples": (legacy_word_examples, parser_word_examples),
+}
+
+
+def time_call(function, text: str, number: int) -> float:
+    """Best of three runs, in seconds per call."""
+    return min(timeit.repeat(lambda: function(text), number=number, repeat=3)) / number
+
+
+def malformed_answer(size: int) -> str:
+    block = "1. Context: The model stopped writing labels after this line and kept going "
+    return (block * (size // len(block) + 1))[:size]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Example parser micro-benchmark")
+    parser.add_argument("--number", type=int, default=1000, help="calls per timing run")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 8000, 32000])
+    args = parser.parse_args(argv)
+
+    with open(DATA_PATH, encoding="utf-8") as f:
+        recorded = json.load(f)
+
+    print(f"{'recorded answer':<36} {'legacy µs':>10} {'parser µs':>10} {'speedup':>8}  same")
+    for kind, (legacy, current) in IMPLEMENTATIONS.items():
+        for response in recorded[kind]:
+            text = response["text"]
+            legacy_time = time_call(legacy, text, args.number)
+            parser_time = time_call(current, text, args.number)
+            same = "yes" if legacy(text) == current(text) else "no"
+            print(f"{kind + '/' + response['name']:<36} {legacy_time * 1e6:>10.1f} {parser_time * 1e6:>10.1f} "
+                  f"{legacy_time / parser_time:>7.1f}x  {same}")
+
+    print()
+    print(f"{'malformed answer size':<36} {'legacy ms':>10} {'parser ms':>10}")
+    for size in args.sizes:
+        text = malformed_answer(size)
+        number = max(1, args.number // 100)
+        legacy_time = time_call(legacy_examples, text, number)
+        parser_time = time_call(parser_examples, text, number)
+        print(f"{size:<36} {legacy_time * 1e3:>10.2f} {parser_time * 1e3:>10.2f}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,187 @@
+"""
+HTTP throughput benchmark for main_app against the stub LLM backend.
+
+Starts main_app in a subprocess with LLM_BACKEND=stub (every Gemini call is
+answered in-process after STUB_LLM_LATENCY seconds) with the caches, the
+example pool, single-flight coalescing and the rate limiter disabled, so
+each request goes through the full generation path. It then sends
+requests from a pool of keep-alive client threads and reports requests/sec
+and latency percentiles.
+
+Usage:
+    python bench/bench_server.py --mode production --concurrency 64 --requests 2000
+    python bench/bench_server.py --mode development --concurrency 64 --requests 500
+
+Options such as worker and thread counts are passed through the environment
+(WEB_CONCURRENCY, GUNICORN_THREADS, STUB_LLM_LATENCY, ...), see
+japan/gunicorn_conf.py.
+
+Reference run (1 vCPU sandbox, client and server on the same core,
+STUB_LLM_LATENCY=0.5, POST /api/generate, settings of build_server_env):
+
+    mode          workers x threads   clients   requests   req/s   p50      p99
+    development   1 x unbounded       64        1000       111     0.55 s   0.64 s
+    production    2 x 64              64        1000       122     0.49 s   0.70 s
+    development   1 x unbounded       256       3000       162     1.51 s   1.98 s
+    production    1 x 64              256       3000       114     2.19 s   2.49 s
+    production    2 x 64              256       3000       152     1.54 s   1.93 s
+    production    3 x 32              256       3000       143     1.57 s   2.33 s
+
+With 64 clients every configuration reaches the stub-latency bound
+(64 / 0.5 s = 128 req/s). At 256 clients a single core saturates at
+150-160 req/s and more workers only add contention; throughput then scales
+with the number of cores, which the single-process development server
+cannot use. A worker serves at most ``threads`` requests at once, so keep
+workers x threads above the expected number of concurrent clients.
+"""
+import os
+import sys
+import time
+import json
+import socket
+import argparse
+import threading
+import statistics
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(REPO_DIR, "japan")
+
+ENDPOINTS = {
+    "generate": ("/api/generate", {"word": "食べる", "level": "n3"}),
+    "homonym": ("/api/homonym", {"word": "きく", "level": "n3"}),
+}
+
+
+def build_server_env(args: argparse.Namespace) -> dict:
+    """
+    Environment for the server process: stub LLM, required settings filled in.
+
+    Caches, the example pool, single-flight coalescing and the client-side
+    rate limiter are turned off so that every request reaches the LLM.
+    """
+    env = dict(os.environ)
+    env.update({
+        "SERVE_MODE": args.mode,
+        "HOST": "127.0.0.1",
+        "PORT": str(args.port),
+        "LLM_BACKEND": "stub",
+        "LLM_CACHE_ENABLED": "false",
+        "HOMONYM_RESULT_CACHE_ENABLED": "false",
+        "HOMONYM_NEGATIVE_CACHE_ENABLED": "false",
+        "EXAMPLE_POOL_ENABLED": "false",
+        "SINGLE_FLIGHT_ENABLED": "false",
+        "LLM_RATE_LIMIT_ENABLED": "false",
+        "GUNICORN_ACCESS_LOG": "",
+        "PYTHONPATH": os.pathsep.join([REPO_DIR, APP_DIR]),
+    })
+    for key, value in (
+            ("GEMINI_API_KEY", "stub"),
+            ("MODEL_NAME", "gemini-pro"),
+            ("DEFAULT_TEMPERATURE", "0.7"),
+            ("DEFAULT_DIFFICULTY", "n3"),
+            ("DEFAULT_NUM_EXAMPLES", "5"),
+            ("MAX_RETRIES", "3"),
+    ):
+        env.setdefault(key, value)
+    return env
+
+
+def wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not start listening on port {port}")
+
+
+def run_load(url: str, payload: dict, concurrency: int, total: int) -> dict:
+    """Send ``total`` POST requests from ``concurrency`` keep-alive sessions."""
+    local = threading.local()
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+
+    def one_request(_) -> tuple:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            response = session.post(url, data=body, headers=headers, timeout=120)
+            ok = response.status_code == 200
+        except requests.RequestException:
+            ok = False
+        return ok, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one_request, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for ok, latency in results if ok)
+    errors = sum(1 for ok, _ in results if not ok)
+
+    def percentile(p: float) -> float:
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "elapsed": round(elapsed, 2),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "p50": round(percentile(0.50), 3),
+        "p95": round(percentile(0.95), 3),
+        "p99": round(percentile(0.99), 3),
+        "mean": round(statistics.mean(latencies), 3) if latencies else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="main_app throughput benchmark (stub LLM)")
+    parser.add_argument("--mode", choices=["production", "development"], default="production")
+    parser.add_argument("--endpoint", choices=sorted(ENDPOINTS), default="generate")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--port", type=int, default=3900)
+    args = parser.parse_args(argv)
+
+    path, payload = ENDPOINTS[args.endpoint]
+    url = f"http://127.0.0.1:{args.port}{path}"
+
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(APP_DIR, "main_app.py")],
+        env=build_server_env(args),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(args.port)
+        run_load(url, payload, args.concurrency, args.warmup)
+        result = run_load(url, payload, args.concurrency, args.requests)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    result.update({
+        "mode": args.mode,
+        "endpoint": path,
+        "concurrency": args.concurrency,
+        "stub_latency": float(os.getenv("STUB_LLM_LATENCY", 0.5)),
+    })
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,149 @@
+import os
+import asyncio
+import logging
+import threading
+import contextvars
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_in_context(context: contextvars.Context, awaitable: Awaitable) -> Any:
+    """Run an awaitable with the caller's context variables applied."""
+    for variable, value in context.items():
+        variable.set(value)
+    return await awaitable
+
+
+class BackgroundLoop:
+    """
+    One long-lived asyncio event loop running in a daemon thread.
+
+    The synchronous APIs (Flask views, CLI) hand their coroutines to this loop
+    and wait for the result, so every Gemini call of the process shares one
+    loop and one async transport, and many generations can be in flight at
+    once. Context variables of the calling thread are carried into the
+    coroutine. The loop is started lazily and restarted in a forked worker.
+    """
+
+    def __init__(self, name: str = "llm-event-loop"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._pid = None
+
+    def _run_loop(self, loop: asyncio.AbstractEventLoop, started: threading.Event):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the running background loop, starting it if needed."""
+        with self._lock:
+            if (self._loop is not None and self._pid == os.getpid()
+                    and self._thread is not None and self._thread.is_alive()):
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+            thread = threading.Thread(target=self._run_loop, args=(loop, started), name=self.name, daemon=True)
+            thread.start()
+            started.wait()
+
+            self._loop = loop
+            self._thread = thread
+            self._pid = os.getpid()
+            logger.debug(f"Started background event loop '{self.name}' in process {self._pid}")
+            return loop
+
+    def in_loop_thread(self) -> bool:
+        """Whether the caller is running on the background loop thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, awaitable: Awaitable) -> Future:
+        """
+        Schedule a coroutine on the background loop without waiting for it.
+
+        Args:
+            awaitable: Coroutine to run
+
+        Returns:
+            concurrent.futures.Future with the coroutine's result
+        """
+        context = contextvars.copy_context()
+        return asyncio.run_coroutine_threadsafe(_run_in_context(context, awaitable), self.get_loop())
+
+    def run(self, awaitable: Awaitable, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the background loop and block until it finishes.
+
+        Args:
+            awaitable: Coroutine to run
+            timeout: Optional number of seconds to wait
+
+        Returns:
+            The coroutine's result (exceptions are re-raised)
+        """
+        if self.in_loop_thread():
+            # 루프 스레드에서 동기 API를 부르면 자기 자신을 기다리며 멈춤
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise RuntimeError("Synchronous API called from the event loop; use the async variant instead")
+
+        future = self.submit(awaitable)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def iterate(self, async_iterator: AsyncIterator) -> Iterator:
+        """
+        Consume an async iterator from synchronous code, one item at a time.
+
+        Args:
+            async_iterator: Async generator to drain on the background loop
+
+        Yields:
+            Items produced by the async iterator
+        """
+        context = contextvars.copy_context()
+        loop = self.get_loop()
+
+        try:
+            while True:
+                future = asyncio.run_coroutine_threadsafe(
+                    _run_in_context(context, async_iterator.__anext__()), loop
+                )
+                try:
+                    yield future.result()
+                except StopAsyncIteration:
+                    return
+        finally:
+            # 소비자가 중간에 멈추면 (예: 클라이언트 연결 종료) 비동기 제너레이터도 정리
+            close = getattr(async_iterator, "aclose", None)
+            if close is not None:
+                try:
+                    asyncio.run_coroutine_threadsafe(close(), loop).result(timeout=5)
+                except Exception:
+                    pass
+
+
+# 프로세스 전체에서 공유하는 백그라운드 이벤트 루프
+background_loop = BackgroundLoop()
+
+
+def run_sync(awaitable: Awaitable, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine from synchronous code on the shared background loop.
+
+    Args:
+        awaitable: Coroutine to run
+        timeout: Optional number of seconds to wait
+
+    Returns:
+        The coroutine's result
+    """
+    return background_loop.run(awaitable, timeout)
@@ -0,0 +1,325 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CacheConfig:
+    """LLM 응답 캐시 설정"""
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(BASE_DIR, ".cache", "llm_cache.sqlite3"))
+    LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 7 * 24 * 60 * 60))  # seconds
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 50000))
+
+    # 매 쓰기마다 정리하지 않고 일정 횟수마다 LRU 정리 수행
+    PRUNE_INTERVAL = 64
+
+
+class SQLiteTTLCache:
+    """
+    Persistent key-value cache backed by a single SQLite table.
+
+    Entries expire after ``ttl`` seconds and the table is kept under
+    ``max_entries`` rows by evicting the least recently used entries.
+    Connections are opened lazily per thread (and per process, so the cache
+    keeps working after a fork), and every operation swallows SQLite errors:
+    a broken cache must never break the request that uses it. Code running
+    on the event loop uses get_async()/set_async().
+    """
+
+    def __init__(
+            self,
+            path: str,
+            table: str,
+            ttl: int = CacheConfig.LLM_CACHE_TTL,
+            max_entries: int = CacheConfig.LLM_CACHE_MAX_ENTRIES
+    ):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes_since_prune = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the table on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "last_access REAL NOT NULL, "
+            "hit_count INTEGER NOT NULL DEFAULT 0)"
+        )
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.table}_last_access ON {self.table} (last_access)"
+        )
+
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None on a miss, an expired entry or a cache error
+        """
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+
+            now = time.time()
+            if row is None:
+                self._count(hit=False)
+                return None
+
+            value, created_at = row
+            if self.ttl > 0 and now - created_at > self.ttl:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._count(hit=False)
+                return None
+
+            conn.execute(
+                f"UPDATE {self.table} SET last_access = ?, hit_count = hit_count + 1 WHERE key = ?",
+                (now, key)
+            )
+            self._count(hit=True)
+            return json.loads(value)
+
+        except Exception as e:
+            logger.warning(f"Cache lookup failed ({self.table}): {e}")
+            self._count(hit=False)
+            return None
+
+    def set(self, key: str, value: Any):
+        """
+        Store a JSON-serializable value, evicting old entries when needed.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        try:
+            conn = self._connect()
+            now = time.time()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, last_access, hit_count) "
+                "VALUES (?, ?, ?, ?, 0)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+
+            with self._lock:
+                self._writes_since_prune += 1
+                should_prune = self._writes_since_prune >= CacheConfig.PRUNE_INTERVAL
+                if should_prune:
+                    self._writes_since_prune = 0
+
+            if should_prune:
+                self.prune()
+
+        except Exception as e:
+            logger.warning(f"Cache write failed ({self.table}): {e}")
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """get() in a worker thread, so the SQLite read does not block the event loop."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key: str, value: Any):
+        """set() in a worker thread, so the SQLite write does not block the event loop."""
+        await asyncio.to_thread(self.set, key, value)
+
+    def delete(self, key: str):
+        """Remove a single entry."""
+        try:
+            self._connect().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+        except Exception as e:
+            logger.warning(f"Cache delete failed ({self.table}): {e}")
+
+    def prune(self):
+        """Drop expired entries and trim the table to ``max_entries`` by LRU order."""
+        try:
+            conn = self._connect()
+            if self.ttl > 0:
+                conn.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl,))
+
+            if self.max_entries > 0:
+                # 최근 사용 순으로 max_entries개를 남기고 나머지 삭제
+                conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f"SELECT key FROM {self.table} ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+        except Exception as e:
+            logger.warning(f"Cache prune failed ({self.table}): {e}")
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        try:
+            self._connect().execute(f"DELETE FROM {self.table}")
+        except Exception as e:
+            logger.warning(f"Cache clear failed ({self.table}): {e}")
+
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report hit/miss counters for this process and the current table size.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and entries
+        """
+        with self._lock:
+            hits, misses = self._hits, self._misses
+
+        try:
+            entries = self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        except Exception:
+            entries = None
+
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl
+        }
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with per-entry expiry and LRU eviction.
+
+    Used for small, hot result sets where a SQLite round-trip is not worth it.
+    Values are returned as stored, so callers should store data they will not
+    mutate afterwards.
+    """
+
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._data = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            stored_at, value = entry
+            if self.ttl > 0 and time.time() - stored_at > self.ttl:
+                del self._data[key]
+                self._misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries past max_entries."""
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+
+            while self.max_entries > 0 and len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        """Remove a single entry."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Report hit/miss counters and the current size."""
+        with self._lock:
+            hits, misses, entries = self._hits, self._misses, len(self._data)
+
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl
+        }
+
+
+def build_llm_cache_key(model_name: str, prompt: str, generation_config: Dict[str, Any]) -> str:
+    """
+    Build the cache key for one LLM call.
+
+    Args:
+        model_name: Gemini model name
+        prompt: Prompt text sent to the model
+        generation_config: Generation parameters (temperature, top_p, ...)
+
+    Returns:
+        Hex digest identifying (model, prompt hash, generation config)
+    """
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    key_source = json.dumps(
+        {"model": model_name, "prompt": prompt_hash, "config": generation_config},
+        sort_keys=True
+    )
+    return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+
+# 두 LLMService가 같은 파일/테이블을 공유
+llm_response_cache = SQLiteTTLCache(CacheConfig.LLM_CACHE_PATH, table="llm_responses")
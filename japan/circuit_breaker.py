@@ -0,0 +1,322 @@
+import os
+import time
+import logging
+import threading
+import contextvars
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Deque, Dict, Iterator, Optional, Tuple
+
+from retry_policy import ERROR_QUOTA, classify_error
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreakerConfig:
+    """Gemini 회로 차단기 설정 (오류율/지연 시간 기반)"""
+    ENABLED = os.getenv("LLM_CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+
+    # 최근 WINDOW_SECONDS 동안의 호출 결과로 판단 (MIN_CALLS 미만이면 판단하지 않음)
+    WINDOW_SECONDS = float(os.getenv("LLM_CIRCUIT_WINDOW_SECONDS", 60))
+    MIN_CALLS = int(os.getenv("LLM_CIRCUIT_MIN_CALLS", 5))
+
+    # 실패 비율 또는 느린 호출 비율이 기준 이상이면 차단 (open)
+    ERROR_RATE = float(os.getenv("LLM_CIRCUIT_ERROR_RATE", 0.5))
+    SLOW_CALL_SECONDS = float(os.getenv("LLM_CIRCUIT_SLOW_CALL_SECONDS", 15))
+    SLOW_CALL_RATE = float(os.getenv("LLM_CIRCUIT_SLOW_CALL_RATE", 0.8))
+
+    # 차단 유지 시간, 이후 시험 호출(half-open) 수
+    OPEN_SECONDS = float(os.getenv("LLM_CIRCUIT_OPEN_SECONDS", 30))
+    HALF_OPEN_CALLS = int(os.getenv("LLM_CIRCUIT_HALF_OPEN_CALLS", 2))
+
+
+# 회로 상태
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Gemini while the circuit is open."""
+
+
+class CircuitAttempt:
+    """Timer of one attempt let through by CircuitBreaker.guard()."""
+    __slots__ = ("started_at",)
+
+    def __init__(self):
+        self.started_at: Optional[float] = None
+
+    def start(self):
+        """Mark the moment the request is actually sent (after rate limiting)."""
+        self.started_at = time.monotonic()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at if self.started_at is not None else 0.0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker in front of the Gemini calls of both services.
+
+    closed: calls go through; the outcome and latency of every attempt in
+        the last WINDOW_SECONDS are kept. Once at least MIN_CALLS were made
+        and the share of failures (exceptions, timeouts) reaches ERROR_RATE,
+        or the share of calls slower than SLOW_CALL_SECONDS reaches
+        SLOW_CALL_RATE, the circuit opens.
+    open: calls fail at once with CircuitOpenError for OPEN_SECONDS, so
+        requests fall back to the database, caches and example pool instead
+        of waiting for the retry deadline.
+    half_open: up to HALF_OPEN_CALLS trial calls are let through. If they
+        all succeed in time the circuit closes with an empty window; any
+        failure or slow call opens it again.
+
+    Quota errors (429) are left to the rate limiter and do not count. The
+    state is kept per process.
+    """
+
+    def __init__(
+            self,
+            window_seconds: float = CircuitBreakerConfig.WINDOW_SECONDS,
+            min_calls: int = CircuitBreakerConfig.MIN_CALLS,
+            error_rate: float = CircuitBreakerConfig.ERROR_RATE,
+            slow_call_seconds: float = CircuitBreakerConfig.SLOW_CALL_SECONDS,
+            slow_call_rate: float = CircuitBreakerConfig.SLOW_CALL_RATE,
+            open_seconds: float = CircuitBreakerConfig.OPEN_SECONDS,
+            half_open_calls: int = CircuitBreakerConfig.HALF_OPEN_CALLS
+    ):
+        self.window_seconds = window_seconds
+        self.min_calls = max(1, min_calls)
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = max(1, half_open_calls)
+
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()  # (finished_at, failed, slow)
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        self._opened = 0
+        self._rejected = 0
+
+    def _transition(self, state: str, now: float):
+        """Change state (caller holds the lock)."""
+        if state == self._state:
+            return
+        previous, self._state = self._state, state
+        if state == STATE_OPEN:
+            self._opened_at = now
+            self._opened += 1
+            logger.warning(f"Gemini circuit {previous} -> open for {self.open_seconds:.0f}s")
+        else:
+            logger.info(f"Gemini circuit {previous} -> {state}")
+        if state != STATE_CLOSED:
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        else:
+            self._calls.clear()
+
+    def _current_state(self, now: float) -> str:
+        """State after moving an expired open circuit to half-open (caller holds the lock)."""
+        if self._state == STATE_OPEN and now - self._opened_at >= self.open_seconds:
+            self._transition(STATE_HALF_OPEN, now)
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected without trying Gemini."""
+        return self.state == STATE_OPEN
+
+    def allow(self) -> bool:
+        """
+        Decide whether a call may go to Gemini.
+
+        In half-open state this reserves one of the trial calls; the caller
+        must report the outcome with record() or release().
+
+        Returns:
+            False if the call must not be made
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == STATE_OPEN or (
+                    state == STATE_HALF_OPEN
+                    and self._probes_in_flight + self._probe_successes >= self.half_open_calls):
+                self._rejected += 1
+                return False
+            if state == STATE_HALF_OPEN:
+                self._probes_in_flight += 1
+            return True
+
+    def release(self):
+        """Give back a call allowed by allow() whose outcome says nothing about Gemini's health."""
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record(self, failed: bool, latency: float):
+        """
+        Report the outcome of a call allowed by allow().
+
+        Args:
+            failed: The call raised an error or timed out
+            latency: Seconds the call took
+        """
+        now = time.monotonic()
+        slow = latency >= self.slow_call_seconds
+
+        with self._lock:
+            state = self._current_state(now)
+
+            if state == STATE_HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed or slow:
+                    self._transition(STATE_OPEN, now)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_calls:
+                        self._transition(STATE_CLOSED, now)
+                return
+
+            if state == STATE_OPEN:
+                # 차단 전에 시작된 호출의 결과는 무시
+                return
+
+            self._calls.append((now, failed, slow))
+            while self._calls and now - self._calls[0][0] > self.window_seconds:
+                self._calls.popleft()
+
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for _, call_failed, _ in self._calls if call_failed)
+            slow_calls = sum(1 for _, _, call_slow in self._calls if call_slow)
+            if failures / total >= self.error_rate or slow_calls / total >= self.slow_call_rate:
+                self._transition(STATE_OPEN, now)
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[CircuitAttempt]:
+        """
+        Wrap one Gemini attempt (including a streamed answer).
+
+        Entered before the rate limiter, so a rejected call uses no rate
+        limit capacity. The caller calls ``start()`` on the yielded attempt
+        once the request is really sent; only from then on does the
+        attempt count. An exception raised after that counts as a failure
+        (quota errors and cancellation do not count); a normal exit, or a
+        stream the caller closed early, counts as a success. Latency is
+        measured from ``start()``. Anything that ends the block before
+        ``start()`` (e.g. no rate limit capacity) gives the call back.
+
+        Raises:
+            CircuitOpenError: The circuit is open (the block is not run)
+        """
+        attempt = CircuitAttempt()
+        if not CircuitBreakerConfig.ENABLED:
+            yield attempt
+            return
+
+        if not self.allow():
+            raise CircuitOpenError("Gemini circuit is open")
+
+        try:
+            yield attempt
+        except Exception as e:
+            if attempt.started_at is None or classify_error(e) == ERROR_QUOTA:
+                self.release()
+            else:
+                self.record(True, attempt.elapsed())
+            raise
+        except GeneratorExit:
+            # 필요한 만큼 받은 뒤 스트림을 닫은 경우 (Gemini는 정상 응답 중)
+            if attempt.started_at is None:
+                self.release()
+            else:
+                self.record(False, attempt.elapsed())
+            raise
+        except BaseException:
+            self.release()
+            raise
+        else:
+            if attempt.started_at is None:
+                self.release()
+            else:
+                self.record(False, attempt.elapsed())
+
+    def stats(self) -> Dict:
+        """
+        Report the breaker state.
+
+        Returns:
+            Dictionary with the state, the recent error/slow rates and counters
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            total = len(self._calls)
+            return {
+                "enabled": CircuitBreakerConfig.ENABLED,
+                "state": state,
+                "recent_calls": total,
+                "error_rate": round(sum(1 for _, failed, _ in self._calls if failed) / total, 4) if total else 0.0,
+                "slow_rate": round(sum(1 for _, _, slow in self._calls if slow) / total, 4) if total else 0.0,
+                "open_for": round(max(0.0, self._opened_at + self.open_seconds - now), 3)
+                if state == STATE_OPEN else 0.0,
+                "opened": self._opened,
+                "rejected": self._rejected
+            }
+
+
+class DegradedState:
+    """Whether the response of one request was built without a Gemini call it needed."""
+
+    def __init__(self):
+        self.degraded = False
+
+    def mark(self):
+        self.degraded = True
+
+
+_current_degraded: contextvars.ContextVar = contextvars.ContextVar("degraded_state", default=None)
+
+
+def mark_degraded():
+    """Record that the current request was served from fallbacks because Gemini was unavailable."""
+    state = _current_degraded.get()
+    if state is not None:
+        state.mark()
+
+
+@contextmanager
+def track_degraded(state: Optional[DegradedState] = None) -> Iterator[DegradedState]:
+    """
+    Collect degraded marks of the enclosed work.
+
+    Tasks started inside (asyncio.gather, run_sync) share the state, like
+    the request budget.
+
+    Args:
+        state: State to install (a new one by default)
+
+    Yields:
+        The installed state; check ``degraded`` after the work is done
+    """
+    state = state or DegradedState()
+    token = _current_degraded.set(state)
+    try:
+        yield state
+    finally:
+        _current_degraded.reset(token)
+
+
+# 두 서비스(homonym_processor, example_generator)의 모든 Gemini 호출이 공유
+llm_circuit_breaker = CircuitBreaker()
@@ -1,10 +1,25 @@
 import os
-import time
 import re
+import asyncio
+import functools
 from flask import Flask, request, jsonify
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, AsyncIterator, Set, Tuple
 import google.generativeai as genai
 from flask.cli import load_dotenv
+from gemini_client import gemini_clients
+from async_runtime import run_sync
+from cache_store import CacheConfig, build_llm_cache_key, llm_response_cache
+from circuit_breaker import CircuitOpenError, llm_circuit_breaker, mark_degraded
+from example_parser import (
+    ExampleBlockSplitter, EXAMPLE_PARSER, NUMBERED_EXAMPLE_PARSER, clean_japanese_sentence, clean_korean_translation
+)
+from example_pool import ExamplePool, ExamplePoolConfig
+from hedging import RequestHedger
+from request_budget import budget_exhausted, request_budget, spend_response_tokens
+from rate_limiter import llm_rate_limiter
+from retry_policy import RetryPolicy, RetrySchedule, wait_for_attempt
+from semantic_validator import semantic_validator
+from structured_output import EXAMPLES_SCHEMA, with_json_output, json_generation_config, loads_json, extract_examples
 
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -25,6 +40,15 @@ class Config:
     DEFAULT_NUM_EXAMPLES = int(os.getenv("DEFAULT_NUM_EXAMPLES"))
     MAX_RETRIES = int(os.getenv("MAX_RETRIES")) # seconds
 
+    # LLM 호출 하나의 전체 제한 시간 (모든 재시도와 대기 포함)
+    REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", 30))  # seconds
+
+    # 스트리밍 생성: 유효한 예문이 충분히 모이면 응답 생성을 중단
+    STREAMING_ENABLED = os.getenv("LLM_STREAMING_ENABLED", "true").lower() == "true"
+
+    # 출력 형식: "text" (Context/Japanese/Korean 레이블) 또는 "json" (스키마 지정 JSON, 실패 시 텍스트 파싱)
+    OUTPUT_FORMAT = os.getenv("LLM_OUTPUT_FORMAT", "text").lower()
+
     # JLPT 레벨 설명
     LEVEL_DESCRIPTIONS = {
         "n5": "Beginner level (N5) - Absolute beginner: Able to understand basic Japanese phrases and sentences when spoken slowly. Can read hiragana, katakana, and about 100 kanji. Vocabulary knowledge includes approximately 800 words covering basic needs and everyday situations. Can introduce oneself and engage in very simple conversations.",
@@ -234,54 +258,301 @@ class Config:
     }
 
 
+# 재시도 정책 (호출마다 Config.REQUEST_TIMEOUT 안에서 최대 Config.MAX_RETRIES번 시도)
+llm_retry_policy = RetryPolicy(max_attempts=Config.MAX_RETRIES, deadline=Config.REQUEST_TIMEOUT)
+
+# 느린 호출 헤징 (HedgingConfig.ENABLED일 때, 스트리밍 호출은 제외)
+llm_hedger = RequestHedger()
+
+
+class StreamState:
+    """Whether a Gemini stream was read to its end (not cut by the deadline or an error)."""
+    __slots__ = ("completed",)
+
+    def __init__(self):
+        self.completed = False
+
+
 class LLMService:
     """Service for interacting with the Gemini API."""
 
     @staticmethod
     def initialize_gemini():
-        """Initialize Gemini API."""
-        if not Config.GEMINI_API_KEY:
-            app.logger.error("API key not configured. Set GEMINI_API_KEY environment variable.")
-            return False
-
-        try:
-            genai.configure(api_key=Config.GEMINI_API_KEY)
-            return True
-        except Exception as e:
-            app.logger.error(f"Failed to initialize Gemini API: {str(e)}")
-            return False
+        """Initialize Gemini API (configured once per process)."""
+        return gemini_clients.configure(Config.GEMINI_API_KEY)
 
     @staticmethod
     def call_llm(
             prompt: str,
-            temperature: float = Config.DEFAULT_TEMPERATURE
+            temperature: float = Config.DEFAULT_TEMPERATURE,
+            use_cache: bool = True
     ) -> Optional[str]:
         """
         Call the Gemini API and get a response with improved response handling.
+
+        Synchronous wrapper around call_llm_async on the shared background event loop.
+        """
+        return run_sync(LLMService.call_llm_async(prompt, temperature, use_cache))
+
+    @staticmethod
+    async def call_llm_async(
+            prompt: str,
+            temperature: float = Config.DEFAULT_TEMPERATURE,
+            use_cache: bool = True,
+            json_output: bool = False
+    ) -> Optional[str]:
+        """
+        Asynchronous Gemini call with improved response handling.
+
+        Successful responses are served from the shared on-disk response cache
+        on repeat calls. Pass use_cache=False to always ask Gemini, and
+        json_output=True for a prompt that asks for a JSON answer.
+        """
+        generation_config = LLMService._build_generation_config(temperature, json_output)
+
+        cache_key = None
+        if use_cache and CacheConfig.LLM_CACHE_ENABLED:
+            cache_key = build_llm_cache_key(Config.MODEL_NAME, prompt, generation_config)
+            cached_response = await llm_response_cache.get_async(cache_key)
+            if cached_response is not None:
+                app.logger.debug("LLM response served from cache")
+                return cached_response
+
+        response_text = await LLMService._call_llm_uncached_async(prompt, generation_config)
+        spend_response_tokens(response_text)
+        await llm_rate_limiter.record_response(response_text)
+
+        if response_text and cache_key is not None:
+            await llm_response_cache.set_async(cache_key, response_text)
+
+        return response_text
+
+    @staticmethod
+    def _build_generation_config(temperature: float, json_output: bool = False) -> Dict:
+        """Generation parameters shared by the blocking and streaming calls."""
+        generation_config = {
+            "temperature": temperature,
+            "top_p": 0.95,
+            "top_k": 40,
+            "max_output_tokens": 2048
+        }
+        if json_output:
+            return json_generation_config(generation_config)
+        return generation_config
+
+    @staticmethod
+    async def stream_llm_async(
+            prompt: str,
+            temperature: float = Config.DEFAULT_TEMPERATURE,
+            use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Stream the Gemini response text chunk by chunk.
+
+        A cached response is yielded as a single chunk. A stream that is read
+        to the end is stored in the response cache under the same key as
+        call_llm_async; a stream the caller stops early is not, and closing it
+        stops the generation so the remaining tokens are never produced.
+
+        Args:
+            prompt: The input prompt to send to the model
+            temperature: Sampling temperature
+            use_cache: Set to False to always ask Gemini
+
+        Yields:
+            Response text chunks
+        """
+        generation_config = LLMService._build_generation_config(temperature)
+
+        cache_key = None
+        if use_cache and CacheConfig.LLM_CACHE_ENABLED:
+            cache_key = build_llm_cache_key(Config.MODEL_NAME, prompt, generation_config)
+            cached_response = await llm_response_cache.get_async(cache_key)
+            if cached_response is not None:
+                app.logger.debug("LLM response served from cache")
+                yield cached_response
+                return
+
+        chunks = []
+        state = StreamState()
+        stream = LLMService._stream_llm_uncached_async(prompt, generation_config, state)
+        try:
+            async for text in stream:
+                chunks.append(text)
+                yield text
+        finally:
+            # 호출자가 스트림을 닫으면 즉시 Gemini 스트림도 닫아 속도 제한 슬롯과 회로 차단기 시험 호출 반환
+            await stream.aclose()
+
+        # 끝까지 읽은 응답만 캐시 (마감 시간이나 오류로 끊긴 응답은 일부분이므로 저장하지 않음)
+        if state.completed and chunks and cache_key is not None:
+            await llm_response_cache.set_async(cache_key, "".join(chunks))
+
+    @staticmethod
+    def _chunk_text(chunk: Any) -> str:
+        """Extract the text of one streamed chunk (empty if it has none)."""
+        try:
+            return chunk.text
+        except Exception:
+            try:
+                if chunk.candidates and chunk.candidates[0].content and chunk.candidates[0].content.parts:
+                    return "".join(
+                        part.text for part in chunk.candidates[0].content.parts
+                        if hasattr(part, 'text') and part.text
+                    )
+            except Exception:
+                pass
+        return ""
+
+    @staticmethod
+    async def _stream_llm_uncached_async(
+            prompt: str,
+            generation_config: Dict,
+            state: Optional[StreamState] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a Gemini response with retries, bypassing the response cache.
+
+        The whole stream, retries included, must finish within
+        Config.REQUEST_TIMEOUT seconds; a stream cut by the deadline or by an
+        error after the first chunk ends with the chunks received so far.
+        Only a stream Gemini finished sets ``state.completed``. Nothing is
+        streamed while llm_circuit_breaker is open.
         """
         if not Config.GEMINI_API_KEY:
             app.logger.error("API key not configured. Set GEMINI_API_KEY environment variable.")
-            return None
+            return
+
+        if llm_circuit_breaker.is_open:
+            app.logger.warning("Gemini circuit is open, skipping LLM stream")
+            mark_degraded()
+            return
 
         # Initialize Gemini API if not already initialized
         LLMService.initialize_gemini()
 
-        retry_count = 0
+        schedule = llm_retry_policy.begin()
 
-        while retry_count < Config.MAX_RETRIES:
+        while schedule.start_attempt(prompt):
+            received = False
+            error = None
             try:
-                # Load the model
-                model = genai.GenerativeModel(Config.MODEL_NAME)
+                model = gemini_clients.get_model(Config.MODEL_NAME)
+
+                # 회로 차단기 확인 후 속도 제한 대기, 스트림을 끝까지 읽는 동안 슬롯 유지
+                async with llm_circuit_breaker.guard() as attempt, llm_rate_limiter.limit(prompt, schedule.remaining()):
+                    attempt.start()
+                    response = await wait_for_attempt(
+                        model.generate_content_async(
+                            prompt,
+                            generation_config=generation_config,
+                            stream=True
+                        ),
+                        schedule
+                    )
+
+                    chunks = response.__aiter__()
+                    while True:
+                        try:
+                            chunk = await wait_for_attempt(chunks.__anext__(), schedule)
+                        except StopAsyncIteration:
+                            break
+                        text = LLMService._chunk_text(chunk)
+                        if text:
+                            received = True
+                            spend_response_tokens(text)
+                            await llm_rate_limiter.record_response(text)
+                            yield text
+
+                if received:
+                    if state is not None:
+                        state.completed = True
+                    return
+                app.logger.error("Empty streamed response from Gemini API")
+
+            except CircuitOpenError:
+                app.logger.warning("Gemini circuit opened, giving up LLM stream")
+                mark_degraded()
+                return
+
+            except asyncio.TimeoutError:
+                app.logger.error(f"Gemini API streaming exceeded the {Config.REQUEST_TIMEOUT}s deadline")
+                return
+
+            except Exception as e:
+                app.logger.error(f"Gemini API streaming error: {str(e)}")
+                if received:
+                    # 이미 일부를 전달한 스트림은 처음부터 다시 보낼 수 없으므로 종료
+                    return
+                error = e
+
+            if not await schedule.backoff(error):
+                return
+
+    @staticmethod
+    def get_cache_stats() -> Dict:
+        """Get hit/miss counters of the LLM response cache."""
+        return llm_response_cache.stats()
+
+    @staticmethod
+    def get_hedge_stats() -> Dict:
+        """Get the hedging counters (calls, hedged calls, extra-call rate) of blocking calls."""
+        return llm_hedger.stats()
 
-                # Generate content
-                response = model.generate_content(
+    @staticmethod
+    async def _generate_once_async(model: Any, prompt: str, generation_config: Dict, schedule: RetrySchedule) -> Any:
+        """
+        Send one generate_content request.
+
+        Goes through the circuit breaker first (a rejected call uses no rate
+        limit capacity), then waits for the rate limiter; cancelled when the
+        call's deadline passes.
+        """
+        async with llm_circuit_breaker.guard() as attempt, llm_rate_limiter.limit(prompt, schedule.remaining()):
+            attempt.start()
+            return await wait_for_attempt(
+                model.generate_content_async(
                     prompt,
-                    generation_config={
-                        "temperature": temperature,
-                        "top_p": 0.95,
-                        "top_k": 40,
-                        "max_output_tokens": 2048
-                    }
+                    generation_config=generation_config
+                ),
+                schedule
+            )
+
+    @staticmethod
+    async def _call_llm_uncached_async(prompt: str, generation_config: Dict) -> Optional[str]:
+        """
+        Call the Gemini API with retries, bypassing the response cache.
+
+        Retries follow llm_retry_policy: jittered, non-blocking waits and a
+        hard deadline of Config.REQUEST_TIMEOUT seconds for the whole call.
+        A slow attempt may be hedged with a duplicate (see hedging.py).
+        Returns None at once while llm_circuit_breaker is open.
+        """
+        if not Config.GEMINI_API_KEY:
+            app.logger.error("API key not configured. Set GEMINI_API_KEY environment variable.")
+            return None
+
+        # Gemini 장애로 회로가 열려 있으면 재시도 없이 바로 대체 경로로
+        if llm_circuit_breaker.is_open:
+            app.logger.warning("Gemini circuit is open, skipping LLM call")
+            mark_degraded()
+            return None
+
+        # Initialize Gemini API if not already initialized
+        LLMService.initialize_gemini()
+
+        schedule = llm_retry_policy.begin()
+
+        while schedule.start_attempt(prompt):
+            try:
+                # Reuse the shared model instance
+                model = gemini_clients.get_model(Config.MODEL_NAME)
+
+                # Generate content (느린 응답은 중복 요청 후 먼저 끝난 응답 사용)
+                response = await llm_hedger.run(
+                    functools.partial(LLMService._generate_once_async, model, prompt, generation_config, schedule),
+                    schedule,
+                    prompt
                 )
 
                 if response:
@@ -320,16 +591,21 @@ class LLMService:
                 else:
                     app.logger.error("Empty response from Gemini API")
 
-                retry_count += 1
-                if retry_count < Config.MAX_RETRIES:
-                    time.sleep(2)
+                if not await schedule.backoff():
+                    return None
+
+            except CircuitOpenError:
+                app.logger.warning("Gemini circuit opened, giving up LLM call")
+                mark_degraded()
+                return None
+
+            except asyncio.TimeoutError:
+                app.logger.error(f"Gemini API call exceeded the {Config.REQUEST_TIMEOUT}s deadline")
+                return None
 
             except Exception as e:
                 app.logger.error(f"Gemini API call error: {str(e)}")
-                retry_count += 1
-                if retry_count < Config.MAX_RETRIES:
-                    time.sleep(2)
-                else:
+                if not await schedule.backoff(e):
                     return None
 
         return None
@@ -350,12 +626,100 @@ class JapaneseExampleGenerator:
     ) -> List[Dict[str, str]]:
         """
         Generate natural Japanese example sentences with guaranteed count.
+
+        Synchronous wrapper around generate_examples_async.
+        """
+        return run_sync(JapaneseExampleGenerator.generate_examples_async(
+            word, difficulty, num_examples, max_retries
+        ))
+
+    @staticmethod
+    async def generate_examples_async(
+            word: str,
+            difficulty: str = Config.DEFAULT_DIFFICULTY,
+            num_examples: int = Config.DEFAULT_NUM_EXAMPLES,
+            max_retries: int = 3
+    ) -> List[Dict[str, str]]:
+        """
+        Asynchronous variant of generate_examples.
+
+        With ExamplePoolConfig.ENABLED the examples are drawn from the
+        (word, level) example pool and the LLM is only called on the request
+        path when the pool does not hold enough examples yet; the pool is
+        refilled in the background (see example_pool.py). While the Gemini
+        circuit is open, whatever the pool holds is served even if it is
+        fewer than num_examples (the request is marked as degraded).
+        """
+        if ExamplePoolConfig.ENABLED:
+            pooled = example_pool.take(word, difficulty, num_examples, partial=llm_circuit_breaker.is_open)
+            if pooled is not None:
+                if len(pooled) < num_examples:
+                    mark_degraded()
+                return pooled
+
+        examples = await JapaneseExampleGenerator._generate_fresh_examples_async(
+            word, difficulty, num_examples, max_retries
+        )
+        if ExamplePoolConfig.ENABLED:
+            # 직접 생성한 예문도 풀에 추가 (이번 요청에서 한 번 제공된 것으로 기록)
+            example_pool.add(word, difficulty, JapaneseExampleGenerator._without_failures(examples), served=True)
+        return examples
+
+    @staticmethod
+    async def _fill_pool_async(word: str, difficulty: str, count: int) -> List[Dict[str, str]]:
+        """
+        Generate new examples for a background pool refill.
+
+        The LLM response cache is bypassed so that every refill brings
+        sentences the pool does not have yet. A refill has its own request
+        budget instead of sharing the one of the request that triggered it.
+        """
+        with request_budget():
+            examples = await JapaneseExampleGenerator._generate_fresh_examples_async(
+                word, difficulty, count, max_retries=1, use_cache=False
+            )
+        return JapaneseExampleGenerator._without_failures(examples)
+
+    @staticmethod
+    def _without_failures(examples: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Drop the failure placeholders returned when generation did not succeed."""
+        return [ex for ex in examples if
+                ex["japanese"] != "例文の生成に失敗しました。" and
+                ex["japanese"] != "適切な例文の生成に失敗しました。"]
+
+    @staticmethod
+    async def _generate_fresh_examples_async(
+            word: str,
+            difficulty: str,
+            num_examples: int,
+            max_retries: int = 3,
+            use_cache: bool = True
+    ) -> List[Dict[str, str]]:
+        """
+        Generate examples with the LLM (no example pool).
+
+        Stops retrying once the request budget (request_budget.py) is used up
+        or the Gemini circuit opens, and returns the largest partial result
+        collected so far.
+
+        Args:
+            word: Target Japanese word
+            difficulty: JLPT level (n5, n4, n3, n2, n1) or "standard"
+            num_examples: Number of examples to return
+            max_retries: Number of additional attempts after the first one
+            use_cache: Set to False to bypass the LLM response cache
         """
         # 더 많은 예문을 요청하여 필터링 후에도 충분히 남도록 함
         requested_num = min(num_examples + 3, 8)  # 3개 더 요청 (최대 8개)
 
+        # 예산 소진 등으로 중단될 때 반환할 가장 많은 예문
+        best_examples = []
+
         # 재시도 로직
         for attempt in range(max_retries + 1):
+            if attempt > 0 and (budget_exhausted() or llm_circuit_breaker.is_open):
+                break
+
             try:
                 # Get level-specific components
                 level_text = Config.LEVEL_DESCRIPTIONS.get(difficulty, Config.LEVEL_DESCRIPTIONS["standard"])
@@ -378,21 +742,19 @@ class JapaneseExampleGenerator:
                 )
 
                 # Call the language model and parse its response
-                response = LLMService.call_llm(prompt, temperature=temperature)
-
-                if not response:
-                    app.logger.warning(f"No response from LLM (attempt {attempt + 1}/{max_retries + 1})")
+                # (스트리밍 시 유효한 예문이 num_examples개 모이면 생성 중단)
+                valid_examples = [
+                    example async for example in JapaneseExampleGenerator._iter_valid_examples_async(
+                        prompt, temperature, word, num_examples, use_cache)
+                ]
+
+                if not valid_examples:
+                    app.logger.warning(f"No valid examples from LLM (attempt {attempt + 1}/{max_retries + 1})")
                     continue
 
-                # Parse examples from the response
-                examples = JapaneseExampleGenerator._parse_examples(response, word)
-
-                # 유효한 예시가 충분한지 확인
-                valid_examples = [ex for ex in examples if
-                                  ex["japanese"] != "例文の生成に失敗しました。" and
-                                  ex["japanese"] != "適切な例文の生成に失敗しました。"]
-
                 app.logger.info(f"Generated {len(valid_examples)} valid examples out of {num_examples} requested")
+                if len(valid_examples) > len(best_examples):
+                    best_examples = valid_examples
 
                 # 목표 개수에 도달했는지 확인
                 if len(valid_examples) >= num_examples:
@@ -400,7 +762,8 @@ class JapaneseExampleGenerator:
                     return valid_examples[:num_examples]
 
                 # 부족한 경우 추가 생성 시도
-                if len(valid_examples) > 0 and attempt < max_retries:
+                if (len(valid_examples) > 0 and attempt < max_retries
+                        and not budget_exhausted() and not llm_circuit_breaker.is_open):
                     remaining = num_examples - len(valid_examples)
                     app.logger.info(f"Need {remaining} more examples, attempting additional generation")
 
@@ -411,14 +774,12 @@ class JapaneseExampleGenerator:
                     )
 
                     additional_temp = min(0.95, temperature + 0.15)
-                    additional_response = LLMService.call_llm(additional_prompt, temperature=additional_temp)
-
-                    if additional_response:
-                        additional_examples = JapaneseExampleGenerator._parse_examples(additional_response, word)
-                        additional_valid = [ex for ex in additional_examples if
-                                            ex["japanese"] != "例文の生成に失敗しました。" and
-                                            ex["japanese"] != "適切な例文の生成に失敗しました。"]
+                    additional_valid = [
+                        example async for example in JapaneseExampleGenerator._iter_valid_examples_async(
+                            additional_prompt, additional_temp, word, remaining, use_cache)
+                    ]
 
+                    if additional_valid:
                         # 기존 예문과 합치기
                         valid_examples.extend(additional_valid)
                         app.logger.info(f"Added {len(additional_valid)} more examples, total: {len(valid_examples)}")
@@ -426,6 +787,8 @@ class JapaneseExampleGenerator:
                         # 목표 개수에 도달했으면 반환
                         if len(valid_examples) >= num_examples:
                             return valid_examples[:num_examples]
+                        if len(valid_examples) > len(best_examples):
+                            best_examples = valid_examples
 
                 # 여전히 부족한 경우 다음 시도로
                 if len(valid_examples) < max(1, int(num_examples * 0.5)):
@@ -441,6 +804,11 @@ class JapaneseExampleGenerator:
                 if attempt < max_retries:
                     continue
 
+        # 재시도가 끝났거나 예산이 소진된 경우 모아 둔 예문 중 가장 많은 결과 반환
+        if best_examples:
+            app.logger.warning(f"Returning {len(best_examples)} partial examples instead of {num_examples}")
+            return best_examples[:num_examples]
+
         # 모든 시도가 실패한 경우
         app.logger.error("All generation attempts failed")
         return [
@@ -451,6 +819,224 @@ class JapaneseExampleGenerator:
             }
         ]
 
+    @staticmethod
+    async def stream_examples_async(
+            word: str,
+            difficulty: str = Config.DEFAULT_DIFFICULTY,
+            num_examples: int = Config.DEFAULT_NUM_EXAMPLES,
+            max_retries: int = 3
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Stream validated examples as (event, data) pairs while they are generated.
+
+        Events:
+            example: {"index", context, japanese, korean} for each new valid example
+            done: {"count", "requested", "complete"} (plus "error" if nothing was generated)
+
+        Unlike generate_examples, examples from earlier attempts are kept
+        (they have already been sent), and later attempts only ask for the
+        missing ones.
+
+        When the example pool can serve the request, the pooled examples are
+        sent at once; otherwise the streamed examples are added to the pool.
+
+        Args:
+            word: Target Japanese word
+            difficulty: JLPT level (n5, n4, n3, n2, n1) or "standard"
+            num_examples: Number of examples to send
+            max_retries: Number of additional LLM rounds after the first one
+        """
+        level_text = Config.LEVEL_DESCRIPTIONS.get(difficulty, Config.LEVEL_DESCRIPTIONS["standard"])
+        instruction_detail = Config.DETAILED_INSTRUCTIONS.get(difficulty, Config.DETAILED_INSTRUCTIONS["standard"])
+        variation_instruction = Config.USAGE_VARIATIONS.get(difficulty, Config.USAGE_VARIATIONS["standard"])
+        korean_translation_guide = Config.KOREAN_TRANSLATION_GUIDELINES.get(
+            difficulty, Config.KOREAN_TRANSLATION_GUIDELINES["standard"])
+
+        if ExamplePoolConfig.ENABLED:
+            pooled = example_pool.take(word, difficulty, num_examples, partial=llm_circuit_breaker.is_open)
+            if pooled is not None:
+                if len(pooled) < num_examples:
+                    mark_degraded()
+                for index, example in enumerate(pooled):
+                    yield "example", {"index": index, **example}
+                yield "done", {
+                    "count": len(pooled), "requested": num_examples, "complete": len(pooled) >= num_examples
+                }
+                return
+
+        sent = 0
+        seen_sentences = set()
+        sent_examples = []
+
+        for attempt in range(max_retries + 1):
+            remaining = num_examples - sent
+            if remaining <= 0 or (attempt > 0 and (budget_exhausted() or llm_circuit_breaker.is_open)):
+                break
+
+            # 재시도일 경우 온도 값을 약간 변경하여 다양한 결과 유도
+            temperature = Config.DEFAULT_TEMPERATURE
+            if attempt > 0:
+                temperature = min(0.9, Config.DEFAULT_TEMPERATURE + 0.1 * attempt)
+
+            # 필터링 후에도 충분히 남도록 3개 더 요청 (최대 8개)
+            prompt = JapaneseExampleGenerator._build_example_prompt(
+                word, level_text, instruction_detail, variation_instruction, korean_translation_guide,
+                min(remaining + 3, 8)
+            )
+
+            examples = JapaneseExampleGenerator._iter_valid_examples_async(prompt, temperature, word, remaining)
+            try:
+                # 응답 스트림에서 예문 블록이 완성되는 대로 전달
+                async for example in examples:
+                    if example["japanese"] in seen_sentences:
+                        continue
+
+                    seen_sentences.add(example["japanese"])
+                    sent_examples.append(example)
+                    yield "example", {"index": sent, **example}
+                    sent += 1
+                    if sent >= num_examples:
+                        break
+            except Exception as e:
+                app.logger.error(f"Error during example streaming (attempt {attempt + 1}/{max_retries + 1}): {str(e)}")
+            finally:
+                await examples.aclose()
+
+        if ExamplePoolConfig.ENABLED and sent_examples:
+            example_pool.add(word, difficulty, sent_examples, served=True)
+
+        done = {"count": sent, "requested": num_examples, "complete": sent >= num_examples}
+        if not sent:
+            app.logger.error("All generation attempts failed")
+            done["error"] = "예문 생성에 실패했습니다."
+        yield "done", done
+
+    @staticmethod
+    async def _iter_valid_examples_async(
+            prompt: str,
+            temperature: float,
+            word: str,
+            limit: int,
+            use_cache: bool = True
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        Yield the valid examples of one LLM answer, at most ``limit`` of them.
+
+        With Config.STREAMING_ENABLED the answer is streamed and each
+        Context/Japanese/Korean block is parsed and semantically validated as
+        soon as it is complete; once ``limit`` examples have been yielded the
+        stream is closed, which stops the generation of the remaining
+        examples. Repeated sentences are dropped across blocks, and the
+        "keep unvalidated examples if the check rejected all of them" rule
+        of _finalize_parsed_examples is applied once, to the whole answer.
+        Answers without "Context:" blocks are parsed as a whole at the end.
+
+        With Config.OUTPUT_FORMAT == "json" the prompt asks for a JSON object
+        instead and the whole answer is decoded at once (a JSON document
+        cannot be split into examples before it is complete); answers that
+        are not valid JSON are parsed with the text patterns.
+
+        Args:
+            prompt: Example generation prompt
+            temperature: Sampling temperature
+            word: Target Japanese word
+            limit: Maximum number of examples to yield
+            use_cache: Set to False to bypass the LLM response cache
+
+        Yields:
+            Validated example dictionaries (context, japanese, korean)
+        """
+        json_output = Config.OUTPUT_FORMAT == "json"
+
+        def valid_examples(text: str) -> List[Dict[str, str]]:
+            examples = JapaneseExampleGenerator._parse_examples_json(text, word) if json_output else None
+            if examples is None:
+                examples = JapaneseExampleGenerator._parse_examples(text, word)
+            return [ex for ex in examples if
+                    ex["japanese"] != "例文の生成に失敗しました。" and
+                    ex["japanese"] != "適切な例文の生成に失敗しました。"]
+
+        if limit <= 0:
+            return
+
+        if json_output or not Config.STREAMING_ENABLED:
+            if json_output:
+                prompt = with_json_output(prompt, EXAMPLES_SCHEMA)
+            response = await LLMService.call_llm_async(
+                prompt, temperature=temperature, use_cache=use_cache, json_output=json_output)
+            if response:
+                for example in valid_examples(response)[:limit]:
+                    yield example
+            return
+
+        # 블록마다 의미 검증만 하고, 개수/중복 확인은 지금까지 모은 예문 전체를 기준으로 수행
+        seen_sentences = set()
+        rejected = []  # 의미 검증에서 걸러진 완전한 예문
+
+        def block_examples(block: str) -> List[Dict[str, str]]:
+            """Examples of one block that pass the semantic check and were not yielded before."""
+            examples = JapaneseExampleGenerator._filter_complete_examples(
+                JapaneseExampleGenerator._extract_examples(block), word)
+            if not examples:
+                return []
+            validated = [ex for ex in JapaneseExampleGenerator._validate_semantics(examples, word)
+                         if ex["japanese"] != "適切な例文の生成に失敗しました。"]
+            rejected.extend(ex for ex in examples if ex not in validated)
+            return JapaneseExampleGenerator._drop_duplicate_examples(validated, seen_sentences)
+
+        def unvalidated_examples() -> List[Dict[str, str]]:
+            """Rejected examples to keep when the check rejected all of them (as in _finalize_parsed_examples)."""
+            if seen_sentences:
+                return []
+            examples = JapaneseExampleGenerator._drop_duplicate_examples(rejected)
+            return examples if len(examples) >= 2 else []
+
+        # 중간에 끊은 응답은 전체 응답 캐시와 구분하여 예문 개수별로 캐시
+        truncated_key = None
+        if use_cache and CacheConfig.LLM_CACHE_ENABLED:
+            truncated_key = build_llm_cache_key(
+                Config.MODEL_NAME,
+                prompt,
+                {**LLMService._build_generation_config(temperature), "stop_after_examples": limit}
+            )
+            cached_response = await llm_response_cache.get_async(truncated_key)
+            if cached_response is not None:
+                splitter = ExampleBlockSplitter("Context")
+                blocks = splitter.feed(cached_response) + splitter.close()
+                cached_examples = [example for block in blocks for example in block_examples(block)]
+                for example in (cached_examples + unvalidated_examples())[:limit]:
+                    yield example
+                return
+
+        splitter = ExampleBlockSplitter("Context")
+        chunks = []
+        count = 0
+
+        stream = LLMService.stream_llm_async(prompt, temperature=temperature, use_cache=use_cache)
+        try:
+            async for text in stream:
+                chunks.append(text)
+                for block in splitter.feed(text):
+                    for example in block_examples(block):
+                        yield example
+                        count += 1
+                        if count >= limit:
+                            app.logger.debug(f"Collected {count} valid examples, stopping the stream early")
+                            if truncated_key is not None:
+                                await llm_response_cache.set_async(truncated_key, "".join(chunks))
+                            return
+
+            blocks = splitter.close()
+            if count == 0 and not blocks:
+                # "Context:" 블록이 없는 응답은 전체를 기존 방식으로 파싱
+                blocks = ["".join(chunks)] if chunks else []
+
+            remaining_examples = [example for block in blocks for example in block_examples(block)]
+            for example in (remaining_examples + unvalidated_examples())[:limit - count]:
+                yield example
+        finally:
+            await stream.aclose()
+
     @staticmethod
     def _build_example_prompt(
             word: str,
@@ -566,135 +1152,8 @@ class JapaneseExampleGenerator:
         Returns:
             List of validated examples that pass semantic and formatting checks
         """
-
-        class SemanticValidator:
-            """Helper class for semantic validation of Japanese sentences"""
-
-            # Semantic constraints for specific verbs and their inappropriate objects
-            VERB_OBJECT_CONSTRAINTS = {
-                "食べる": {  # "to eat"
-                    "invalid_objects": [
-                        "日本語", "勉強", "宿題", "問題", "試験", "テスト", "文法", "言語",
-                        "車", "電車", "家", "ビル", "学校", "会社", "音楽", "映画", "テレビ"
-                    ],
-                    "pattern_template": r"{obj}を食べる"
-                },
-                "飲む": {  # "to drink"
-                    "invalid_objects": [
-                        "電車", "自転車", "車", "本", "映画", "テレビ", "家", "ビル",
-                        "宿題", "問題", "音楽", "ゲーム"
-                    ],
-                    "pattern_template": r"{obj}を飲む"
-                },
-                "避ける": {  # "to avoid"
-                    "invalid_patterns": [r"部屋を避ける"]  # "avoid room" is unnatural
-                }
-            }
-
-            # General unnatural patterns regardless of specific words
-            UNNATURAL_PATTERNS = [
-                r'部屋を避ける',  # "avoid room"
-                r'車を食べる',  # "eat car"
-                r'家を飲む',  # "drink house"
-                r'問題を歩く',  # "walk problem"
-            ]
-
-            # Korean translation quality patterns to filter out
-            KOREAN_FORMATTING_ISSUES = [
-                r'\d+\.\s*\*+',  # Numbered markers with asterisks
-                r'^\d+\.',  # Lines starting with numbers
-                r'[ぁ-んァ-ン一-龥]',  # Japanese characters in Korean text
-            ]
-
-            @classmethod
-            def has_semantic_violation(cls, japanese_text: str, target_word: str) -> bool:
-                """Check if the sentence has semantic violations for the target word"""
-                if target_word not in cls.VERB_OBJECT_CONSTRAINTS:
-                    return False
-
-                constraints = cls.VERB_OBJECT_CONSTRAINTS[target_word]
-
-                # Check verb-object constraints
-                if "invalid_objects" in constraints:
-                    pattern_template = constraints["pattern_template"]
-                    for invalid_obj in constraints["invalid_objects"]:
-                        pattern = pattern_template.format(obj=re.escape(invalid_obj))
-                        if re.search(pattern, japanese_text):
-                            return True
-
-                # Check predefined invalid patterns
-                if "invalid_patterns" in constraints:
-                    for pattern in constraints["invalid_patterns"]:
-                        if re.search(pattern, japanese_text):
-                            return True
-
-                return False
-
-            @classmethod
-            def has_unnatural_patterns(cls, japanese_text: str) -> bool:
-                """Check for general unnatural patterns in Japanese text"""
-                return any(re.search(pattern, japanese_text) for pattern in cls.UNNATURAL_PATTERNS)
-
-            @classmethod
-            def has_korean_formatting_issues(cls, korean_text: str) -> bool:
-                """Check for formatting issues in Korean translation"""
-                return any(re.search(pattern, korean_text) for pattern in cls.KOREAN_FORMATTING_ISSUES)
-
-            @classmethod
-            def clean_korean_text(cls, korean_text: str) -> str:
-                """Clean and normalize Korean text"""
-                # Remove multiple consecutive newlines
-                cleaned = re.sub(r'\n{2,}', '\n', korean_text)
-                # Remove any remaining Japanese characters
-                cleaned = re.sub(r'[ぁ-んァ-ン一-龥]', '', cleaned)
-                return cleaned.strip()
-
-        def is_valid_example(example: Dict[str, str]) -> bool:
-            """
-            Validate a single example for basic requirements and semantic correctness
-
-            Args:
-                example: Dictionary containing 'japanese' and 'korean' keys
-
-            Returns:
-                bool: True if example passes all validation checks
-            """
-            japanese_text = example.get('japanese', '').strip()
-            korean_text = example.get('korean', '').strip()
-
-            # Basic validation: both texts must exist and have minimum length
-            if not japanese_text or not korean_text:
-                return False
-
-            if len(japanese_text) < 5 or len(korean_text) < 5:
-                return False
-
-            # Target word must be present in Japanese sentence
-            if word not in japanese_text:
-                return False
-
-            # Check for semantic violations
-            if SemanticValidator.has_semantic_violation(japanese_text, word):
-                return False
-
-            # Check for unnatural patterns
-            if SemanticValidator.has_unnatural_patterns(japanese_text):
-                return False
-
-            # Check Korean formatting issues
-            if SemanticValidator.has_korean_formatting_issues(korean_text):
-                return False
-
-            return True
-
-        # Process and validate examples
-        validated_examples = []
-
-        for example in examples:
-            if is_valid_example(example):
-                # Clean Korean text before adding to validated list
-                example['korean'] = SemanticValidator.clean_korean_text(example['korean'])
-                validated_examples.append(example)
+        # 규칙은 semantic_validator 모듈 로드 시 한 번만 컴파일됨 (data/semantic_rules.json)
+        validated_examples = semantic_validator.filter_examples(examples, word)
 
         # Return validated examples or error message if none are valid
         if validated_examples:
@@ -718,103 +1177,124 @@ class JapaneseExampleGenerator:
         Returns:
             List of dictionaries with context, Japanese, and Korean fields
         """
-        examples = []
-
         # Debug - log response for troubleshooting
         app.logger.debug("Response from LLM (first 500 chars): " +
                          (response_text[:500] + "..." if len(response_text) > 500 else response_text))
 
-        # Main pattern: Find examples with Context/Japanese/Korean labels
-        main_pattern = r'(?:\d+\.\s*)?Context:\s*(.*?)\s*Japanese:\s*(.*?)\s*Korean:\s*(.*?)(?=\s*(?:\d+\.\s*)?Context:|\s*$)'
-        matches = re.findall(main_pattern, response_text, re.DOTALL)
+        examples = JapaneseExampleGenerator._extract_examples(response_text)
+        return JapaneseExampleGenerator._finalize_parsed_examples(examples, word)
+
+    @staticmethod
+    def _extract_examples(response_text: str) -> List[Dict[str, str]]:
+        """
+        Find the examples of a response (or of one streamed block) and clean them, without validating.
+
+        Args:
+            response_text: Text response from the LLM
+
+        Returns:
+            Cleaned examples from _clean_example
+        """
+        examples = []
+
+        # Main format: examples with Context/Japanese/Korean labels
+        matches = EXAMPLE_PARSER.parse(response_text)
 
         if matches:
-            app.logger.debug(f"Found {len(matches)} examples with the main pattern")
+            app.logger.debug(f"Found {len(matches)} examples with the main format")
             for match in matches:
-                context, japanese, korean = match
+                example = JapaneseExampleGenerator._clean_example(match["context"], match["japanese"], match["korean"])
+                if example:
+                    examples.append(example)
 
-                # 불완전한 문장 확인 (1): 문장이 "..." 또는 "…"로 끝나는 경우
-                if japanese.strip().endswith('...') or japanese.strip().endswith('…'):
-                    app.logger.debug(f"Skipping incomplete sentence: {japanese}")
-                    continue
-
-                # 불완전한 문장 확인 (2): 문장 길이가 너무 짧은 경우
-                if len(japanese.strip()) < 10:
-                    app.logger.debug(f"Skipping too short sentence: {japanese}")
-                    continue
+        # If the main format doesn't find anything, try numbered examples without a Context label
+        if not examples:
+            matches = NUMBERED_EXAMPLE_PARSER.parse_numbered(response_text, "context")
 
-                # 로마자 표기 제거 (괄호와 괄호 안의 내용 제거)
-                japanese = re.sub(r'\s*\([^)]*\)', '', japanese)
+            if matches:
+                app.logger.debug(f"Found {len(matches)} examples with the numbered format")
+                for match in matches:
+                    example = JapaneseExampleGenerator._clean_example(match["context"], match["japanese"], match["korean"])
+                    if example:
+                        examples.append(example)
 
-                # Clean Korean translation from any Japanese characters
-                korean = re.sub(r'[ぁ-んァ-ン一-龥]', '', korean)
+        return examples
 
-                # 추가 정제: 번역에서 숫자와 마커 제거
-                korean = re.sub(r'\d+\.\s*\*+', '', korean)
-                korean = re.sub(r'^\d+\.\s*', '', korean)
+    @staticmethod
+    def _parse_examples_json(response_text: str, word: str) -> Optional[List[Dict[str, str]]]:
+        """
+        Extract examples from a JSON answer (Config.OUTPUT_FORMAT == "json").
 
-                # 여러 줄 바꿈 정리
-                korean = re.sub(r'\n{2,}', '\n', korean)
+        Args:
+            response_text: JSON response from the LLM
+            word: Target Japanese word for validation
 
-                examples.append({
-                    "context": context.strip(),
-                    "japanese": japanese.strip(),
-                    "korean": korean.strip()
-                })
+        Returns:
+            Same result as _parse_examples, or None if the answer is not valid
+            JSON of the expected shape (the caller then falls back to the regexes)
+        """
+        parsed = extract_examples(loads_json(response_text), ("context", "japanese", "korean"))
+        if parsed is None:
+            app.logger.debug("Structured output was not valid JSON, falling back to text parsing")
+            return None
 
-        # If main pattern doesn't find anything, try alternative pattern
-        if not examples:
-            # Numbered example pattern
-            numbered_pattern = r'(\d+)\.[\s\n]+(.*?)[\s\n]+Japanese:[\s\n]+(.*?)[\s\n]+Korean:[\s\n]+(.*?)(?=[\s\n]+\d+\.|\s*$)'
-            matches = re.findall(numbered_pattern, response_text, re.DOTALL)
+        examples = []
+        for item in parsed:
+            example = JapaneseExampleGenerator._clean_example(item["context"], item["japanese"], item["korean"])
+            if example:
+                examples.append(example)
 
-            if matches:
-                app.logger.debug(f"Found {len(matches)} examples with the numbered pattern")
-                for match in matches:
-                    number, context, japanese, korean = match
+        return JapaneseExampleGenerator._finalize_parsed_examples(examples, word)
 
-                    # 불완전한 문장 확인 (1): 문장이 "..." 또는 "…"로 끝나는 경우
-                    if japanese.strip().endswith('...') or japanese.strip().endswith('…'):
-                        app.logger.debug(f"Skipping incomplete sentence: {japanese}")
-                        continue
+    @staticmethod
+    def _clean_example(context: str, japanese: str, korean: str) -> Optional[Dict[str, str]]:
+        """
+        Clean one parsed example, or return None if its sentence is incomplete.
 
-                    # 불완전한 문장 확인 (2): 문장 길이가 너무 짧은 경우
-                    if len(japanese.strip()) < 10:
-                        app.logger.debug(f"Skipping too short sentence: {japanese}")
-                        continue
+        Args:
+            context: Context field
+            japanese: Japanese sentence
+            korean: Korean translation
 
-                    # 로마자 표기 제거 (괄호와 괄호 안의 내용 제거)
-                    japanese = re.sub(r'\s*\([^)]*\)', '', japanese)
+        Returns:
+            Example dictionary with context, japanese and korean, or None
+        """
+        # 불완전한 문장 확인 (1): 문장이 "..." 또는 "…"로 끝나는 경우
+        if japanese.strip().endswith('...') or japanese.strip().endswith('…'):
+            app.logger.debug(f"Skipping incomplete sentence: {japanese}")
+            return None
 
-                    # Clean Korean translation from any Japanese characters
-                    korean = re.sub(r'[ぁ-んァ-ン一-龥]', '', korean)
+        # 불완전한 문장 확인 (2): 문장 길이가 너무 짧은 경우
+        if len(japanese.strip()) < 10:
+            app.logger.debug(f"Skipping too short sentence: {japanese}")
+            return None
 
-                    # 추가 정제: 번역에서 숫자와 마커 제거
-                    korean = re.sub(r'\d+\.\s*\*+', '', korean)
-                    korean = re.sub(r'^\d+\.\s*', '', korean)
+        # 로마자 표기 제거 (괄호와 괄호 안의 내용 제거)
+        japanese = clean_japanese_sentence(japanese)
 
-                    # 여러 줄 바꿈 정리
-                    korean = re.sub(r'\n{2,}', '\n', korean)
+        # 번역에서 일본어 문자, 숫자/마커, 여러 줄 바꿈을 한 번에 정리
+        korean = clean_korean_translation(korean)
 
-                    examples.append({
-                        "context": context.strip(),
-                        "japanese": japanese.strip(),
-                        "korean": korean.strip()
-                    })
+        return {
+            "context": context.strip(),
+            "japanese": japanese.strip(),
+            "korean": korean.strip()
+        }
 
-        # 다시 한번 불완전한 문장 필터링
-        filtered_examples = []
-        for example in examples:
-            japanese = example.get('japanese', '')
-            korean = example.get('korean', '')
+    @staticmethod
+    def _finalize_parsed_examples(examples: List[Dict[str, str]], word: str) -> List[Dict[str, str]]:
+        """
+        Drop incomplete and repeated examples and run the semantic validation.
 
-            # 문장이 끝나지 않은 경우 필터링
-            if (japanese.endswith('...') or japanese.endswith('…') or
-                    len(japanese) < 10 or word not in japanese or
-                    not korean or len(korean) < 5):
-                continue
+        Args:
+            examples: Cleaned examples from _clean_example
+            word: Target Japanese word for validation
 
-            filtered_examples.append(example)
+        Returns:
+            Validated examples, or a single failure example if too few remain
+        """
+        filtered_examples = JapaneseExampleGenerator._drop_duplicate_examples(
+            JapaneseExampleGenerator._filter_complete_examples(examples, word))
 
         # Semantic validation using _validate_semantics
         if filtered_examples:
@@ -832,6 +1312,49 @@ class JapaneseExampleGenerator:
 
         return filtered_examples
 
+    @staticmethod
+    def _filter_complete_examples(examples: List[Dict[str, str]], word: str) -> List[Dict[str, str]]:
+        """Keep the examples whose sentence is complete, contains the word and has a translation."""
+        # 다시 한번 불완전한 문장 필터링
+        filtered_examples = []
+        for example in examples:
+            japanese = example.get('japanese', '')
+            korean = example.get('korean', '')
+
+            # 문장이 끝나지 않은 경우 필터링
+            if (japanese.endswith('...') or japanese.endswith('…') or
+                    len(japanese) < 10 or word not in japanese or
+                    not korean or len(korean) < 5):
+                continue
+
+            filtered_examples.append(example)
+
+        return filtered_examples
+
+    @staticmethod
+    def _drop_duplicate_examples(
+            examples: List[Dict[str, str]],
+            seen_sentences: Optional[Set[str]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Keep the first example of each Japanese sentence.
+
+        Args:
+            examples: Examples to check
+            seen_sentences: Sentences already kept earlier (updated in place)
+
+        Returns:
+            Examples whose sentence was not seen before
+        """
+        seen_sentences = set() if seen_sentences is None else seen_sentences
+        unique_examples = []
+        for example in examples:
+            if example["japanese"] in seen_sentences:
+                continue
+            seen_sentences.add(example["japanese"])
+            unique_examples.append(example)
+        return unique_examples
+
     @staticmethod
     def _build_word_info_prompt(word: str) -> str:
         """
@@ -1011,6 +1534,10 @@ class JapaneseExampleGenerator:
         return result
 
 
+# (word, level)별 예문 풀: 보충은 공용 백그라운드 이벤트 루프에서 실행
+example_pool = ExamplePool(JapaneseExampleGenerator._fill_pool_async)
+
+
 # Flask routes
 
 @app.route('/api/examples', methods=['POST'])
@@ -1148,4 +1675,4 @@ def main():
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=3000, debug=True)
+    app.run(host='0.0.0.0', port=3000, debug=os.environ.get("DEBUG", "false").lower() == "true")
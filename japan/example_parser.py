@@ -0,0 +1,255 @@
+import re
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class ExampleBlockSplitter:
+    """
+    Split a streamed LLM answer into example blocks as the text arrives.
+
+    A block starts at a line with an (optionally numbered) start label, e.g.
+    "2. Context:". A block is complete as soon as the next block starts, so
+    every block except the last is handed out while the model is still
+    writing; the last one is returned by close() when the stream ends. Text
+    before the first block (preambles) is dropped.
+    """
+
+    def __init__(self, start_label: str = "Context"):
+        self._start = re.compile(
+            rf'^[ \t*#]*(?:\d+\.[ \t]*)?[*]*{re.escape(start_label)}:',
+            re.MULTILINE
+        )
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add streamed text and return the blocks it completed.
+
+        Args:
+            text: Next chunk of the response
+
+        Returns:
+            Complete blocks, in order (possibly empty)
+        """
+        self._buffer += text
+
+        starts = [match.start() for match in self._start.finditer(self._buffer)]
+        if len(starts) < 2:
+            return []
+
+        blocks = [self._buffer[begin:end] for begin, end in zip(starts, starts[1:])]
+        # 마지막 블록은 아직 끝나지 않았을 수 있으므로 버퍼에 남김
+        self._buffer = self._buffer[starts[-1]:]
+        return blocks
+
+    def close(self) -> List[str]:
+        """
+        Finish the stream and return the last block, if any.
+
+        Returns:
+            The remaining block as a one-element list, or an empty list
+        """
+        buffer, self._buffer = self._buffer, ""
+        match = self._start.search(buffer)
+        return [buffer[match.start():]] if match else []
+
+
+# 다음 예문의 번호 표시 ("2. "): 공백 또는 문자열 시작 뒤의 숫자만 인정 (숫자열마다 한 번만 검사)
+_ITEM_NUMBER = re.compile(r'(?<!\S)\d+\.\s')
+
+# 일본어 문장의 로마자/읽기 괄호: 앞 공백은 공백열의 시작에서만 매칭
+_PARENTHETICAL = re.compile(r'(?<!\s)\s*\([^)]*\)')
+
+# 한국어 번역의 잡음: 일본어 문자, "2. **" 형태의 번호/마크다운, 연속 빈 줄
+_KOREAN_NOISE = re.compile(r'(\n{2,})|[ぁ-んァ-ン一-龥]+|(?<!\d)\d+\.\s*\*+')
+
+
+# 값 앞뒤에서 제거할 공백과 마크다운 강조 문자
+_MARKUP_CHARS = " \t\r\n\u3000*"
+
+
+def _strip_markup(value: str) -> str:
+    """Strip whitespace and the markdown emphasis left around a field value."""
+    return value.strip(_MARKUP_CHARS)
+
+
+def _strip_trailing_item_number(value: str) -> str:
+    """
+    Strip the numbering of the next item ("...\\n\\n2. **") from a block's last value.
+
+    Works from the end of the string without regular expressions, so the cost
+    is bounded by the length of the stripped suffix.
+    """
+    value = value.rstrip(_MARKUP_CHARS + "#")
+    if value.endswith("."):
+        digits_start = len(value) - 1
+        while digits_start > 0 and value[digits_start - 1].isdigit():
+            digits_start -= 1
+        # 숫자가 있고 공백/마크다운(또는 값의 시작) 뒤에 있을 때만 번호로 간주 ("\n\n**2.")
+        if digits_start < len(value) - 1 and (
+                digits_start == 0 or value[digits_start - 1].isspace() or value[digits_start - 1] in "*#"):
+            value = value[:digits_start]
+    return value.rstrip(_MARKUP_CHARS + "#").strip(_MARKUP_CHARS)
+
+
+def clean_japanese_sentence(japanese: str) -> str:
+    """
+    Remove romanization/readings in parentheses from a Japanese sentence.
+
+    Args:
+        japanese: Parsed Japanese sentence
+
+    Returns:
+        Sentence without parenthesized parts
+    """
+    # 마지막 ')' 이후의 '('는 절대 매칭되지 않으므로 그 앞부분만 치환 (실패하는 탐색 반복 방지)
+    last_close = japanese.rfind(")")
+    if last_close < 0:
+        return japanese
+    return _PARENTHETICAL.sub("", japanese[:last_close + 1]) + japanese[last_close + 1:]
+
+
+def clean_korean_translation(korean: str) -> str:
+    """
+    Remove Japanese characters, item numbering and blank lines from a Korean translation in one pass.
+
+    Args:
+        korean: Parsed Korean translation
+
+    Returns:
+        Cleaned translation
+    """
+    korean = _KOREAN_NOISE.sub(lambda match: "\n" if match.group(1) else "", korean)
+
+    # 맨 앞의 번호 ("1. ") 제거
+    stripped = korean.lstrip("0123456789")
+    if stripped != korean and stripped.startswith("."):
+        korean = stripped[1:].lstrip()
+    return korean
+
+
+class LabeledExampleParser:
+    """
+    Single-pass parser for labelled example blocks in an LLM answer, e.g.
+
+        1. Context: ...
+        Japanese: ...
+        Korean: ...
+
+    One precompiled alternation of the labels splits the answer in a single
+    scan and a small state machine assigns the text between consecutive
+    labels to the fields, so the cost is linear in the length of the answer
+    however malformed it is. A block starts at the first label; labels that
+    arrive out of order are kept as part of the current value, and a block
+    that is interrupted by a new start label before all of its fields were
+    seen is dropped. Values are stripped of whitespace, markdown emphasis and
+    the numbering of the following item.
+    """
+
+    def __init__(self, labels: Sequence[str], keys: Optional[Sequence[str]] = None):
+        """
+        Args:
+            labels: Field labels in block order; the first one starts a block
+            keys: Dictionary keys for the fields (default: lowercased labels)
+        """
+        self.labels = tuple(labels)
+        self.keys = tuple(keys) if keys else tuple(label.lower() for label in self.labels)
+        self._label = re.compile("(" + "|".join(re.escape(label) for label in self.labels) + "):")
+
+    def parse(self, text: str) -> List[Dict[str, str]]:
+        """
+        Extract every complete block.
+
+        Args:
+            text: LLM answer
+
+        Returns:
+            One dictionary per complete block, keyed by ``keys``
+        """
+        examples = []
+        last_key = self.keys[-1]
+        for values, _, followed in self._iter_blocks(text):
+            example = {key: value.strip(_MARKUP_CHARS) for key, value in zip(self.keys, values[:-1])}
+            # 다음 블록 앞에서 끝난 값에는 다음 예문의 번호가 붙어 있음
+            example[last_key] = (
+                _strip_trailing_item_number(values[-1]) if followed else values[-1].strip(_MARKUP_CHARS)
+            )
+            examples.append(example)
+        return examples
+
+    def parse_numbered(self, text: str, first_key: str) -> List[Dict[str, str]]:
+        """
+        Extract numbered items whose first field has no label, e.g.
+
+            1. Ordering at a cafe
+            Japanese: ...
+            Korean: ...
+
+        The text between an item number and the start label becomes
+        ``first_key``; the last value ends at the next item number.
+
+        Args:
+            text: LLM answer
+            first_key: Dictionary key for the unlabelled first field
+
+        Returns:
+            One dictionary per numbered item with all fields
+        """
+        examples = []
+        last_key = self.keys[-1]
+        for values, head, _ in self._iter_blocks(text):
+            marker = _ITEM_NUMBER.search(head)
+            if not marker:
+                continue
+
+            example = {first_key: head[marker.end():].strip(_MARKUP_CHARS)}
+            example.update((key, value.strip(_MARKUP_CHARS)) for key, value in zip(self.keys, values[:-1]))
+            next_marker = _ITEM_NUMBER.search(values[-1])
+            example[last_key] = (values[-1][:next_marker.start()] if next_marker else values[-1]).strip(_MARKUP_CHARS)
+            examples.append(example)
+        return examples
+
+    def _iter_blocks(self, text: str) -> Iterator[Tuple[List[str], str, bool]]:
+        """
+        Yield (field values, text before the start label, followed by another block) per complete block.
+        """
+        # split 결과: [앞부분, 레이블, 값, 레이블, 값, ...]
+        parts = self._label.split(text)
+        labels = self.labels
+        start_label = labels[0]
+        count = len(labels)
+
+        values = None
+        head = ""
+        extra = False  # 순서에 맞지 않는 레이블이 값에 덧붙었는지
+        for index in range(1, len(parts), 2):
+            label, value = parts[index], parts[index + 1]
+            if label == start_label:
+                if values is not None and len(values) == count:
+                    yield (self._join(values) if extra else values), head, True
+                head = parts[index - 1]
+                values = [value]
+                extra = False
+            elif values is None:
+                continue
+            elif len(values) < count and label == labels[len(values)]:
+                values.append(value)
+            else:
+                # 현재 값의 일부로 유지 (조각은 블록이 끝날 때 한 번에 연결)
+                if not isinstance(values[-1], list):
+                    values[-1] = [values[-1]]
+                values[-1].extend((label, ":", value))
+                extra = True
+
+        if values is not None and len(values) == count:
+            yield (self._join(values) if extra else values), head, False
+
+    @staticmethod
+    def _join(values: list) -> List[str]:
+        return ["".join(value) if isinstance(value, list) else value for value in values]
+
+
+# 공용 파서 (모듈 로드 시 한 번만 컴파일)
+EXAMPLE_PARSER = LabeledExampleParser(("Context", "Japanese", "Korean"))
+NUMBERED_EXAMPLE_PARSER = LabeledExampleParser(("Japanese", "Korean"))
+HOMONYM_EXAMPLE_PARSER = LabeledExampleParser(("Context", "Japanese", "Korean", "Explanation"))
+WORD_EXAMPLE_PARSER = LabeledExampleParser(("Japanese", "Korean", "Explanation"))
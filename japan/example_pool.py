@@ -0,0 +1,236 @@
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ExamplePoolConfig:
+    """단어별 예문 풀 설정 (stale-while-revalidate)"""
+    ENABLED = os.getenv("EXAMPLE_POOL_ENABLED", "true").lower() == "true"
+
+    # 풀 하나에 보관하는 최대 예문 수와 보충을 시작하는 기준 (사용 가능한 예문 수)
+    MAX_SIZE = int(os.getenv("EXAMPLE_POOL_MAX_SIZE", 40))
+    LOW_WATERMARK = int(os.getenv("EXAMPLE_POOL_LOW_WATERMARK", 15))
+
+    # 예문 하나를 최대 몇 번 제공할지 (이후 풀에서 제거)
+    MAX_SERVES = int(os.getenv("EXAMPLE_POOL_MAX_SERVES", 20))
+
+    # 마지막 보충 후 이 시간이 지나면 기존 예문을 제공하면서 새 예문으로 교체
+    STALE_AFTER = int(os.getenv("EXAMPLE_POOL_STALE_AFTER", 6 * 60 * 60))  # seconds
+
+    # 보충 한 번에 요청하는 예문 수와 최대 생성 횟수
+    REFILL_BATCH = int(os.getenv("EXAMPLE_POOL_REFILL_BATCH", 8))
+    REFILL_ROUNDS = int(os.getenv("EXAMPLE_POOL_REFILL_ROUNDS", 3))
+
+    # 메모리에 유지하는 (word, level) 풀 수 (LRU)
+    MAX_WORDS = int(os.getenv("EXAMPLE_POOL_MAX_WORDS", 2000))
+
+
+class _PooledExample:
+    __slots__ = ("example", "serves", "added_at")
+
+    def __init__(self, example: Dict[str, str], serves: int, added_at: float):
+        self.example = example
+        self.serves = serves
+        self.added_at = added_at
+
+
+class _Pool:
+    __slots__ = ("entries", "refreshed_at", "refill_task")
+
+    def __init__(self):
+        self.entries: List[_PooledExample] = []
+        self.refreshed_at = 0.0
+        self.refill_task: Optional[asyncio.Task] = None
+
+
+class ExamplePool:
+    """
+    Per-(word, level) pools of validated examples served without calling the LLM.
+
+    A request takes the least-served examples of the pool (ties broken at
+    random, no example twice in one answer), so consecutive requests see
+    different sentences until the whole pool has been shown. Examples are
+    retired after MAX_SERVES uses. When the usable examples fall below
+    LOW_WATERMARK or the pool has not been refreshed for STALE_AFTER seconds,
+    a background task on the event loop generates new ones while requests
+    keep being served from what is there (stale-while-revalidate). Only a
+    request that finds too few examples generates on its own.
+
+    Pools live in process memory; each worker process keeps its own.
+    """
+
+    def __init__(self, fill: Callable[[str, str, int], Awaitable[List[Dict[str, str]]]]):
+        """
+        Args:
+            fill: Coroutine function (word, level, count) returning freshly
+                generated, validated examples for a refill
+        """
+        self._fill = fill
+        self._pools: "OrderedDict[Tuple[str, str], _Pool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._refills = 0
+        self._refill_failures = 0
+
+    @staticmethod
+    def _key(word: str, level: str) -> Tuple[str, str]:
+        return word.strip(), level
+
+    def _get_pool(self, key: Tuple[str, str]) -> _Pool:
+        """Return the pool for key, creating it and evicting the least recently used one if needed."""
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _Pool()
+            while ExamplePoolConfig.MAX_WORDS > 0 and len(self._pools) > ExamplePoolConfig.MAX_WORDS:
+                self._pools.popitem(last=False)
+        self._pools.move_to_end(key)
+        return pool
+
+    def take(self, word: str, level: str, count: int, partial: bool = False) -> Optional[List[Dict[str, str]]]:
+        """
+        Serve ``count`` distinct examples from the pool.
+
+        Schedules a background refill when the pool runs low or is stale
+        (only when called from a running event loop).
+
+        Args:
+            word: Target Japanese word
+            level: JLPT level
+            count: Number of examples wanted
+            partial: Serve fewer than ``count`` examples if that is all the pool has
+
+        Returns:
+            Copies of the served examples, or None if the pool has fewer than
+            ``count`` (with ``partial``: if it is empty)
+        """
+        key = self._key(word, level)
+        now = time.time()
+
+        with self._lock:
+            pool = self._get_pool(key)
+            pool.entries = [entry for entry in pool.entries if entry.serves < ExamplePoolConfig.MAX_SERVES]
+
+            result = None
+            if count > 0 and (len(pool.entries) >= count or (partial and pool.entries)):
+                # 적게 제공된 예문 우선, 같은 횟수끼리는 무작위
+                random.shuffle(pool.entries)
+                pool.entries.sort(key=lambda entry: entry.serves)
+                chosen = pool.entries[:count]
+                for entry in chosen:
+                    entry.serves += 1
+                result = [dict(entry.example) for entry in chosen]
+                self._hits += 1
+            else:
+                self._misses += 1
+
+            needs_refill = (
+                len(pool.entries) < max(ExamplePoolConfig.LOW_WATERMARK, count)
+                or now - pool.refreshed_at > ExamplePoolConfig.STALE_AFTER
+            )
+
+        if needs_refill:
+            self._schedule_refill(key, pool)
+        return result
+
+    def add(self, word: str, level: str, examples: List[Dict[str, str]], served: bool = False):
+        """
+        Add validated examples to the pool (duplicates are ignored).
+
+        Args:
+            word: Target Japanese word
+            level: JLPT level
+            examples: Examples to add
+            served: The examples were just sent to a client (counts as one use)
+        """
+        key = self._key(word, level)
+        with self._lock:
+            self._add_entries(self._get_pool(key), examples, 1 if served else 0)
+
+    @staticmethod
+    def _add_entries(pool: _Pool, examples: List[Dict[str, str]], serves: int) -> int:
+        """Append new examples, keeping the pool under MAX_SIZE. Returns the number added."""
+        now = time.time()
+        known = {entry.example.get("japanese") for entry in pool.entries}
+
+        added = 0
+        for example in examples:
+            sentence = example.get("japanese")
+            if not sentence or sentence in known:
+                continue
+            known.add(sentence)
+            pool.entries.append(_PooledExample(dict(example), serves, now))
+            added += 1
+
+        if ExamplePoolConfig.MAX_SIZE > 0 and len(pool.entries) > ExamplePoolConfig.MAX_SIZE:
+            # 많이 제공된 예문, 오래된 예문부터 제거
+            pool.entries.sort(key=lambda entry: (entry.serves, -entry.added_at))
+            del pool.entries[ExamplePoolConfig.MAX_SIZE:]
+        return added
+
+    def _schedule_refill(self, key: Tuple[str, str], pool: _Pool):
+        """Start the background refill for a pool unless one is already running."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        with self._lock:
+            if pool.refill_task is not None and not pool.refill_task.done():
+                return
+            pool.refill_task = loop.create_task(self._refill(key, pool))
+
+    async def _refill(self, key: Tuple[str, str], pool: _Pool):
+        """Generate examples until the pool is above the low watermark (at most REFILL_ROUNDS calls)."""
+        word, level = key
+        started_at = time.time()
+        try:
+            for _ in range(max(1, ExamplePoolConfig.REFILL_ROUNDS)):
+                examples = await self._fill(word, level, ExamplePoolConfig.REFILL_BATCH)
+
+                with self._lock:
+                    if pool.refreshed_at and started_at - pool.refreshed_at > ExamplePoolConfig.STALE_AFTER:
+                        # 오래된 풀: 새 예문이 도착하면 보충 시작 이전 예문 교체
+                        pool.entries = [entry for entry in pool.entries if entry.added_at >= started_at]
+                    added = self._add_entries(pool, examples, 0)
+                    pool.refreshed_at = time.time()
+                    self._refills += 1
+                    usable = sum(1 for entry in pool.entries if entry.serves < ExamplePoolConfig.MAX_SERVES)
+
+                logger.debug(f"Example pool refill for {word} ({level}): +{added}, {usable} usable")
+                if added == 0 or usable >= ExamplePoolConfig.LOW_WATERMARK + ExamplePoolConfig.REFILL_BATCH:
+                    break
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            with self._lock:
+                self._refill_failures += 1
+            logger.warning(f"Example pool refill failed for {word} ({level}): {str(e)}")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report pool hit/miss counters and sizes.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, refills, refill_failures, pools and examples
+        """
+        with self._lock:
+            hits, misses = self._hits, self._misses
+            total = hits + misses
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+                "refills": self._refills,
+                "refill_failures": self._refill_failures,
+                "pools": len(self._pools),
+                "examples": sum(len(pool.entries) for pool in self._pools.values())
+            }
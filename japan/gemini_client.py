@@ -0,0 +1,141 @@
+import os
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import google.generativeai as genai
+
+from stub_llm import StubLLMConfig, StubGenerativeModel
+
+logger = logging.getLogger(__name__)
+
+
+class GeminiClientHolder:
+    """
+    Process-wide holder for the configured Gemini SDK and its model objects.
+
+    ``genai.configure`` runs once per process and API key, and model instances
+    are cached per (model name, safety settings), so repeated calls reuse the
+    same GenerativeModel and its underlying transport instead of rebuilding
+    them on every retry. All methods are thread-safe, and the cache is reset
+    automatically in a forked worker process so no connection is shared
+    across processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._configured_key = None
+        self._models = {}
+
+    def _reset_after_fork(self):
+        """Drop per-process state when running in a forked child (lock must be held)."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._configured_key = None
+            self._models = {}
+
+    def configure(self, api_key: Optional[str]) -> bool:
+        """
+        Configure the Gemini SDK once for this process.
+
+        Args:
+            api_key: Gemini API key
+
+        Returns:
+            bool: True if the SDK is configured, False otherwise
+        """
+        if not api_key:
+            logger.error("API key not configured. Set GEMINI_API_KEY environment variable.")
+            return False
+
+        with self._lock:
+            self._reset_after_fork()
+            if self._configured_key == api_key:
+                return True
+
+            if StubLLMConfig.ENABLED:
+                # 스텁 백엔드는 SDK 설정 없이 동작
+                logger.warning("LLM_BACKEND=stub: Gemini API calls are answered by the in-process stub")
+                self._configured_key = api_key
+                self._models = {}
+                return True
+
+            try:
+                genai.configure(api_key=api_key)
+            except Exception as e:
+                logger.error(f"Failed to initialize Gemini API: {str(e)}")
+                return False
+
+            self._configured_key = api_key
+            # 키가 바뀌면 이전 설정으로 만든 모델은 버림
+            self._models = {}
+            return True
+
+    @staticmethod
+    def _settings_key(safety_settings: Any) -> str:
+        """Build a hashable key for safety settings given as list or dict."""
+        if not safety_settings:
+            return ""
+        try:
+            return json.dumps(safety_settings, sort_keys=True, default=str)
+        except TypeError:
+            return repr(safety_settings)
+
+    def get_model(
+            self,
+            model_name: str,
+            safety_settings: Any = None,
+            factory: Optional[Callable[[], Any]] = None
+    ):
+        """
+        Get the cached model for (model name, safety settings), creating it once.
+
+        Args:
+            model_name: Gemini model name
+            safety_settings: Safety settings the model should use (part of the cache key)
+            factory: Optional callable that builds the model; defaults to
+                genai.GenerativeModel(model_name, safety_settings=...). Ignored
+                when LLM_BACKEND=stub, which always returns a StubGenerativeModel.
+
+        Returns:
+            GenerativeModel instance shared by all threads of this process
+        """
+        key = (model_name, self._settings_key(safety_settings))
+
+        with self._lock:
+            self._reset_after_fork()
+            model = self._models.get(key)
+            if model is not None:
+                return model
+
+            if StubLLMConfig.ENABLED:
+                model = StubGenerativeModel(model_name, safety_settings=safety_settings)
+            elif factory is not None:
+                model = factory()
+            elif safety_settings:
+                model = genai.GenerativeModel(model_name, safety_settings=safety_settings)
+            else:
+                model = genai.GenerativeModel(model_name)
+
+            self._models[key] = model
+            return model
+
+    def reset(self):
+        """Forget the configuration and every cached model."""
+        with self._lock:
+            self._configured_key = None
+            self._models = {}
+
+    def status(self) -> Dict[str, Any]:
+        """Report whether the SDK is configured and how many models are cached."""
+        with self._lock:
+            return {
+                "configured": self._configured_key is not None and self._pid == os.getpid(),
+                "cached_models": len(self._models)
+            }
+
+
+# 두 LLMService가 공유하는 프로세스 단위 클라이언트
+gemini_clients = GeminiClientHolder()
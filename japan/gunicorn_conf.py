@@ -0,0 +1,47 @@
+"""
+Gunicorn settings for the production serving mode of main_app.
+
+Run either of:
+
+    SERVE_MODE=production python japan/main_app.py
+    gunicorn -c japan/gunicorn_conf.py --chdir japan "main_app:create_app()"
+
+Every value can be overridden with the environment variable next to it.
+Requests spend most of their time waiting on Gemini, and the LLM calls of a
+worker all run on its shared asyncio loop, so a few processes with many
+threads each serve far more concurrent requests than one process per request.
+With preload_app the application (homonym indexes, SDK imports and
+configuration) is loaded once in the master and inherited by forked workers.
+Identical concurrent requests are coalesced within a worker; set
+SINGLE_FLIGHT_CROSS_PROCESS=true to also coalesce them across workers
+(see single_flight.py). The client-side Gemini rate limiter is off by
+default; when enabling it (LLM_RATE_LIMIT_ENABLED, LLM_RATE_LIMIT_RPM/TPM)
+also set LLM_RATE_LIMIT_CROSS_PROCESS=true, otherwise every worker gets
+the full allowance (see rate_limiter.py).
+"""
+import os
+import multiprocessing
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '3000')}"
+
+# 워커 프로세스 수와 워커당 스레드 수
+workers = int(os.getenv("WEB_CONCURRENCY", min(multiprocessing.cpu_count() + 1, 8)))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 32))
+
+# 마스터에서 앱을 한 번 로드한 뒤 fork
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Keep-alive 및 타임아웃 (LLM 재시도를 포함해 한 요청이 수십 초 걸릴 수 있음)
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 180))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+backlog = int(os.getenv("GUNICORN_BACKLOG", 2048))
+
+# 메모리 누수 대비 워커 주기적 재시작 (0이면 사용 안 함)
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 0))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
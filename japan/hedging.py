@@ -0,0 +1,192 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from retry_policy import RetryConfig, RetrySchedule
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HedgingConfig:
+    """LLM 요청 헤징 설정 (느린 호출에 중복 요청을 보내 꼬리 지연 단축)"""
+    ENABLED = os.getenv("LLM_HEDGING_ENABLED", "false").lower() == "true"
+
+    # 최근 응답 시간의 이 백분위수 안에 응답이 없으면 중복 요청 (최소 MIN_DELAY초)
+    PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", 95))
+    MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", 1.0))  # seconds
+
+    # 응답 시간 표본 수 (MIN_SAMPLES개가 모이기 전에는 헤징하지 않음)
+    WINDOW = int(os.getenv("LLM_HEDGE_WINDOW", 200))
+    MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", 20))
+
+    # 최근 호출 중 중복 요청 비율 상한 (장애 시 호출 수가 두 배로 늘지 않도록)
+    MAX_EXTRA_RATE = float(os.getenv("LLM_HEDGE_MAX_EXTRA_RATE", 0.1))
+
+
+def _discard(task: asyncio.Future):
+    """Retrieve the outcome of an abandoned attempt so it is not logged as unhandled."""
+    if not task.cancelled():
+        task.exception()
+
+
+class RequestHedger:
+    """
+    Hedged Gemini calls for one kind of request.
+
+    Every call is timed. Once MIN_SAMPLES latencies are known, an attempt
+    that has not answered within the PERCENTILE-th percentile of recent
+    latencies (at least MIN_DELAY seconds) gets a duplicate; the first
+    successful answer wins and the other attempt is cancelled. The
+    duplicate is a regular attempt of the call's RetrySchedule, so it uses
+    one of the call's attempts, is charged to the request budget and waits
+    for the rate limiter like any other call. No duplicate is sent when
+    hedges already make up MAX_EXTRA_RATE of recent calls, or when the
+    call's deadline is too close.
+
+    Disabled unless HedgingConfig.ENABLED; latencies are recorded anyway.
+    """
+
+    def __init__(
+            self,
+            percentile: float = HedgingConfig.PERCENTILE,
+            min_delay: float = HedgingConfig.MIN_DELAY,
+            window: int = HedgingConfig.WINDOW,
+            min_samples: int = HedgingConfig.MIN_SAMPLES,
+            max_extra_rate: float = HedgingConfig.MAX_EXTRA_RATE
+    ):
+        self.percentile = min(100.0, max(0.0, percentile))
+        self.min_delay = min_delay
+        self.min_samples = max(1, min_samples)
+        self.max_extra_rate = max_extra_rate
+
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=max(1, window))
+        self._recent_hedged: Deque[bool] = deque(maxlen=max(1, window))
+
+        self._calls = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Seconds to wait for an attempt before sending a duplicate.
+
+        Returns:
+            The delay, or None if hedging is disabled or there are too few samples
+        """
+        if not HedgingConfig.ENABLED:
+            return None
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+        return max(self.min_delay, latencies[index])
+
+    def _may_hedge(self, schedule: RetrySchedule, prompt: Optional[str]) -> bool:
+        """Check the extra-call cap and the deadline, then take an attempt from the schedule."""
+        with self._lock:
+            recent = len(self._recent_hedged)
+            if recent and sum(self._recent_hedged) / recent >= self.max_extra_rate:
+                return False
+        if schedule.remaining() < RetryConfig.MIN_ATTEMPT_TIME:
+            return False
+        return schedule.start_attempt(prompt)
+
+    async def run(
+            self,
+            attempt: Callable[[], Awaitable[T]],
+            schedule: RetrySchedule,
+            prompt: Optional[str] = None
+    ) -> T:
+        """
+        Run one attempt, hedged with a duplicate if it is slow.
+
+        The caller has already counted the first attempt on ``schedule``.
+
+        Args:
+            attempt: Function starting one attempt (called twice when hedging)
+            schedule: Retry schedule of the call
+            prompt: Prompt of the attempt, charged to the request budget for the duplicate
+
+        Returns:
+            Result of the first attempt that succeeds
+
+        Raises:
+            The error of the first attempt if every attempt failed
+        """
+        started = time.monotonic()
+        primary = asyncio.ensure_future(attempt())
+        tasks = [primary]
+        try:
+            delay = self.hedge_delay()
+            if delay is not None and delay < schedule.remaining():
+                await asyncio.wait(tasks, timeout=delay)
+                if not primary.done() and self._may_hedge(schedule, prompt):
+                    logger.debug(f"No Gemini answer after {delay:.2f}s, sending a hedged request")
+                    tasks.append(asyncio.ensure_future(attempt()))
+
+            first_error = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # 동시에 끝나면 원래 요청 우선
+                for task in sorted(done, key=tasks.index):
+                    if task.cancelled():
+                        continue
+                    error = task.exception()
+                    if error is None:
+                        self._finish(len(tasks) > 1, task is not primary, time.monotonic() - started)
+                        return task.result()
+                    if first_error is None:
+                        first_error = error
+
+            self._finish(len(tasks) > 1, False, None)
+            if first_error is None:
+                raise asyncio.CancelledError()
+            raise first_error
+
+        finally:
+            for task in tasks:
+                if not task.done():
+                    # 늦은 요청 취소 (속도 제한 슬롯과 회로 차단기 시험 호출도 반환됨)
+                    task.cancel()
+                    task.add_done_callback(_discard)
+
+    def _finish(self, hedged: bool, hedge_won: bool, latency: Optional[float]):
+        with self._lock:
+            self._calls += 1
+            self._recent_hedged.append(hedged)
+            if hedged:
+                self._hedged += 1
+            if hedge_won:
+                self._hedge_wins += 1
+            if latency is not None:
+                self._latencies.append(latency)
+
+    def stats(self) -> Dict:
+        """
+        Report hedging counters.
+
+        Returns:
+            Dictionary with calls, hedged calls, extra_call_rate (duplicates
+            sent per call), hedge wins and the current hedge delay
+        """
+        delay = self.hedge_delay()
+        with self._lock:
+            calls = self._calls
+            return {
+                "enabled": HedgingConfig.ENABLED,
+                "calls": calls,
+                "hedged": self._hedged,
+                "extra_call_rate": round(self._hedged / calls, 4) if calls else 0.0,
+                "hedge_wins": self._hedge_wins,
+                "hedge_delay": round(delay, 3) if delay is not None else None,
+                "samples": len(self._latencies)
+            }
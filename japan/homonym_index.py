@@ -0,0 +1,310 @@
+import logging
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 데이터베이스 검색에 사용하는 JLPT 레벨 순서 (쉬운 레벨 → 어려운 레벨)
+LEVEL_ORDER = ["n5", "n4", "n3", "n2", "n1"]
+
+NO_OTHER_HOMONYMS = "No other known homonyms found in database."
+
+
+# 가타카나(ァ-ヶ)와 히라가나(ぁ-ゖ)의 코드 포인트 차이
+KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+
+def normalize_lookup_key(text: str) -> str:
+    """
+    Normalize user input for dictionary lookups.
+
+    Applies NFKC (full-width/half-width variants), removes all whitespace and
+    folds katakana to hiragana, so "キク", "ｷｸ" and " きく " share one key.
+
+    Args:
+        text: Raw word from the request
+
+    Returns:
+        Normalized lookup key
+    """
+    normalized = unicodedata.normalize("NFKC", text)
+    normalized = "".join(normalized.split())
+    return normalized.translate(KATAKANA_TO_HIRAGANA)
+
+
+def _is_kanji(char: str) -> bool:
+    return "\u4e00" <= char <= "\u9fff" or "\u3400" <= char <= "\u4dbf" or char == "々"
+
+
+def kanji_stem(text: str) -> Optional[str]:
+    """
+    Strip trailing okurigana from a kanji form ("聞く" -> "聞", "聞き" -> "聞").
+
+    Args:
+        text: Normalized word
+
+    Returns:
+        The stem, or None if the word contains no kanji
+    """
+    if not any(_is_kanji(char) for char in text):
+        return None
+
+    end = len(text)
+    while end > 0 and "\u3041" <= text[end - 1] <= "\u309f":
+        end -= 1
+    return text[:end] or None
+
+
+# 활용 시 바뀌는 오쿠리가나 끝 글자의 행 (탁음/반탁음은 별도의 행)
+KANA_ROWS = {
+    char: row
+    for row, chars in enumerate((
+        "あいうえお", "かきくけこ", "がぎぐげご", "さしすせそ", "ざじずぜぞ", "たちつてと", "だぢづでど",
+        "なにぬねの", "はひふへほ", "ばびぶべぼ", "ぱぴぷぺぽ", "まみむめも", "やゆよ", "らりるれろ", "わを"
+    ))
+    for char in chars
+}
+
+
+def is_inflection_of(word: str, entry: str) -> bool:
+    """
+    Whether a kanji form with okurigana is a conjugated form of a dictionary entry.
+
+    Both must share the kanji stem, and the word's okurigana must keep the
+    entry's okurigana except for its last kana, which may only change within
+    the same kana row ("聞き" of "聞く", "上げれ" of "上げる"); an ichidan-like
+    entry may also lose that last kana ("上げ" of "上げる"). Sound-changed
+    forms (聞いて, 待って) are not folded, since their row is ambiguous.
+    Entries sharing only the kanji are rejected:
+
+    >>> is_inflection_of("聞き", "聞く")
+    True
+    >>> is_inflection_of("着く", "着る")
+    False
+    >>> is_inflection_of("上がる", "上げる")
+    False
+
+    Args:
+        word: Normalized word from the request
+        entry: Normalized kanji form of a dictionary entry
+
+    Returns:
+        True if the word can be folded back to the entry
+    """
+    stem = kanji_stem(entry)
+    if not stem or stem != kanji_stem(word) or word == entry:
+        return False
+
+    entry_okurigana, word_okurigana = entry[len(stem):], word[len(stem):]
+    if not entry_okurigana or not word_okurigana:
+        return False
+
+    kept, last = entry_okurigana[:-1], entry_okurigana[-1]
+    if not word_okurigana.startswith(kept):
+        return False
+
+    rest = word_okurigana[len(kept):]
+    if not rest:
+        return bool(kept)
+    return last in KANA_ROWS and KANA_ROWS.get(rest[0]) == KANA_ROWS[last]
+
+
+class NormalizedLookupMixin:
+    """
+    Adds normalized lookups on top of an exact ``find_exact``.
+
+    Subclasses provide ``find_exact(word, level)`` and ``resolve(word)``; the
+    latter maps a raw word to the original database keys that share its
+    normalized form, or whose kanji form it conjugates (is_inflection_of).
+    """
+
+    def find(self, word: str, level: str) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Find homonyms by exact key first, then by normalized form and conjugated kanji form.
+
+        Args:
+            word: Reading or kanji form as entered by the user
+            level: Starting JLPT level for search
+
+        Returns:
+            Tuple of (homonym list or empty list, level where it was found)
+        """
+        homonyms, found_level = self.find_exact(word, level)
+        if homonyms:
+            return homonyms, found_level
+
+        for candidate in self.resolve(word):
+            if candidate == word:
+                continue
+            homonyms, found_level = self.find_exact(candidate, level)
+            if homonyms:
+                logger.debug(f"Resolved '{word}' to '{candidate}' by normalization")
+                return homonyms, found_level
+
+        return [], None
+
+
+class HomonymIndex(NormalizedLookupMixin):
+    """
+    Reverse indexes over a level -> reading -> homonym list database.
+
+    Built once from ``Config.HOMONYM_DATABASE`` so that reading lookups,
+    kanji lookups and the "other homonyms" prompt block are dictionary hits
+    instead of nested scans over every level and reading.
+
+    Indexes:
+    - readings: reading -> {level: homonym list}
+    - kanji: kanji -> {level: [(reading, homonym list), ...]} in database order
+    - other_homonyms: kanji -> precomputed "other homonyms" prompt block
+    - aliases: normalized reading/kanji -> original database keys
+    - stems: okurigana-stripped kanji stem -> original kanji forms (filtered
+      with is_inflection_of on lookup)
+    """
+
+    def __init__(self, database: Dict[str, Dict[str, List[Dict]]]):
+        self.readings = {}
+        self.kanji = {}
+        self.other_homonyms = {}
+        self.aliases = {}
+        self.stems = {}
+
+        for level_name, level_data in database.items():
+            for reading, homonym_list in level_data.items():
+                self.readings.setdefault(reading, {})[level_name] = homonym_list
+                self._add_alias(self.aliases, normalize_lookup_key(reading), reading)
+
+                for homonym in homonym_list:
+                    kanji = homonym["kanji"]
+                    self.kanji.setdefault(kanji, {}).setdefault(level_name, []).append(
+                        (reading, homonym_list)
+                    )
+
+                    normalized_kanji = normalize_lookup_key(kanji)
+                    self._add_alias(self.aliases, normalized_kanji, kanji)
+                    stem = kanji_stem(normalized_kanji)
+                    if stem:
+                        self._add_alias(self.stems, stem, kanji)
+
+        self._build_other_homonyms(database)
+
+        logger.info(f"Homonym index built: {len(self.readings)} readings, {len(self.kanji)} kanji forms")
+
+    @staticmethod
+    def _add_alias(aliases: Dict[str, List[str]], alias: str, target: str):
+        targets = aliases.setdefault(alias, [])
+        if target not in targets:
+            targets.append(target)
+
+    def _build_other_homonyms(self, database: Dict[str, Dict[str, List[Dict]]]):
+        """
+        Precompute the "other homonyms" block for every kanji.
+
+        Follows the original scan order: levels in database order, and within a
+        level the first reading that contains the kanji. The first level that
+        yields at least one other homonym wins.
+        """
+        for level_name, level_data in database.items():
+            seen_in_level = set()
+
+            for reading, homonym_list in level_data.items():
+                for homonym in homonym_list:
+                    target_kanji = homonym["kanji"]
+                    if target_kanji in seen_in_level:
+                        continue
+                    seen_in_level.add(target_kanji)
+
+                    if target_kanji in self.other_homonyms:
+                        continue
+
+                    other_info = [
+                        f"- {other['kanji']}: {other['meaning']} ({other['pos']})"
+                        for other in homonym_list
+                        if other["kanji"] != target_kanji
+                    ]
+                    if other_info:
+                        self.other_homonyms[target_kanji] = (
+                            "Other homonyms with the same pronunciation:\n" + "\n".join(other_info)
+                        )
+
+    @staticmethod
+    def search_levels(level: str) -> List[str]:
+        """
+        Levels to search for a requested level, easiest level first.
+
+        Args:
+            level: Requested JLPT level (unknown levels are treated as n3)
+
+        Returns:
+            List of level names from N5 up to the requested level
+        """
+        current_level_index = LEVEL_ORDER.index(level) if level in LEVEL_ORDER else 2  # 기본값: n3
+        return LEVEL_ORDER[:current_level_index + 1]
+
+    def resolve(self, word: str) -> List[str]:
+        """
+        Map a raw word to database keys sharing its normalized form, or
+        kanji forms the word is a conjugated form of.
+
+        Args:
+            word: Reading or kanji form as entered by the user
+
+        Returns:
+            Candidate database keys, normalized matches first
+        """
+        key = normalize_lookup_key(word)
+        candidates = list(self.aliases.get(key, []))
+
+        stem = kanji_stem(key)
+        if stem:
+            candidates.extend(
+                k for k in self.stems.get(stem, [])
+                if k not in candidates and is_inflection_of(key, normalize_lookup_key(k))
+            )
+
+        return candidates
+
+    def find_exact(self, word: str, level: str) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Find homonyms by reading or kanji form.
+
+        Searches from the requested level down to N5. In each level an exact
+        reading match wins; otherwise a kanji match returns the other kanji
+        sharing that reading (excluding the kanji itself).
+
+        Args:
+            word: Reading or kanji form
+            level: Starting JLPT level for search
+
+        Returns:
+            Tuple of (homonym list or empty list, level where it was found)
+        """
+        reading_levels = self.readings.get(word, {})
+        kanji_levels = self.kanji.get(word, {})
+
+        if not reading_levels and not kanji_levels:
+            return [], None
+
+        for search_level in reversed(self.search_levels(level)):
+            # 정확한 읽기로 찾기
+            if search_level in reading_levels:
+                return reading_levels[search_level], search_level
+
+            # 한자 형태로도 찾기 (예: "聞く" 입력 시 "きく" 키에서 찾기)
+            for reading, homonym_list in kanji_levels.get(search_level, []):
+                result = [h for h in homonym_list if h["kanji"] != word]
+                if result:
+                    return result, search_level
+
+        return [], None
+
+    def other_homonyms_info(self, target_kanji: str) -> str:
+        """
+        Get the precomputed "other homonyms" block for a kanji.
+
+        Args:
+            target_kanji: The kanji to describe the other homonyms of
+
+        Returns:
+            Formatted string listing other homonyms for comparison
+        """
+        return self.other_homonyms.get(target_kanji, NO_OTHER_HOMONYMS)
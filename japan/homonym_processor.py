@@ -1,9 +1,27 @@
 import time
 import re
 import os
+import copy
+import asyncio
+import functools
 from flask import Flask, request, jsonify
-from typing import List, Dict, Optional, Any, Union
+from typing import List, Dict, Optional, Any, Union, AsyncIterator, Tuple
 import google.generativeai as genai
+from gemini_client import gemini_clients
+from async_runtime import run_sync
+from cache_store import BASE_DIR, CacheConfig, SQLiteTTLCache, TTLCache, build_llm_cache_key, llm_response_cache
+from circuit_breaker import CircuitOpenError, llm_circuit_breaker, mark_degraded
+from homonym_index import normalize_lookup_key
+from homonym_store import LearnedHomonymStore, load_homonym_dictionary
+from example_parser import HOMONYM_EXAMPLE_PARSER, WORD_EXAMPLE_PARSER
+from hedging import RequestHedger
+from request_budget import spend_response_tokens
+from rate_limiter import llm_rate_limiter
+from retry_policy import RetryPolicy, RetrySchedule, wait_for_attempt
+from structured_output import (
+    HOMONYM_EXAMPLES_SCHEMA, COMBINED_HOMONYM_EXAMPLES_SCHEMA, HOMONYM_MEANINGS_SCHEMA,
+    with_json_output, json_generation_config, loads_json, extract_examples
+)
 app = Flask(__name__)
 
 # Configuration constants
@@ -14,12 +32,42 @@ class Config:
     DEFAULT_DIFFICULTY = os.getenv("DEFAULT_DIFFICULTY")
     DEFAULT_NUM_EXAMPLES = int(os.getenv("DEFAULT_NUM_EXAMPLES"))
     MAX_RETRIES = int(os.getenv("MAX_RETRIES"))  # seconds
-    REQUEST_TIMEOUT = 30  # seconds
+    # LLM 호출 하나의 전체 제한 시간 (모든 재시도와 대기 포함)
+    REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", 30))  # seconds
 
     # API 안전 설정
     ENABLE_SAFETY_SETTINGS = True
     USE_SIMPLIFIED_PROMPTS = True
 
+    # 동음이의어 결과 캐시 설정 (word, level, num_examples_per_meaning 단위)
+    RESULT_CACHE_ENABLED = os.getenv("HOMONYM_RESULT_CACHE_ENABLED", "true").lower() == "true"
+    RESULT_CACHE_TTL = int(os.getenv("HOMONYM_RESULT_CACHE_TTL", 24 * 60 * 60))  # seconds
+    RESULT_CACHE_MAX_ENTRIES = int(os.getenv("HOMONYM_RESULT_CACHE_MAX_ENTRIES", 2000))
+
+    # 동음이의어가 없다고 확인된 단어 캐시 (LLM 재호출 방지, 재시작 후에도 유지)
+    NEGATIVE_CACHE_ENABLED = os.getenv("HOMONYM_NEGATIVE_CACHE_ENABLED", "true").lower() == "true"
+    NEGATIVE_CACHE_PATH = os.getenv(
+        "HOMONYM_NEGATIVE_CACHE_PATH", os.path.join(BASE_DIR, ".cache", "homonym_negative.sqlite3"))
+    NEGATIVE_CACHE_TTL = int(os.getenv("HOMONYM_NEGATIVE_CACHE_TTL", 7 * 24 * 60 * 60))  # seconds
+    NEGATIVE_CACHE_MAX_ENTRIES = int(os.getenv("HOMONYM_NEGATIVE_CACHE_MAX_ENTRIES", 20000))
+
+    # 의미별 예문 생성 동시 실행 수
+    MAX_MEANING_WORKERS = int(os.getenv("MAX_MEANING_WORKERS", 5))
+
+    # 동음이의어 예문 프롬프트 모드: "per_meaning" (의미별 호출) 또는 "combined" (한 번에 호출)
+    HOMONYM_PROMPT_MODE = os.getenv("HOMONYM_PROMPT_MODE", "per_meaning").lower()
+
+    # 출력 형식: "text" (레이블 형식) 또는 "json" (스키마 지정 JSON, 실패 시 텍스트 파싱)
+    OUTPUT_FORMAT = os.getenv("LLM_OUTPUT_FORMAT", "text").lower()
+
+    # 외부 동음이의어 사전 (homonym_store.py build로 생성한 SQLite 파일, 없으면 내장 사전 사용)
+    HOMONYM_DB_PATH = os.getenv("HOMONYM_DB_PATH")
+
+    # LLM이 찾은 동음이의어를 저장하여 다음 조회부터 사전처럼 사용 (내장 사전 다음에 검색)
+    LEARNED_HOMONYMS_ENABLED = os.getenv("LEARNED_HOMONYMS_ENABLED", "true").lower() == "true"
+    LEARNED_HOMONYMS_PATH = os.getenv(
+        "LEARNED_HOMONYMS_PATH", os.path.join(BASE_DIR, ".cache", "learned_homonyms.sqlite3"))
+
     # 폴백 모드 설정
     FALLBACK_ENABLED = True
     FALLBACK_EXAMPLES = {
@@ -377,6 +425,13 @@ class Config:
     VALID_LEVELS = ["n5", "n4", "n3", "n2", "n1", "standard"]
 
 
+# 재시도 정책 (호출마다 Config.REQUEST_TIMEOUT 안에서 최대 Config.MAX_RETRIES번 시도)
+llm_retry_policy = RetryPolicy(max_attempts=Config.MAX_RETRIES, deadline=Config.REQUEST_TIMEOUT)
+
+# 느린 호출 헤징 (HedgingConfig.ENABLED일 때, 이 서비스의 최근 응답 시간 기준)
+llm_hedger = RequestHedger()
+
+
 class LLMService:
     """
     Enhanced service class for handling Large Language Model interactions with Google's Gemini AI.
@@ -394,16 +449,8 @@ class LLMService:
         Returns:
             bool: True if initialization successful, False otherwise
         """
-        if not Config.GEMINI_API_KEY:
-            app.logger.error("API key not configured. Set GEMINI_API_KEY environment variable.")
-            return False
-
-        try:
-            genai.configure(api_key=Config.GEMINI_API_KEY)
-            return True
-        except Exception as e:
-            app.logger.error(f"Failed to initialize Gemini API: {str(e)}")
-            return False
+        # 프로세스당 한 번만 genai.configure 호출 (이후 호출은 바로 반환)
+        return gemini_clients.configure(Config.GEMINI_API_KEY)
 
     @staticmethod
     def _create_safety_settings() -> List[Dict[str, Union[str, int]]]:
@@ -479,17 +526,181 @@ class LLMService:
                 app.logger.info("Creating model without custom safety settings")
                 return genai.GenerativeModel(Config.MODEL_NAME)
 
+    @staticmethod
+    def _get_model():
+        """
+        Get the shared Gemini model with safety settings applied.
+
+        The model is created once per process through _create_model_with_safety_settings
+        and reused by every call and thread afterwards.
+
+        Returns:
+            GenerativeModel instance with safety settings applied
+        """
+        return gemini_clients.get_model(
+            Config.MODEL_NAME,
+            LLMService._create_safety_settings(),
+            factory=LLMService._create_model_with_safety_settings
+        )
+
+    @staticmethod
+    def _build_generation_config(temperature: float, json_output: bool = False) -> Dict[str, Any]:
+        """
+        Create generation config - using dictionary as it's more reliable.
+
+        Args:
+            temperature: Sampling temperature for response generation (0.0-1.0)
+            json_output: Request a JSON answer (structured output mode)
+
+        Returns:
+            Generation config dictionary
+        """
+        generation_config = {
+            "temperature": temperature,
+            "top_p": 0.95,
+            "top_k": 40,
+            "max_output_tokens": 2048,
+            "candidate_count": 1,
+        }
+        if json_output:
+            return json_generation_config(generation_config)
+        return generation_config
+
     @staticmethod
     def call_llm(
             prompt: str,
-            temperature: float = Config.DEFAULT_TEMPERATURE
+            temperature: float = Config.DEFAULT_TEMPERATURE,
+            use_cache: bool = True
     ) -> Optional[str]:
         """
         Make a robust call to the Gemini LLM with comprehensive error handling.
 
+        Synchronous wrapper around call_llm_async that runs on the shared
+        background event loop.
+
+        Args:
+            prompt: The input prompt to send to the model
+            temperature: Sampling temperature for response generation (0.0-1.0)
+            use_cache: Set to False to bypass the response cache for this call
+
+        Returns:
+            Generated text response or None if all retries failed
+        """
+        return run_sync(LLMService.call_llm_async(prompt, temperature, use_cache))
+
+    @staticmethod
+    async def call_llm_async(
+            prompt: str,
+            temperature: float = Config.DEFAULT_TEMPERATURE,
+            use_cache: bool = True,
+            json_output: bool = False
+    ) -> Optional[str]:
+        """
+        Asynchronous Gemini call with comprehensive error handling.
+
+        Successful responses are stored in the on-disk response cache keyed by
+        model name, prompt hash and generation config, so repeated prompts are
+        answered without calling Gemini. Waiting for Gemini and retry backoffs
+        do not block a thread.
+
         Args:
             prompt: The input prompt to send to the model
             temperature: Sampling temperature for response generation (0.0-1.0)
+            use_cache: Set to False to bypass the response cache for this call
+            json_output: The prompt asks for a JSON answer (structured output mode)
+
+        Returns:
+            Generated text response or None if all retries failed
+        """
+        generation_config = LLMService._build_generation_config(temperature, json_output)
+
+        cache_key = None
+        if use_cache and CacheConfig.LLM_CACHE_ENABLED:
+            cache_key = build_llm_cache_key(Config.MODEL_NAME, prompt, generation_config)
+            cached_response = await llm_response_cache.get_async(cache_key)
+            if cached_response is not None:
+                app.logger.debug("LLM response served from cache")
+                return cached_response
+
+        response_text = await LLMService._call_llm_uncached_async(prompt, generation_config)
+        spend_response_tokens(response_text)
+        await llm_rate_limiter.record_response(response_text)
+
+        if response_text and cache_key is not None:
+            await llm_response_cache.set_async(cache_key, response_text)
+
+        return response_text
+
+    @staticmethod
+    def get_cache_stats() -> Dict[str, Any]:
+        """
+        Get hit/miss counters of the LLM response cache.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        return llm_response_cache.stats()
+
+    @staticmethod
+    def get_hedge_stats() -> Dict[str, Any]:
+        """
+        Get the hedging counters of this service's Gemini calls.
+
+        Returns:
+            Dictionary with calls, hedged calls and the extra-call rate
+        """
+        return llm_hedger.stats()
+
+    @staticmethod
+    async def _generate_once_async(
+            model: Any,
+            prompt: str,
+            generation_config: Dict[str, Any],
+            schedule: RetrySchedule
+    ) -> Any:
+        """
+        Send one generate_content request.
+
+        Goes through the circuit breaker first (a rejected call uses no rate
+        limit capacity), then waits for the rate limiter; cancelled when the
+        call's deadline passes.
+
+        Args:
+            model: Gemini model
+            prompt: The input prompt to send to the model
+            generation_config: Generation parameters for the request
+            schedule: Retry schedule of the call
+
+        Returns:
+            Gemini response
+        """
+        async with llm_circuit_breaker.guard() as attempt, llm_rate_limiter.limit(prompt, schedule.remaining()):
+            attempt.start()
+            return await wait_for_attempt(
+                model.generate_content_async(
+                    prompt,
+                    generation_config=generation_config  # type: ignore[arg-type]
+                ),
+                schedule
+            )
+
+    @staticmethod
+    async def _call_llm_uncached_async(
+            prompt: str,
+            generation_config: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Call Gemini with retries, bypassing the response cache.
+
+        Retries follow llm_retry_policy: jittered, non-blocking waits and a
+        hard deadline of Config.REQUEST_TIMEOUT seconds for the whole call.
+        A slow attempt may be hedged with a duplicate (see hedging.py).
+        While llm_circuit_breaker is open the call returns None at once and
+        the request is marked as degraded.
+
+        Args:
+            prompt: The input prompt to send to the model
+            generation_config: Generation parameters for the request
 
         Returns:
             Generated text response or None if all retries failed
@@ -498,42 +709,42 @@ class LLMService:
             app.logger.error("API key not configured. Set GEMINI_API_KEY environment variable.")
             return None
 
+        # Gemini 장애로 회로가 열려 있으면 재시도 없이 바로 대체 경로로
+        if llm_circuit_breaker.is_open:
+            app.logger.warning("Gemini circuit is open, skipping LLM call")
+            mark_degraded()
+            return None
+
         # Initialize Gemini API if not already initialized
         LLMService.initialize_gemini()
 
-        # Retry logic for API call
-        retry_count = 0
+        # 재시도 일정 (decorrelated jitter, Retry-After 반영, 호출 전체 제한 시간)
+        schedule = llm_retry_policy.begin()
 
-        while retry_count < Config.MAX_RETRIES:
+        while schedule.start_attempt(prompt):
             try:
-                # Create model with safety settings
-                model = LLMService._create_model_with_safety_settings()
-
-                # Create generation config - using dictionary as it's more reliable
-                generation_config = {
-                    "temperature": temperature,
-                    "top_p": 0.95,
-                    "top_k": 40,
-                    "max_output_tokens": 2048,
-                    "candidate_count": 1,
-                }
-
-                # Generate content with error handling
-                response = model.generate_content(
-                    prompt,
-                    generation_config=generation_config  # type: ignore[arg-type]
+                # Reuse the shared model with safety settings
+                model = LLMService._get_model()
+
+                # Generate content with error handling (느린 응답은 중복 요청 후 먼저 끝난 응답 사용)
+                response = await llm_hedger.run(
+                    functools.partial(LLMService._generate_once_async, model, prompt, generation_config, schedule),
+                    schedule,
+                    prompt
                 )
 
                 # Comprehensive response validation
                 if response is None:
                     app.logger.error("Received None response from Gemini API")
-                    retry_count += 1
+                    if not await schedule.backoff():
+                        break
                     continue
 
                 # Check if response has candidates
                 if not hasattr(response, 'candidates') or not response.candidates:
                     app.logger.error("No candidates in response")
-                    retry_count += 1
+                    if not await schedule.backoff():
+                        break
                     continue
 
                 # Check finish reason for the first candidate
@@ -569,13 +780,12 @@ class LLMService:
                 elif finish_reason == 3:  # SAFETY
                     app.logger.warning("Response blocked by safety filters")
                     # Try with modified prompt
-                    if retry_count < Config.MAX_RETRIES - 1:
+                    if schedule.attempts < schedule.policy.max_attempts:
                         app.logger.info("Retrying with modified prompt...")
                         # Simplify the prompt to avoid safety issues
                         simplified_prompt = LLMService._simplify_prompt(prompt)
                         if simplified_prompt != prompt:
                             prompt = simplified_prompt
-                            retry_count += 1
                             continue
 
                 elif finish_reason == 4:  # RECITATION
@@ -585,30 +795,26 @@ class LLMService:
                     app.logger.warning(f"Unknown finish_reason: {finish_reason}")
 
                 # If we get here, the response wasn't successful
-                retry_count += 1
-                if retry_count < Config.MAX_RETRIES:
-                    wait_time = 2 ** retry_count  # Exponential backoff
-                    app.logger.info(
-                        f"Retrying in {wait_time} seconds... (attempt {retry_count + 1}/{Config.MAX_RETRIES})")
-                    time.sleep(wait_time)
+                if not await schedule.backoff():
+                    break
+
+            except CircuitOpenError:
+                app.logger.warning("Gemini circuit opened, giving up LLM call")
+                mark_degraded()
+                break
+
+            except asyncio.TimeoutError:
+                app.logger.error(f"Gemini API call exceeded the {Config.REQUEST_TIMEOUT}s deadline")
+                break
 
             except Exception as e:
-                error_msg = str(e)
-                app.logger.error(f"Gemini API call error: {error_msg}")
-
-                # Handle specific error types
-                if "500" in error_msg or "internal error" in error_msg.lower():
-                    app.logger.info("Server error detected, waiting longer before retry...")
-                    time.sleep(5)
-                elif "quota" in error_msg.lower() or "rate" in error_msg.lower():
-                    app.logger.warning("Rate limit or quota exceeded, waiting...")
-                    time.sleep(10)
-
-                retry_count += 1
-                if retry_count < Config.MAX_RETRIES:
-                    time.sleep(2)
-
-        app.logger.error(f"All {Config.MAX_RETRIES} retry attempts failed")
+                app.logger.error(f"Gemini API call error: {str(e)}")
+
+                # 오류 종류(서버 오류, 할당량 초과)와 Retry-After에 따라 대기 시간 결정
+                if not await schedule.backoff(e):
+                    break
+
+        app.logger.error(f"Gemini API call failed after {schedule.attempts} attempts")
         return None
 
     @staticmethod
@@ -655,7 +861,8 @@ class LLMService:
         """
         try:
             # Simple test call
-            model = LLMService._create_model_with_safety_settings()
+            LLMService.initialize_gemini()
+            model = LLMService._get_model()
             test_response = model.generate_content(
                 "Test",
                 generation_config={"max_output_tokens": 10}  # type: ignore[arg-type]
@@ -678,6 +885,23 @@ class LLMService:
             }
 
 
+# LLM으로 찾은 동음이의어 저장소
+learned_homonyms = LearnedHomonymStore(Config.LEARNED_HOMONYMS_PATH) if Config.LEARNED_HOMONYMS_ENABLED else None
+
+# 동음이의어 사전 (외부 사전이 있으면 그것만 열고 내장 사전 인덱스는 외부 사전 조회 실패 시에만 생성, 학습된 동음이의어는 마지막)
+homonym_index = load_homonym_dictionary(Config.HOMONYM_DB_PATH, Config.HOMONYM_DATABASE, learned_homonyms)
+
+homonym_result_cache = TTLCache(Config.RESULT_CACHE_TTL, Config.RESULT_CACHE_MAX_ENTRIES)
+
+# LLM이 동음이의어가 없다고 답한 단어 (정규화된 단어 단위)
+homonym_negative_cache = SQLiteTTLCache(
+    Config.NEGATIVE_CACHE_PATH,
+    table="homonym_negative",
+    ttl=Config.NEGATIVE_CACHE_TTL,
+    max_entries=Config.NEGATIVE_CACHE_MAX_ENTRIES
+)
+
+
 class HomonymExampleGenerator:
     """
     Main service class for Japanese homonym detection and example sentence generation.
@@ -721,16 +945,44 @@ class HomonymExampleGenerator:
             - meaning: Korean translation/meaning
             - contexts: List of usage contexts in Korean
         """
-        # 1. 먼저 데이터베이스에서 찾기
-        database_results = HomonymExampleGenerator._find_from_database(word, level)
+        return run_sync(HomonymExampleGenerator.find_homonym_meanings_async(word, level))
+
+    @staticmethod
+    async def find_homonym_meanings_async(
+            word: str,
+            level: str = Config.DEFAULT_DIFFICULTY,
+            use_cache: bool = True
+    ) -> List[Dict]:
+        """
+        Asynchronous variant of find_homonym_meanings.
+
+        Words the LLM has already reported as having no homonyms are kept in
+        the negative cache and answered with [] without calling it again
+        (the database is still searched first).
+
+        Args:
+            word: Japanese word (hiragana, katakana, or kanji)
+            level: JLPT level for appropriate difficulty (n5, n4, n3, n2, n1)
+            use_cache: Set to False to ask the LLM even for known non-homonyms
+
+        Returns:
+            List of homonym dictionaries (kanji, pos, meaning, contexts)
+        """
+        # 1. 먼저 데이터베이스에서 찾기 (SQLite 조회는 이벤트 루프 밖에서)
+        database_results = await asyncio.to_thread(HomonymExampleGenerator._find_from_database, word, level)
 
         if database_results:
             app.logger.info(f"Found homonyms for '{word}' in database: {len(database_results)} meanings")
             return database_results
 
-        # 2. 데이터베이스에 없으면 LLM으로 찾기
+        # 2. 동음이의어가 없다고 이미 확인된 단어는 LLM 호출 생략
+        if use_cache and await HomonymExampleGenerator._is_known_non_homonym_async(word):
+            app.logger.info(f"'{word}' is a known non-homonym, skipping LLM search")
+            return []
+
+        # 3. 데이터베이스에 없으면 LLM으로 찾기
         app.logger.info(f"'{word}' not found in database, using LLM fallback")
-        return HomonymExampleGenerator._find_from_llm(word, level)
+        return await HomonymExampleGenerator._find_from_llm_async(word, level, use_cache)
 
     @staticmethod
     def _find_from_database(word: str, level: str) -> List[Dict]:
@@ -739,6 +991,11 @@ class HomonymExampleGenerator:
 
         Searches through JLPT levels from the specified level down to N5,
         looking for exact matches in both reading (hiragana) and kanji forms.
+        Inputs that miss are retried with their normalized form (NFKC,
+        katakana folded to hiragana, whitespace removed) and, for conjugated
+        kanji forms, the dictionary form with the same okurigana row, so
+        "キク", "ｷｸ" or "聞き" still hit the database instead of the LLM.
+        Homonym sets previously found by the LLM (learned store) are searched last.
 
         Args:
             word: Japanese word to search for
@@ -747,39 +1004,26 @@ class HomonymExampleGenerator:
         Returns:
             List of homonym dictionaries or empty list if not found
         """
-        # 현재 레벨과 하위 레벨들에서 찾기
-        level_order = ["n5", "n4", "n3", "n2", "n1"]
-        current_level_index = level_order.index(level) if level in level_order else 2  # 기본값: n3
-
-        # 현재 레벨부터 N5까지 역순으로 검색 (하위 레벨 우선)
-        search_levels = level_order[:current_level_index + 1]
-
-        for search_level in reversed(search_levels):
-            level_data = Config.HOMONYM_DATABASE.get(search_level, {})
-
-            # 정확한 읽기로 찾기
-            if word in level_data:
-                homonyms = level_data[word]
-                app.logger.debug(f"Found '{word}' in level {search_level}")
-                return homonyms
-
-            # 한자 형태로도 찾기 (예: "聞く" 입력 시 "きく" 키에서 찾기)
-            for reading, homonym_list in level_data.items():
-                for homonym in homonym_list:
-                    if homonym["kanji"] == word:
-                        # 같은 읽기의 다른 한자들 반환 (자기 자신 제외)
-                        result = [h for h in homonym_list if h["kanji"] != word]
-                        if result:
-                            app.logger.debug(f"Found '{word}' as kanji variant in level {search_level}")
-                            return result
-
-        return []
+        # 현재 레벨부터 N5까지 역순으로 검색 (인덱스 조회)
+        homonyms, found_level = homonym_index.find(word, level)
+        if homonyms:
+            app.logger.debug(f"Found '{word}' in level {found_level}")
+        return homonyms
 
     @staticmethod
     def _find_from_llm(word: str, level: str) -> List[Dict]:
         """
         Enhanced LLM-based homonym detection with fallback system.
         """
+        return run_sync(HomonymExampleGenerator._find_from_llm_async(word, level))
+
+    @staticmethod
+    async def _find_from_llm_async(word: str, level: str, use_cache: bool = True) -> List[Dict]:
+        """
+        Asynchronous LLM-based homonym detection with fallback system.
+
+        Pass use_cache=False to bypass the LLM response cache.
+        """
         level_text = Config.LEVEL_DESCRIPTIONS.get(level, Config.LEVEL_DESCRIPTIONS["standard"])
         database_examples = HomonymExampleGenerator._get_database_examples_for_prompt(level)
 
@@ -805,7 +1049,12 @@ class HomonymExampleGenerator:
         Only return different kanji with same pronunciation.
         """.strip()
 
-        response = LLMService.call_llm(prompt, temperature=0.1)
+        json_output = Config.OUTPUT_FORMAT == "json"
+        if json_output:
+            prompt = with_json_output(prompt, HOMONYM_MEANINGS_SCHEMA)
+
+        response = await LLMService.call_llm_async(
+            prompt, temperature=0.1, use_cache=use_cache, json_output=json_output)
 
         if not response:
             app.logger.error(f"Failed to get homonym meanings for {word}")
@@ -816,29 +1065,34 @@ class HomonymExampleGenerator:
             return []
 
         try:
-            # Try to extract JSON
-            json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
-            if json_match:
-                json_text = json_match.group(1)
-            else:
-                json_match = re.search(r'(\{.*\})', response, re.DOTALL)
+            # 구조화 출력 모드: 응답 전체를 JSON으로 디코딩 (실패 시 아래 정규식 추출로 대체)
+            result = loads_json(response) if json_output else None
+
+            if not isinstance(result, dict):
+                # Try to extract JSON
+                json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
                 if json_match:
                     json_text = json_match.group(1)
                 else:
-                    # If no JSON found, try fallback
-                    if word in Config.FALLBACK_EXAMPLES:
-                        app.logger.warning(f"JSON parsing failed, using fallback for '{word}'")
-                        return [h for h in Config.FALLBACK_EXAMPLES[word] if h["kanji"] != word]
-                    return []
-
-            import json
-            result = json.loads(json_text)
+                    json_match = re.search(r'(\{.*\})', response, re.DOTALL)
+                    if json_match:
+                        json_text = json_match.group(1)
+                    else:
+                        # If no JSON found, try fallback
+                        if word in Config.FALLBACK_EXAMPLES:
+                            app.logger.warning(f"JSON parsing failed, using fallback for '{word}'")
+                            return [h for h in Config.FALLBACK_EXAMPLES[word] if h["kanji"] != word]
+                        return []
+
+                import json
+                result = json.loads(json_text)
 
             if not result.get("homonyms_found", False):
                 # Try fallback before giving up
                 if word in Config.FALLBACK_EXAMPLES:
                     app.logger.info(f"No homonyms found by AI, using fallback for '{word}'")
                     return [h for h in Config.FALLBACK_EXAMPLES[word] if h["kanji"] != word]
+                await HomonymExampleGenerator._remember_non_homonym_async(word)
                 return []
 
             meanings = result.get("meanings", [])
@@ -859,6 +1113,14 @@ class HomonymExampleGenerator:
                 app.logger.info(f"Filtered results empty, using fallback for '{word}'")
                 return [h for h in Config.FALLBACK_EXAMPLES[word] if h["kanji"] != word]
 
+            if not filtered_meanings:
+                await HomonymExampleGenerator._remember_non_homonym_async(word)
+            elif learned_homonyms is not None:
+                # 다음 조회부터 데이터베이스 경로에서 찾도록 저장
+                stored = await asyncio.to_thread(
+                    learned_homonyms.record, word, level, filtered_meanings, source="llm", model=Config.MODEL_NAME)
+                if stored:
+                    app.logger.info(f"Stored {stored} learned homonyms for '{word}'")
             return filtered_meanings
 
         except Exception as e:
@@ -869,6 +1131,24 @@ class HomonymExampleGenerator:
                 return [h for h in Config.FALLBACK_EXAMPLES[word] if h["kanji"] != word]
             return []
 
+    @staticmethod
+    async def _is_known_non_homonym_async(word: str) -> bool:
+        """Whether the LLM already reported that the word has no homonyms."""
+        if not Config.NEGATIVE_CACHE_ENABLED:
+            return False
+        return await homonym_negative_cache.get_async(normalize_lookup_key(word)) is not None
+
+    @staticmethod
+    async def _remember_non_homonym_async(word: str):
+        """
+        Record a word the LLM answered with no homonyms.
+
+        Only called for an actual "no homonyms" answer, never when the call
+        or the parsing failed, so errors are retried on the next request.
+        """
+        if Config.NEGATIVE_CACHE_ENABLED:
+            await homonym_negative_cache.set_async(normalize_lookup_key(word), True)
+
     @staticmethod
     def _get_database_examples_for_prompt(level: str) -> str:
         """
@@ -899,24 +1179,208 @@ class HomonymExampleGenerator:
 
         return "\n".join(examples[:8])  # 최대 8개 예시
 
+    @staticmethod
+    def _result_cache_key(word: str, level: str, num_examples_per_meaning: int) -> tuple:
+        """
+        Build the result cache key for a homonym request.
+
+        The word is only stripped, not normalized: the cached explanations
+        name the word as it was requested, so "キク" must not be served the
+        result built for "きく".
+
+        Args:
+            word: Requested word
+            level: JLPT level
+            num_examples_per_meaning: Number of examples per meaning
+
+        Returns:
+            Tuple of (stripped word, level, num_examples_per_meaning)
+        """
+        return word.strip(), level.lower(), num_examples_per_meaning
+
     @staticmethod
     def generate_homonym_examples(
             word: str,
             level: str = Config.DEFAULT_DIFFICULTY,
-            num_examples_per_meaning: int = 3
+            num_examples_per_meaning: int = 3,
+            use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Generate homonym examples with minimal JSON response format.
         Removes source and word fields from response.
+
+        Complete results are kept in an in-process TTL/LRU cache, and the
+        "cached" field tells whether the response was served from it.
+        Pass use_cache=False to force a fresh generation.
+        """
+        return run_sync(HomonymExampleGenerator.generate_homonym_examples_async(
+            word, level, num_examples_per_meaning, use_cache
+        ))
+
+    @staticmethod
+    async def generate_homonym_examples_async(
+            word: str,
+            level: str = Config.DEFAULT_DIFFICULTY,
+            num_examples_per_meaning: int = 3,
+            use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Asynchronous variant of generate_homonym_examples.
+
+        Args:
+            word: Japanese word (hiragana, katakana, or kanji)
+            level: JLPT level
+            num_examples_per_meaning: Number of examples per meaning
+            use_cache: Set to False to force a fresh generation
+
+        Returns:
+            Homonym response dictionary with a "cached" flag
+        """
+        cache_enabled = use_cache and Config.RESULT_CACHE_ENABLED
+        cache_key = HomonymExampleGenerator._result_cache_key(word, level, num_examples_per_meaning)
+
+        if cache_enabled:
+            cached_result = homonym_result_cache.get(cache_key)
+            if cached_result is not None:
+                app.logger.info(f"Homonym examples for '{word}' served from result cache")
+                result = copy.deepcopy(cached_result)
+                result["cached"] = True
+                return result
+
+        result, complete = await HomonymExampleGenerator._build_homonym_result_async(
+            word, level, num_examples_per_meaning, use_cache)
+
+        # LLM 실패로 기본 예시가 들어간 결과는 캐시하지 않음
+        if cache_enabled and complete:
+            homonym_result_cache.set(cache_key, copy.deepcopy(result))
+
+        result["cached"] = False
+        return result
+
+    @staticmethod
+    def get_result_cache_stats() -> Dict[str, Any]:
+        """
+        Get hit/miss counters of the homonym result cache.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        return homonym_result_cache.stats()
+
+    @staticmethod
+    def get_negative_cache_stats() -> Dict[str, Any]:
+        """
+        Get hit/miss counters of the non-homonym (negative) cache.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        return homonym_negative_cache.stats()
+
+    @staticmethod
+    async def stream_homonym_examples_async(
+            word: str,
+            level: str = Config.DEFAULT_DIFFICULTY,
+            num_examples_per_meaning: int = 3,
+            use_cache: bool = True
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
         """
-        meanings = HomonymExampleGenerator.find_homonym_meanings(word, level)
+        Stream the homonym response as (event, data) pairs while it is generated.
+
+        Events:
+            meanings: {"found", "meanings" (without examples), "cached"} as soon
+                as the meanings are known (or {"found": False, "error"})
+            meaning: {"index", kanji, pos, meaning, contexts, examples} for each
+                meaning, in completion order
+            done: {"complete", "cached"} once every meaning is finished
+
+        The assembled result is stored in the result cache exactly like
+        generate_homonym_examples, so both paths share cache entries.
+
+        Args:
+            word: Japanese word (hiragana, katakana, or kanji)
+            level: JLPT level
+            num_examples_per_meaning: Number of examples per meaning
+            use_cache: Set to False to force a fresh generation
+        """
+        cache_enabled = use_cache and Config.RESULT_CACHE_ENABLED
+        cache_key = HomonymExampleGenerator._result_cache_key(word, level, num_examples_per_meaning)
+
+        if cache_enabled:
+            cached_result = homonym_result_cache.get(cache_key)
+            if cached_result is not None:
+                cached_result = copy.deepcopy(cached_result)
+                yield "meanings", {
+                    "found": True,
+                    "meanings": [{**meaning, "examples": []} for meaning in cached_result["meanings"]],
+                    "cached": True
+                }
+                for index, meaning_result in enumerate(cached_result["meanings"]):
+                    yield "meaning", {"index": index, **meaning_result}
+                yield "done", {"complete": True, "cached": True}
+                return
+
+        meanings = await HomonymExampleGenerator.find_homonym_meanings_async(word, level, use_cache)
+
+        if not meanings:
+            yield "meanings", HomonymExampleGenerator._not_found_result(word)
+            yield "done", {"complete": False, "cached": False}
+            return
+
+        # 데이터베이스/검색 결과의 의미 목록을 예문 생성 전에 먼저 전송
+        yield "meanings", {
+            "found": True,
+            "meanings": [HomonymExampleGenerator._build_meaning_header(meaning_data) for meaning_data in meanings],
+            "cached": False
+        }
+
+        meaning_results = [None] * len(meanings)
+        async for index, meaning_result, generated in HomonymExampleGenerator._iter_meaning_results_async(
+                word, meanings, level, num_examples_per_meaning, use_cache):
+            meaning_results[index] = (meaning_result, generated)
+            yield "meaning", {"index": index, **meaning_result}
+
+        complete = all(generated for _, generated in meaning_results)
+        if cache_enabled and complete:
+            homonym_result_cache.set(cache_key, {
+                "found": True,
+                "meanings": [copy.deepcopy(meaning_result) for meaning_result, _ in meaning_results]
+            })
+
+        yield "done", {"complete": complete, "cached": False}
+
+    @staticmethod
+    def _not_found_result(word: str) -> Dict[str, Any]:
+        """Response body for a word without any known homonym meanings."""
+        return {
+            "found": False,
+            "error": f"'{word}'에 대한 동음이의어 정보를 찾을 수 없습니다. 데이터베이스와 AI 검색 모두에서 결과가 없습니다."
+        }
+
+    @staticmethod
+    async def _build_homonym_result_async(
+            word: str,
+            level: str,
+            num_examples_per_meaning: int,
+            use_cache: bool = True
+    ) -> tuple:
+        """
+        Build the full homonym response for a word.
+
+        Args:
+            word: Japanese word (hiragana, katakana, or kanji)
+            level: JLPT level
+            num_examples_per_meaning: Number of examples per meaning
+            use_cache: Set to False to bypass the non-homonym cache
+
+        Returns:
+            Tuple of (response dictionary, whether every meaning got LLM examples)
+        """
+        meanings = await HomonymExampleGenerator.find_homonym_meanings_async(word, level, use_cache)
 
         if not meanings:
             app.logger.warning(f"No homonym meanings found for '{word}' at level {level}")
-            return {
-                "found": False,
-                "error": f"'{word}'에 대한 동음이의어 정보를 찾을 수 없습니다. 데이터베이스와 AI 검색 모두에서 결과가 없습니다."
-            }
+            return HomonymExampleGenerator._not_found_result(word), False
 
         result = {
             "found": True,
@@ -924,84 +1388,342 @@ class HomonymExampleGenerator:
             # source와 word 필드 제거
         }
 
+        meaning_results = [None] * len(meanings)
+        async for index, meaning_result, generated in HomonymExampleGenerator._iter_meaning_results_async(
+                word, meanings, level, num_examples_per_meaning, use_cache):
+            meaning_results[index] = (meaning_result, generated)
+
+        complete = all(generated for _, generated in meaning_results)
+        result["meanings"] = [meaning_result for meaning_result, _ in meaning_results]
+
+        return result, complete
+
+    @staticmethod
+    async def _iter_meaning_results_async(
+            word: str,
+            meanings: List[Dict],
+            level: str,
+            num_examples_per_meaning: int,
+            use_cache: bool = True
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any], bool]]:
+        """
+        Generate examples for every meaning and yield each one as soon as it is ready.
+
+        In combined mode the single combined call runs first; meanings missing
+        from its answer fall back to concurrent per-meaning prompts.
+
+        Args:
+            word: The pronunciation/reading of the homonym
+            meanings: Meanings to generate examples for
+            level: JLPT level
+            num_examples_per_meaning: Number of examples per meaning
+            use_cache: Set to False to bypass the LLM response cache
+
+        Yields:
+            Tuples of (index in meanings, meaning dictionary, whether real examples were generated)
+        """
         # Get level-specific instruction components
         level_text = Config.LEVEL_DESCRIPTIONS.get(level, Config.LEVEL_DESCRIPTIONS["standard"])
         instruction_detail = Config.DETAILED_INSTRUCTIONS.get(level, Config.DETAILED_INSTRUCTIONS["standard"])
 
-        # Generate examples for each meaning
-        for meaning_data in meanings:
-            # Convert Japanese pos to Korean
-            korean_pos = HomonymExampleGenerator._convert_pos_to_korean(meaning_data["pos"])
-
-            meaning_result = {
-                "kanji": meaning_data["kanji"],
-                "pos": korean_pos,
-                "meaning": meaning_data["meaning"],
-                "contexts": meaning_data.get("contexts", []),
-                "examples": []
-            }
+        pending_indexes = list(range(len(meanings)))
 
-            # Build prompt for this specific meaning
-            prompt = HomonymExampleGenerator._build_homonym_example_prompt(
+        # 통합 프롬프트 모드: 한 번의 호출로 모든 한자 변형의 예문 생성
+        if Config.HOMONYM_PROMPT_MODE == "combined" and len(meanings) > 1:
+            combined_results = await HomonymExampleGenerator._generate_combined_results_async(
+                word, meanings, level_text, instruction_detail, num_examples_per_meaning, use_cache
+            )
+            for index in sorted(combined_results):
+                yield index, combined_results[index], True
+
+            # 통합 응답에서 빠진 의미는 기존 의미별 경로로 생성
+            pending_indexes = [index for index in pending_indexes if index not in combined_results]
+            if pending_indexes and combined_results:
+                app.logger.info(
+                    f"Combined response missed {len(pending_indexes)} meanings for '{word}', "
+                    f"falling back to per-meaning prompts")
+
+        if not pending_indexes:
+            return
+
+        async for position, meaning_result, generated in HomonymExampleGenerator._iter_per_meaning_results_async(
                 word,
-                meaning_data,
+                [meanings[index] for index in pending_indexes],
                 level_text,
                 instruction_detail,
-                num_examples_per_meaning
-            )
+                num_examples_per_meaning,
+                use_cache):
+            yield pending_indexes[position], meaning_result, generated
 
-            # Call LLM to generate examples
-            response = LLMService.call_llm(prompt)
+    @staticmethod
+    async def _iter_per_meaning_results_async(
+            word: str,
+            meanings: List[Dict],
+            level_text: str,
+            instruction_detail: str,
+            num_examples_per_meaning: int,
+            use_cache: bool = True
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any], bool]]:
+        """
+        Run one LLM call per meaning concurrently and yield results in completion order.
 
-            if response:
-                # Parse examples from response
-                examples = HomonymExampleGenerator._parse_examples(response, word, meaning_data["kanji"])
+        Args:
+            word: The pronunciation/reading of the homonym
+            meanings: Meanings to generate examples for
+            level_text: JLPT level description
+            instruction_detail: Level-specific grammar instructions
+            num_examples_per_meaning: Number of examples per meaning
+            use_cache: Set to False to bypass the LLM response cache
 
-                # Clean examples - remove contains_kanji field
-                cleaned_examples = []
-                for example in examples:
-                    cleaned_example = {
-                        "japanese": example["japanese"],
-                        "korean": example["korean"],
-                        "explanation": example["explanation"]
-                    }
-                    cleaned_examples.append(cleaned_example)
+        Yields:
+            Tuples of (position in meanings, meaning dictionary, whether real examples were generated)
+        """
+        # 의미별 예문 생성을 동시에 실행 (동시 실행 수 제한)
+        semaphore = asyncio.Semaphore(max(1, Config.MAX_MEANING_WORKERS))
+
+        async def generate(position: int, meaning_data: Dict) -> tuple:
+            async with semaphore:
+                try:
+                    meaning_result, generated = await HomonymExampleGenerator._generate_meaning_result_async(
+                        word,
+                        meaning_data,
+                        level_text,
+                        instruction_detail,
+                        num_examples_per_meaning,
+                        use_cache
+                    )
+                except Exception as e:
+                    # 한 의미의 실패가 다른 의미의 결과에 영향을 주지 않도록 기본 예시로 대체
+                    app.logger.error(f"Example generation failed for {word} ({meaning_data.get('kanji')}): {str(e)}")
+                    meaning_result = HomonymExampleGenerator._build_meaning_header(meaning_data)
+                    meaning_result["examples"] = HomonymExampleGenerator._build_placeholder_examples(
+                        word, meaning_data)
+                    generated = False
+                return position, meaning_result, generated
+
+        tasks = [
+            asyncio.ensure_future(generate(position, meaning_data))
+            for position, meaning_data in enumerate(meanings)
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # 소비자가 중간에 멈추면 (예: 스트림 연결 종료) 남은 호출 취소
+            for task in tasks:
+                task.cancel()
 
-                # 예시가 3개보다 적으면 기본 예시로 채우기
-                while len(cleaned_examples) < 3:
-                    app.logger.warning(
-                        f"Less than 3 examples generated for {word} ({meaning_data['kanji']}). Adding enhanced placeholder example.")
+    @staticmethod
+    async def _generate_combined_results_async(
+            word: str,
+            meanings: List[Dict],
+            level_text: str,
+            instruction_detail: str,
+            num_examples_per_meaning: int,
+            use_cache: bool = True
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Generate examples for every meaning with a single combined LLM call.
 
-                    contexts = meaning_data.get("contexts", ["일반적인 사용"])
-                    context_example = contexts[len(cleaned_examples) % len(contexts)] if contexts else "일반적인 사용"
+        Args:
+            word: The pronunciation/reading of the homonym
+            meanings: All meanings (kanji variants) of the reading
+            level_text: JLPT level description
+            instruction_detail: Level-specific grammar instructions
+            num_examples_per_meaning: Number of examples per meaning
+            use_cache: Set to False to bypass the LLM response cache
 
-                    cleaned_examples.append({
-                        "japanese": f"{meaning_data['kanji']}를 사용한 예문입니다.",
-                        "korean": f"{meaning_data['meaning']}의 예문입니다.",
-                        "explanation": f"이 예문은 '{word}'가 '{meaning_data['meaning']}'라는 의미로 사용된 {context_example} 상황의 예입니다."
-                    })
+        Returns:
+            Dictionary mapping meaning index to its finished meaning dictionary.
+            Meanings missing from the response are not included.
+        """
+        prompt = HomonymExampleGenerator._build_combined_homonym_prompt(
+            word, meanings, level_text, instruction_detail, num_examples_per_meaning
+        )
 
-                # 예시가 3개보다 많으면 3개로 제한
-                if len(cleaned_examples) > 3:
-                    cleaned_examples = cleaned_examples[:3]
+        json_output = Config.OUTPUT_FORMAT == "json"
+        if json_output:
+            prompt = with_json_output(prompt, COMBINED_HOMONYM_EXAMPLES_SCHEMA)
 
-                meaning_result["examples"] = cleaned_examples
-            else:
-                # LLM 응답이 없는 경우 기본 예시 3개 생성
-                contexts = meaning_data.get("contexts", ["일반적인 사용", "기본 상황", "예시 상황"])
-                meaning_result["examples"] = []
+        try:
+            response = await LLMService.call_llm_async(prompt, use_cache=use_cache, json_output=json_output)
+        except Exception as e:
+            app.logger.error(f"Combined example generation failed for {word}: {str(e)}")
+            return {}
+
+        if not response:
+            return {}
 
-                for i in range(3):
-                    context = contexts[i] if i < len(contexts) else f"상황 {i + 1}"
-                    meaning_result["examples"].append({
-                        "japanese": f"{meaning_data['kanji']}에 관한 {context}의 예문입니다.",
-                        "korean": f"{meaning_data['meaning']}에 관한 {context}의 예문입니다.",
-                        "explanation": f"이 예문은 '{word}'가 '{meaning_data['meaning']}'라는 의미로 {context}에서 사용된 예입니다."
-                    })
+        examples_by_kanji = None
+        if json_output:
+            examples_by_kanji = HomonymExampleGenerator._parse_combined_examples_json(response, word, meanings)
+        if examples_by_kanji is None:
+            examples_by_kanji = HomonymExampleGenerator._parse_combined_examples(response, word, meanings)
 
-            result["meanings"].append(meaning_result)
+        results = {}
+        for index, meaning_data in enumerate(meanings):
+            examples = examples_by_kanji.get(meaning_data["kanji"])
+            if not examples:
+                continue
 
-        return result
+            meaning_result = HomonymExampleGenerator._build_meaning_header(meaning_data)
+            meaning_result["examples"] = HomonymExampleGenerator._finalize_examples(word, meaning_data, examples)
+            results[index] = meaning_result
+
+        return results
+
+    @staticmethod
+    def _build_meaning_header(meaning_data: Dict) -> Dict[str, Any]:
+        """
+        Build the response entry for one meaning, without examples.
+
+        Args:
+            meaning_data: Dictionary with kanji, pos, meaning, and contexts
+
+        Returns:
+            Meaning dictionary with an empty examples list
+        """
+        # Convert Japanese pos to Korean
+        korean_pos = HomonymExampleGenerator._convert_pos_to_korean(meaning_data["pos"])
+
+        return {
+            "kanji": meaning_data["kanji"],
+            "pos": korean_pos,
+            "meaning": meaning_data["meaning"],
+            "contexts": meaning_data.get("contexts", []),
+            "examples": []
+        }
+
+    @staticmethod
+    def _build_placeholder_examples(word: str, meaning_data: Dict) -> List[Dict[str, str]]:
+        """
+        Build 3 default examples for a meaning when the LLM gave no response.
+
+        Args:
+            word: The pronunciation/reading of the homonym
+            meaning_data: Dictionary with kanji, meaning, and context info
+
+        Returns:
+            List of placeholder example dictionaries
+        """
+        # LLM 응답이 없는 경우 기본 예시 3개 생성
+        contexts = meaning_data.get("contexts", ["일반적인 사용", "기본 상황", "예시 상황"])
+        examples = []
+
+        for i in range(3):
+            context = contexts[i] if i < len(contexts) else f"상황 {i + 1}"
+            examples.append({
+                "japanese": f"{meaning_data['kanji']}에 관한 {context}의 예문입니다.",
+                "korean": f"{meaning_data['meaning']}에 관한 {context}의 예문입니다.",
+                "explanation": f"이 예문은 '{word}'가 '{meaning_data['meaning']}'라는 의미로 {context}에서 사용된 예입니다."
+            })
+
+        return examples
+
+    @staticmethod
+    def _finalize_examples(
+            word: str,
+            meaning_data: Dict,
+            examples: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """
+        Clean parsed examples and pad or trim them to exactly 3.
+
+        Args:
+            word: The pronunciation/reading of the homonym
+            meaning_data: Dictionary with kanji, meaning, and context info
+            examples: Examples returned by _parse_examples
+
+        Returns:
+            List of exactly 3 example dictionaries
+        """
+        # Clean examples - remove contains_kanji field
+        cleaned_examples = []
+        for example in examples:
+            cleaned_example = {
+                "japanese": example["japanese"],
+                "korean": example["korean"],
+                "explanation": example["explanation"]
+            }
+            cleaned_examples.append(cleaned_example)
+
+        # 예시가 3개보다 적으면 기본 예시로 채우기
+        while len(cleaned_examples) < 3:
+            app.logger.warning(
+                f"Less than 3 examples generated for {word} ({meaning_data['kanji']}). Adding enhanced placeholder example.")
+
+            contexts = meaning_data.get("contexts", ["일반적인 사용"])
+            context_example = contexts[len(cleaned_examples) % len(contexts)] if contexts else "일반적인 사용"
+
+            cleaned_examples.append({
+                "japanese": f"{meaning_data['kanji']}를 사용한 예문입니다.",
+                "korean": f"{meaning_data['meaning']}의 예문입니다.",
+                "explanation": f"이 예문은 '{word}'가 '{meaning_data['meaning']}'라는 의미로 사용된 {context_example} 상황의 예입니다."
+            })
+
+        # 예시가 3개보다 많으면 3개로 제한
+        if len(cleaned_examples) > 3:
+            cleaned_examples = cleaned_examples[:3]
+
+        return cleaned_examples
+
+    @staticmethod
+    async def _generate_meaning_result_async(
+            word: str,
+            meaning_data: Dict,
+            level_text: str,
+            instruction_detail: str,
+            num_examples_per_meaning: int,
+            use_cache: bool = True
+    ) -> tuple:
+        """
+        Run the prompt -> LLM -> parse pipeline for a single homonym meaning.
+
+        Args:
+            word: The pronunciation/reading of the homonym
+            meaning_data: Dictionary with kanji, pos, meaning, and contexts
+            level_text: JLPT level description
+            instruction_detail: Level-specific grammar instructions
+            num_examples_per_meaning: Number of examples to generate
+            use_cache: Set to False to bypass the LLM response cache
+
+        Returns:
+            Tuple of (meaning dictionary with examples, whether at least one
+            real example was parsed from the answer; False if every example
+            is a placeholder)
+        """
+        meaning_result = HomonymExampleGenerator._build_meaning_header(meaning_data)
+
+        # Build prompt for this specific meaning
+        prompt = HomonymExampleGenerator._build_homonym_example_prompt(
+            word,
+            meaning_data,
+            level_text,
+            instruction_detail,
+            num_examples_per_meaning
+        )
+
+        json_output = Config.OUTPUT_FORMAT == "json"
+        if json_output:
+            prompt = with_json_output(prompt, HOMONYM_EXAMPLES_SCHEMA)
+
+        # Call LLM to generate examples
+        response = await LLMService.call_llm_async(prompt, use_cache=use_cache, json_output=json_output)
+
+        if not response:
+            meaning_result["examples"] = HomonymExampleGenerator._build_placeholder_examples(word, meaning_data)
+            return meaning_result, False
+
+        # Parse examples from response (JSON 디코딩 실패 시 텍스트 파싱)
+        examples = None
+        if json_output:
+            examples = HomonymExampleGenerator._parse_examples_json(response, word, meaning_data["kanji"])
+        if examples is None:
+            examples = HomonymExampleGenerator._parse_examples(response, word, meaning_data["kanji"])
+        meaning_result["examples"] = HomonymExampleGenerator._finalize_examples(word, meaning_data, examples)
+
+        # 파싱된 예문이 없으면 기본 예시뿐이므로 미완성으로 처리 (결과 캐시에 저장하지 않음)
+        return meaning_result, bool(examples)
 
     def handle_no_homonyms_case(word: str) -> Dict[str, Any]:
         """
@@ -1128,6 +1850,166 @@ class HomonymExampleGenerator:
         - The Japanese sentences must contain the actual kanji {meaning_data["kanji"]}, not just hiragana
         """.strip()
 
+    @staticmethod
+    def _build_combined_homonym_prompt(
+            word: str,
+            meanings: List[Dict],
+            level_text: str,
+            instruction_detail: str,
+            num_examples: int = 3
+    ) -> str:
+        """
+        Build one prompt that asks for examples of every kanji variant of a reading.
+
+        The answer is split per kanji by "Kanji:" headings, and each section uses
+        the same Context/Japanese/Korean/Explanation layout as the per-meaning prompt
+        so it can be parsed with _parse_examples.
+
+        Args:
+            word: The pronunciation/reading of the homonym
+            meanings: All meanings (kanji variants) of the reading
+            level_text: JLPT level description
+            instruction_detail: Level-specific grammar instructions
+            num_examples: Number of examples to generate per kanji (always 3)
+
+        Returns:
+            Formatted prompt string for the AI model
+        """
+        homonym_lines = []
+        for meaning_data in meanings:
+            contexts = meaning_data.get("contexts", [])
+            context_info = f" / Example contexts: {', '.join(contexts)}" if contexts else ""
+            homonym_lines.append(
+                f"- {meaning_data['kanji']} ({meaning_data['pos']}): {meaning_data['meaning']}{context_info}"
+            )
+        homonym_list = "\n        ".join(homonym_lines)
+        kanji_list = ", ".join(meaning_data["kanji"] for meaning_data in meanings)
+
+        return f"""
+        # Japanese Homonym Example Generator
+
+        ## Role
+        You are an experienced Japanese language teacher creating clear example sentences for Japanese homonyms that distinguish different meanings based on context and kanji usage.
+
+        ## Target Homonyms
+        - Pronunciation: "{word}"
+        - Kanji variants (generate examples for EVERY one of them):
+        {homonym_list}
+
+        ## Critical Requirements
+        - For EACH kanji variant, generate EXACTLY 3 example sentences. No more, no fewer.
+        - Each example must clearly show its kanji being used with the listed meaning
+        - Use {level_text} Japanese appropriate for the learner's level
+        - {instruction_detail}
+        - EVERY sentence must be COMPLETE and NATURAL. Never leave sentences unfinished.
+        - Examples should CLEARLY distinguish each kanji form from the other kanji forms listed above
+        - ALWAYS include the target kanji in its examples - do not use hiragana only
+
+        ## Output Format
+        Start each kanji section with a "Kanji:" line, then its examples. Strictly follow this exact format with no deviation:
+
+        Kanji: [kanji form exactly as listed above]
+        1. Context: [Brief context in English - 1-2 sentences maximum]
+        Japanese: [Complete natural Japanese sentence using this kanji with the specified meaning]
+        Korean: [Complete natural Korean translation]
+        Explanation: [Short explanation in Korean of how this example shows the specific meaning of this kanji and how it differs from the other homonyms]
+
+        2. Context: ...
+        Japanese: ...
+        Korean: ...
+        Explanation: ...
+
+        3. Context: ...
+        Japanese: ...
+        Korean: ...
+        Explanation: ...
+
+        ## Important Notes
+        - Provide one "Kanji:" section for each of: {kanji_list}
+        - You MUST provide EXACTLY 3 examples in every section.
+        - DO NOT include any unnecessary explanations between examples or sections
+        """.strip()
+
+    @staticmethod
+    def _parse_combined_examples(
+            response_text: str,
+            word: str,
+            meanings: List[Dict]
+    ) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Split a combined response into per-kanji example lists.
+
+        Args:
+            response_text: Text response from the combined prompt
+            word: The pronunciation/reading of the homonym
+            meanings: Meanings requested in the combined prompt
+
+        Returns:
+            Dictionary mapping kanji to its parsed examples. Kanji without a
+            section (or without any parsable example) are left out.
+        """
+        requested_kanji = {meaning_data["kanji"] for meaning_data in meanings}
+        headings = list(re.finditer(r'^[\s#*]*Kanji:\s*(.+?)[\s*]*$', response_text, re.MULTILINE))
+
+        examples_by_kanji = {}
+        for index, heading in enumerate(headings):
+            # 제목 줄에 설명이 붙어도 요청한 한자와 매칭되도록 첫 토큰 사용
+            heading_kanji = heading.group(1).strip().split()[0].strip("[]()（）「」")
+            if heading_kanji not in requested_kanji or heading_kanji in examples_by_kanji:
+                continue
+
+            section_end = headings[index + 1].start() if index + 1 < len(headings) else len(response_text)
+            section = response_text[heading.end():section_end]
+
+            examples = HomonymExampleGenerator._parse_examples(section, word, heading_kanji)
+            if examples:
+                examples_by_kanji[heading_kanji] = examples
+
+        app.logger.debug(f"Combined response covered {len(examples_by_kanji)}/{len(requested_kanji)} kanji")
+        return examples_by_kanji
+
+    @staticmethod
+    def _parse_combined_examples_json(
+            response_text: str,
+            word: str,
+            meanings: List[Dict]
+    ) -> Optional[Dict[str, List[Dict[str, str]]]]:
+        """
+        Read per-kanji example lists from a combined JSON answer.
+
+        Args:
+            response_text: JSON response from the combined prompt
+            word: The pronunciation/reading of the homonym
+            meanings: Meanings requested in the combined prompt
+
+        Returns:
+            Same result as _parse_combined_examples, or None if the answer is
+            not valid JSON of the expected shape
+        """
+        data = loads_json(response_text)
+        sections = data.get("sections") if isinstance(data, dict) else None
+        if not isinstance(sections, list):
+            app.logger.debug("Combined structured output was not valid JSON, falling back to text parsing")
+            return None
+
+        requested_kanji = {meaning_data["kanji"] for meaning_data in meanings}
+
+        examples_by_kanji = {}
+        for section in sections:
+            if not isinstance(section, dict) or not isinstance(section.get("kanji"), str):
+                continue
+            kanji = section["kanji"].strip()
+            if kanji not in requested_kanji or kanji in examples_by_kanji:
+                continue
+
+            parsed = extract_examples(section, ("context", "japanese", "korean", "explanation"))
+            examples = HomonymExampleGenerator._examples_from_fields(parsed or [], word, kanji)
+            if examples:
+                examples_by_kanji[kanji] = examples
+
+        app.logger.debug(f"Combined response covered {len(examples_by_kanji)}/{len(requested_kanji)} kanji")
+        return examples_by_kanji
+
     @staticmethod
     def _get_other_homonyms_info(pronunciation: str, target_kanji: str) -> str:
         """
@@ -1143,27 +2025,8 @@ class HomonymExampleGenerator:
         Returns:
             Formatted string listing other homonyms for comparison
         """
-        other_info = []
-
-        # 모든 레벨에서 같은 발음 검색
-        for level_name, level_data in Config.HOMONYM_DATABASE.items():
-            for reading, homonyms in level_data.items():
-                # 같은 읽기이고 target_kanji가 포함된 경우
-                kanji_list = [h["kanji"] for h in homonyms]
-                if target_kanji in kanji_list:
-                    # 다른 동음이의어들 정보 수집
-                    for homonym in homonyms:
-                        if homonym["kanji"] != target_kanji:
-                            other_info.append(f"- {homonym['kanji']}: {homonym['meaning']} ({homonym['pos']})")
-                    break
-
-            if other_info:  # 찾았으면 중단
-                break
-
-        if other_info:
-            return "Other homonyms with the same pronunciation:\n" + "\n".join(other_info)
-        else:
-            return "No other known homonyms found in database."
+        # 시작 시 미리 계산된 블록 사용
+        return homonym_index.other_homonyms_info(target_kanji)
 
     @staticmethod
     def _parse_examples(
@@ -1180,50 +2043,111 @@ class HomonymExampleGenerator:
         app.logger.debug("Response from LLM (first 500 chars): " +
                          (response_text[:500] + "..." if len(response_text) > 500 else response_text))
 
-        # Pattern to match examples
-        pattern = r'(?:\d+\.\s*)?Context:\s*(.*?)\s*Japanese:\s*(.*?)\s*Korean:\s*(.*?)\s*Explanation:\s*(.*?)(?=\s*(?:\d+\.\s*)?Context:|\s*$)'
-        matches = re.findall(pattern, response_text, re.DOTALL)
+        # Context/Japanese/Korean/Explanation 블록 추출 (단일 패스)
+        matches = HOMONYM_EXAMPLE_PARSER.parse(response_text)
 
         if matches:
-            app.logger.debug(f"Found {len(matches)} examples with the main pattern")
+            app.logger.debug(f"Found {len(matches)} examples with the main format")
             for match in matches:
-                context, japanese, korean, explanation = match
+                example = HomonymExampleGenerator._clean_example(
+                    match["japanese"], match["korean"], match["explanation"], kanji
+                )
+                if example:
+                    examples.append(example)
 
-                # 불완전한 문장 확인
-                if japanese.strip().endswith('...') or japanese.strip().endswith('…'):
-                    app.logger.debug(f"Skipping incomplete sentence: {japanese}")
-                    continue
+        return HomonymExampleGenerator._apply_kanji_fallback(examples, word, kanji)
 
-                if len(japanese.strip()) < 10:
-                    app.logger.debug(f"Skipping too short sentence: {japanese}")
-                    continue
+    @staticmethod
+    def _parse_examples_json(
+            response_text: str,
+            word: str,
+            kanji: str
+    ) -> Optional[List[Dict[str, str]]]:
+        """
+        Parse a JSON answer (Config.OUTPUT_FORMAT == "json") for one meaning.
 
-                # Clean text
-                japanese = japanese.strip()
-                korean = korean.strip()
-
-                # 설명에서 영어 제거: 줄바꿈 또는 영어 문구 시작 부분까지만 유지
-                explanation = explanation.strip()
-                # 줄바꿈으로 분리
-                if '\n' in explanation:
-                    explanation = explanation.split('\n')[0].strip()
-                # 또는 다음 Context 시작 부분으로 분리
-                if 'Context:' in explanation:
-                    explanation = explanation.split('Context:')[0].strip()
-
-                # 한자 포함 여부 체크 (로깅용)
-                contains_kanji = kanji in japanese
-                if not contains_kanji:
-                    app.logger.warning(f"Example does not contain expected kanji '{kanji}': {japanese}")
-
-                # contains_kanji 필드 제거된 형태로 저장
-                examples.append({
-                    "japanese": japanese,
-                    "korean": korean,
-                    "explanation": explanation
-                    # contains_kanji 필드 제거
-                })
+        Returns:
+            Same result as _parse_examples, or None if the answer is not valid
+            JSON of the expected shape
+        """
+        parsed = extract_examples(loads_json(response_text), ("context", "japanese", "korean", "explanation"))
+        if parsed is None:
+            app.logger.debug("Structured output was not valid JSON, falling back to text parsing")
+            return None
+
+        return HomonymExampleGenerator._examples_from_fields(parsed, word, kanji)
 
+    @staticmethod
+    def _examples_from_fields(
+            parsed: List[Dict[str, str]],
+            word: str,
+            kanji: str
+    ) -> List[Dict[str, str]]:
+        """Clean examples decoded from JSON the same way as the text patterns."""
+        examples = []
+        for item in parsed:
+            example = HomonymExampleGenerator._clean_example(
+                item["japanese"], item["korean"], item["explanation"], kanji
+            )
+            if example:
+                examples.append(example)
+
+        return HomonymExampleGenerator._apply_kanji_fallback(examples, word, kanji)
+
+    @staticmethod
+    def _clean_example(
+            japanese: str,
+            korean: str,
+            explanation: str,
+            kanji: str
+    ) -> Optional[Dict[str, str]]:
+        """
+        Clean one parsed example, or return None if its sentence is incomplete.
+        """
+        # 불완전한 문장 확인
+        if japanese.strip().endswith('...') or japanese.strip().endswith('…'):
+            app.logger.debug(f"Skipping incomplete sentence: {japanese}")
+            return None
+
+        if len(japanese.strip()) < 10:
+            app.logger.debug(f"Skipping too short sentence: {japanese}")
+            return None
+
+        # Clean text
+        japanese = japanese.strip()
+        korean = korean.strip()
+
+        # 설명에서 영어 제거: 줄바꿈 또는 영어 문구 시작 부분까지만 유지
+        explanation = explanation.strip()
+        # 줄바꿈으로 분리
+        if '\n' in explanation:
+            explanation = explanation.split('\n')[0].strip()
+        # 또는 다음 Context 시작 부분으로 분리
+        if 'Context:' in explanation:
+            explanation = explanation.split('Context:')[0].strip()
+
+        # 한자 포함 여부 체크 (로깅용)
+        contains_kanji = kanji in japanese
+        if not contains_kanji:
+            app.logger.warning(f"Example does not contain expected kanji '{kanji}': {japanese}")
+
+        # contains_kanji 필드 제거된 형태로 저장
+        return {
+            "japanese": japanese,
+            "korean": korean,
+            "explanation": explanation
+            # contains_kanji 필드 제거
+        }
+
+    @staticmethod
+    def _apply_kanji_fallback(
+            examples: List[Dict[str, str]],
+            word: str,
+            kanji: str
+    ) -> List[Dict[str, str]]:
+        """
+        Make sure at least one example uses the target kanji.
+        """
         # 한자가 포함된 예문이 없는 경우 처리 (내부 로직용)
         kanji_examples_count = sum(1 for ex in examples if kanji in ex["japanese"])
 
@@ -1428,26 +2352,10 @@ def generate_word_examples(word: str, level: str = Config.DEFAULT_DIFFICULTY) ->
             "explanation": "API 응답을 받지 못했습니다."
         }]
 
-    # Pattern to match examples
-    pattern = r'(?:\d+\.\s*)?Japanese:\s*(.*?)\s*Korean:\s*(.*?)\s*Explanation:\s*(.*?)(?=\s*(?:\d+\.\s*)?Japanese:|\s*$)'
-    matches = re.findall(pattern, response, re.DOTALL)
-
-    examples = []
-    if matches:
-        app.logger.debug(f"Found {len(matches)} examples with the main pattern")
-        for match in matches:
-            japanese, korean, explanation = match
-
-            # Clean text
-            japanese = japanese.strip()
-            korean = korean.strip()
-            explanation = explanation.strip()
-
-            examples.append({
-                "japanese": japanese,
-                "korean": korean,
-                "explanation": explanation
-            })
+    # Japanese/Korean/Explanation 블록 추출 (값은 파서에서 정리됨)
+    examples = WORD_EXAMPLE_PARSER.parse(response)
+    if examples:
+        app.logger.debug(f"Found {len(examples)} examples with the main format")
 
     # If no examples were found, create a default error example
     if not examples:
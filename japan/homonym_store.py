@@ -0,0 +1,668 @@
+import os
+import sys
+import json
+import sqlite3
+import logging
+import time
+import argparse
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from homonym_index import (
+    HomonymIndex, NormalizedLookupMixin, LEVEL_ORDER, NO_OTHER_HOMONYMS, normalize_lookup_key, kanji_stem,
+    is_inflection_of
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = "2"
+
+# 읽기 전용 연결의 메모리 매핑 크기 (워커 프로세스 간 OS 페이지 캐시 공유)
+MMAP_SIZE = int(os.getenv("HOMONYM_DB_MMAP_SIZE", 256 * 1024 * 1024))
+
+
+def build_homonym_db(database: Dict[str, Dict[str, List[Dict]]], path: str) -> Dict[str, int]:
+    """
+    Write a level -> reading -> homonym list database to a SQLite file.
+
+    The file holds one row per homonym plus the precomputed "other homonyms"
+    prompt blocks, so workers can open it read-only without rebuilding anything.
+
+    Args:
+        database: Homonym database in the Config.HOMONYM_DATABASE layout
+        path: Output SQLite file (replaced if it exists)
+
+    Returns:
+        Dictionary with the number of readings and homonym rows written
+    """
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript("""
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE homonyms (
+                level TEXT NOT NULL,
+                reading TEXT NOT NULL,
+                reading_rank INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                kanji TEXT NOT NULL,
+                pos TEXT NOT NULL,
+                meaning TEXT NOT NULL,
+                contexts TEXT NOT NULL
+            );
+            CREATE TABLE other_homonyms (kanji TEXT PRIMARY KEY, block TEXT NOT NULL);
+            CREATE TABLE aliases (
+                kind TEXT NOT NULL,
+                alias TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                target TEXT NOT NULL
+            );
+        """)
+
+        readings = 0
+        rows = []
+        for level_name, level_data in database.items():
+            for reading_rank, (reading, homonym_list) in enumerate(level_data.items()):
+                readings += 1
+                for position, homonym in enumerate(homonym_list):
+                    rows.append((
+                        level_name,
+                        reading,
+                        reading_rank,
+                        position,
+                        homonym["kanji"],
+                        homonym.get("pos", ""),
+                        homonym.get("meaning", ""),
+                        json.dumps(homonym.get("contexts", []), ensure_ascii=False)
+                    ))
+
+        conn.executemany("INSERT INTO homonyms VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+        # 프롬프트용 "다른 동음이의어" 블록은 메모리 인덱스와 같은 규칙으로 미리 계산
+        index = HomonymIndex(database)
+        conn.executemany(
+            "INSERT INTO other_homonyms VALUES (?, ?)",
+            list(index.other_homonyms.items())
+        )
+
+        # 정규화 키(NFKC, 가타카나→히라가나)와 오쿠리가나를 뗀 한자 어간 색인
+        for kind, aliases in (("norm", index.aliases), ("stem", index.stems)):
+            conn.executemany(
+                "INSERT INTO aliases VALUES (?, ?, ?, ?)",
+                [
+                    (kind, alias, rank, target)
+                    for alias, targets in aliases.items()
+                    for rank, target in enumerate(targets)
+                ]
+            )
+
+        conn.executescript("""
+            CREATE INDEX idx_homonyms_reading ON homonyms (reading, level, position);
+            CREATE INDEX idx_homonyms_kanji ON homonyms (kanji, level, reading_rank);
+            CREATE INDEX idx_aliases ON aliases (kind, alias, rank);
+        """)
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [("schema_version", SCHEMA_VERSION), ("readings", str(readings)), ("homonyms", str(len(rows)))]
+        )
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+    return {"readings": readings, "homonyms": len(rows)}
+
+
+class SQLiteHomonymDictionary(NormalizedLookupMixin):
+    """
+    Read-only homonym dictionary backed by a SQLite file built with build_homonym_db.
+
+    Nothing is loaded up front: each lookup is an indexed query on a
+    memory-mapped, immutable connection, so every worker process shares the
+    same OS page cache instead of holding its own copy of the dictionary.
+    Exposes the same find/other_homonyms_info interface as HomonymIndex.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+        # 파일과 스키마를 시작 시 한 번 확인
+        version = self._connect().execute(
+            "SELECT value FROM meta WHERE key = 'schema_version'"
+        ).fetchone()
+        if not version or version[0] != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported homonym database schema in {path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+
+        uri = f"file:{os.path.abspath(self.path)}?mode=ro&immutable=1"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _to_homonym(row: Tuple) -> Dict:
+        kanji, pos, meaning, contexts = row
+        return {"kanji": kanji, "pos": pos, "meaning": meaning, "contexts": json.loads(contexts)}
+
+    def _entries(self, level: str, reading: str) -> List[Dict]:
+        rows = self._connect().execute(
+            "SELECT kanji, pos, meaning, contexts FROM homonyms "
+            "WHERE reading = ? AND level = ? ORDER BY position",
+            (reading, level)
+        ).fetchall()
+        return [self._to_homonym(row) for row in rows]
+
+    def resolve(self, word: str) -> List[str]:
+        """
+        Map a raw word to database keys sharing its normalized form, or
+        kanji forms the word is a conjugated form of.
+
+        Args:
+            word: Reading or kanji form as entered by the user
+
+        Returns:
+            Candidate database keys, normalized matches first
+        """
+        conn = self._connect()
+        key = normalize_lookup_key(word)
+        candidates = [
+            row[0] for row in conn.execute(
+                "SELECT target FROM aliases WHERE kind = 'norm' AND alias = ? ORDER BY rank", (key,))
+        ]
+
+        stem = kanji_stem(key)
+        if stem:
+            for row in conn.execute(
+                    "SELECT target FROM aliases WHERE kind = 'stem' AND alias = ? ORDER BY rank", (stem,)):
+                if row[0] not in candidates and is_inflection_of(key, normalize_lookup_key(row[0])):
+                    candidates.append(row[0])
+
+        return candidates
+
+    def find_exact(self, word: str, level: str) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Find homonyms by reading or kanji form (same rules as HomonymIndex.find_exact).
+
+        Args:
+            word: Reading or kanji form
+            level: Starting JLPT level for search
+
+        Returns:
+            Tuple of (homonym list or empty list, level where it was found)
+        """
+        search_levels = HomonymIndex.search_levels(level)
+        conn = self._connect()
+
+        reading_levels = {
+            row[0] for row in conn.execute("SELECT DISTINCT level FROM homonyms WHERE reading = ?", (word,))
+        }
+        kanji_levels = {}
+        for level_name, reading in conn.execute(
+                "SELECT level, reading FROM homonyms WHERE kanji = ? ORDER BY level, reading_rank", (word,)):
+            kanji_levels.setdefault(level_name, []).append(reading)
+
+        for search_level in reversed(search_levels):
+            if search_level in reading_levels:
+                return self._entries(search_level, word), search_level
+
+            for reading in kanji_levels.get(search_level, []):
+                result = [h for h in self._entries(search_level, reading) if h["kanji"] != word]
+                if result:
+                    return result, search_level
+
+        return [], None
+
+    def other_homonyms_info(self, target_kanji: str) -> str:
+        """
+        Get the precomputed "other homonyms" block for a kanji.
+
+        Args:
+            target_kanji: The kanji to describe the other homonyms of
+
+        Returns:
+            Formatted string listing other homonyms for comparison
+        """
+        row = self._connect().execute(
+            "SELECT block FROM other_homonyms WHERE kanji = ?", (target_kanji,)
+        ).fetchone()
+        return row[0] if row else NO_OTHER_HOMONYMS
+
+
+class ChainedHomonymDictionary:
+    """
+    Query several homonym dictionaries in order and return the first hit.
+
+    A source that raises is logged and skipped. When a ``fallback`` factory
+    is given, the first such failure builds the fallback dictionary (the
+    built-in index), which then answers in place of every failing source,
+    so a broken external file degrades to the built-in dictionary instead
+    of failing the request.
+    """
+
+    def __init__(self, sources: List, fallback: Optional[Callable[[], Any]] = None):
+        self.sources = sources
+        self._fallback_factory = fallback
+        self._fallback = None
+        self._lock = threading.Lock()
+
+    def _get_fallback(self):
+        """The fallback dictionary, built on first use (None without a factory)."""
+        if self._fallback_factory is None:
+            return None
+        with self._lock:
+            if self._fallback is None:
+                logger.warning("Building the built-in homonym index as fallback")
+                self._fallback = self._fallback_factory()
+            return self._fallback
+
+    def _lookup(self, method: str, *args):
+        """Yield the result of ``method`` of each source, using the fallback for failing ones."""
+        for source in self.sources:
+            try:
+                yield getattr(source, method)(*args)
+                continue
+            except Exception as e:
+                logger.warning(f"Homonym lookup failed in {type(source).__name__}: {e}")
+
+            fallback = self._get_fallback()
+            if fallback is not None:
+                yield getattr(fallback, method)(*args)
+
+    def find(self, word: str, level: str) -> Tuple[List[Dict], Optional[str]]:
+        for homonyms, found_level in self._lookup("find", word, level):
+            if homonyms:
+                return homonyms, found_level
+        return [], None
+
+    def other_homonyms_info(self, target_kanji: str) -> str:
+        for info in self._lookup("other_homonyms_info", target_kanji):
+            if info != NO_OTHER_HOMONYMS:
+                return info
+        return NO_OTHER_HOMONYMS
+
+
+class LearnedHomonymStore:
+    """
+    Writable store of homonym sets the LLM found for words missing from the dictionary.
+
+    One row per homonym, keyed by the normalized word that was searched, with
+    provenance (source, model, requested level) and timestamps. Chained behind
+    the built-in dictionary, so a word is searched with the LLM once and then
+    served like a dictionary entry. The file is shared by all worker processes
+    (WAL mode) and can be exported for review with
+    ``python homonym_store.py export-learned``.
+
+    Learned entries are not tied to a JLPT level: they are returned for every
+    requested level, as the LLM answer was.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the table on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS learned_homonyms (
+                word_key TEXT NOT NULL,
+                word TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                kanji TEXT NOT NULL,
+                kanji_key TEXT NOT NULL,
+                pos TEXT NOT NULL,
+                meaning TEXT NOT NULL,
+                contexts TEXT NOT NULL,
+                level TEXT NOT NULL,
+                source TEXT NOT NULL,
+                model TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (word_key, position)
+            );
+            CREATE INDEX IF NOT EXISTS idx_learned_kanji ON learned_homonyms (kanji_key, word_key);
+        """)
+
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def validate(word: str, homonyms: List[Dict]) -> List[Dict]:
+        """
+        Keep the homonym entries that are complete enough to be served again.
+
+        Args:
+            word: Searched word
+            homonyms: Entries from the LLM (kanji, pos, meaning, contexts)
+
+        Returns:
+            Cleaned entries (kanji and meaning required, not the word itself, no duplicates)
+        """
+        word_key = normalize_lookup_key(word)
+        seen = set()
+        valid = []
+        for homonym in homonyms:
+            kanji = str(homonym.get("kanji") or "").strip()
+            meaning = str(homonym.get("meaning") or "").strip()
+            if not kanji or not meaning or normalize_lookup_key(kanji) == word_key or kanji in seen:
+                continue
+            seen.add(kanji)
+
+            contexts = homonym.get("contexts") or []
+            valid.append({
+                "kanji": kanji,
+                "pos": str(homonym.get("pos") or "").strip(),
+                "meaning": meaning,
+                "contexts": [str(context) for context in contexts] if isinstance(contexts, list) else []
+            })
+        return valid
+
+    def record(
+            self,
+            word: str,
+            level: str,
+            homonyms: List[Dict],
+            source: str = "llm",
+            model: Optional[str] = None
+    ) -> int:
+        """
+        Store (or replace) the homonym set found for a word.
+
+        Errors are logged and swallowed: learning must never fail the request.
+
+        Args:
+            word: Searched word
+            level: JLPT level of the request that found the set
+            homonyms: Homonym entries (kanji, pos, meaning, contexts)
+            source: Where the set comes from
+            model: Model name, for provenance
+
+        Returns:
+            Number of entries stored
+        """
+        homonyms = self.validate(word, homonyms)
+        if not homonyms:
+            return 0
+
+        word_key = normalize_lookup_key(word)
+        try:
+            conn = self._connect()
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT MIN(created_at) FROM learned_homonyms WHERE word_key = ?", (word_key,)
+                ).fetchone()
+                created_at = row[0] if row and row[0] is not None else now
+
+                conn.execute("DELETE FROM learned_homonyms WHERE word_key = ?", (word_key,))
+                conn.executemany(
+                    "INSERT INTO learned_homonyms VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            word_key, word, position, homonym["kanji"], normalize_lookup_key(homonym["kanji"]),
+                            homonym["pos"], homonym["meaning"], json.dumps(homonym["contexts"], ensure_ascii=False),
+                            level, source, model, created_at, now
+                        )
+                        for position, homonym in enumerate(homonyms)
+                    ]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except Exception as e:
+            logger.warning(f"Failed to store learned homonyms for '{word}': {e}")
+            return 0
+
+        return len(homonyms)
+
+    def _entries(self, word_key: str) -> Tuple[List[Dict], Optional[str]]:
+        rows = self._connect().execute(
+            "SELECT kanji, pos, meaning, contexts, level FROM learned_homonyms "
+            "WHERE word_key = ? ORDER BY position",
+            (word_key,)
+        ).fetchall()
+        homonyms = [SQLiteHomonymDictionary._to_homonym(row[:4]) for row in rows]
+        return homonyms, (rows[0][4] if rows else None)
+
+    def find(self, word: str, level: str) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Find a learned homonym set by searched word or by one of its kanji forms.
+
+        Args:
+            word: Reading or kanji form as entered by the user
+            level: Requested JLPT level (not used for filtering)
+
+        Returns:
+            Tuple of (homonym list or empty list, level of the request that learned it)
+        """
+        key = normalize_lookup_key(word)
+        homonyms, learned_level = self._entries(key)
+        if homonyms:
+            return homonyms, learned_level
+
+        # 학습된 동음이의어의 한자 형태로 입력한 경우: 같은 집합의 다른 한자
+        for (word_key,) in self._connect().execute(
+                "SELECT DISTINCT word_key FROM learned_homonyms WHERE kanji_key = ? ORDER BY word_key", (key,)):
+            homonyms, learned_level = self._entries(word_key)
+            result = [h for h in homonyms if normalize_lookup_key(h["kanji"]) != key]
+            if result:
+                return result, learned_level
+
+        return [], None
+
+    def other_homonyms_info(self, target_kanji: str) -> str:
+        """
+        Describe the other homonyms learned together with a kanji.
+
+        Args:
+            target_kanji: The kanji to describe the other homonyms of
+
+        Returns:
+            Formatted string listing other homonyms for comparison
+        """
+        row = self._connect().execute(
+            "SELECT word_key FROM learned_homonyms WHERE kanji_key = ? ORDER BY word_key LIMIT 1",
+            (normalize_lookup_key(target_kanji),)
+        ).fetchone()
+        if not row:
+            return NO_OTHER_HOMONYMS
+
+        homonyms, _ = self._entries(row[0])
+        other_info = [
+            f"- {other['kanji']}: {other['meaning']} ({other['pos']})"
+            for other in homonyms
+            if other["kanji"] != target_kanji
+        ]
+        if not other_info:
+            return NO_OTHER_HOMONYMS
+        return "Other homonyms with the same pronunciation:\n" + "\n".join(other_info)
+
+    def export_records(self) -> List[Dict]:
+        """
+        Every learned entry with its provenance, for review.
+
+        Returns:
+            List of dictionaries ordered by word and position
+        """
+        rows = self._connect().execute(
+            "SELECT word, kanji, pos, meaning, contexts, level, source, model, created_at, updated_at "
+            "FROM learned_homonyms ORDER BY word_key, position"
+        ).fetchall()
+        return [
+            {
+                "word": word,
+                "kanji": kanji,
+                "pos": pos,
+                "meaning": meaning,
+                "contexts": json.loads(contexts),
+                "level": level,
+                "source": source,
+                "model": model,
+                "created_at": created_at,
+                "updated_at": updated_at
+            }
+            for word, kanji, pos, meaning, contexts, level, source, model, created_at, updated_at in rows
+        ]
+
+    def export_database(self) -> Dict[str, Dict[str, List[Dict]]]:
+        """
+        The learned entries in the Config.HOMONYM_DATABASE layout (level -> word -> homonym list).
+
+        After review the result can be merged into the built-in database or
+        passed to ``python homonym_store.py build --source``.
+        """
+        database: Dict[str, Dict[str, List[Dict]]] = {}
+        for record in self.export_records():
+            level = record["level"] if record["level"] in LEVEL_ORDER else "n3"
+            database.setdefault(level, {}).setdefault(record["word"], []).append({
+                "kanji": record["kanji"],
+                "pos": record["pos"],
+                "meaning": record["meaning"],
+                "contexts": record["contexts"]
+            })
+        return database
+
+    def stats(self) -> Dict[str, int]:
+        """Number of learned words and entries."""
+        words, entries = self._connect().execute(
+            "SELECT COUNT(DISTINCT word_key), COUNT(*) FROM learned_homonyms"
+        ).fetchone()
+        return {"words": words, "homonyms": entries}
+
+
+def load_homonym_dictionary(
+        path: Optional[str],
+        builtin_database: Dict[str, Dict[str, List[Dict]]],
+        learned: Optional[LearnedHomonymStore] = None
+):
+    """
+    Load the homonym dictionary used for lookups.
+
+    With an external database only that file is opened: the in-memory index
+    of the built-in dictionary is not built in the worker unless the file
+    cannot be opened or a lookup in it fails.
+
+    Args:
+        path: Path to an external SQLite dictionary, or None/empty to use the built-in one
+        builtin_database: The inline Config.HOMONYM_DATABASE, used as fallback
+        learned: Store of LLM-discovered homonyms, searched after the dictionaries
+
+    Returns:
+        Dictionary object with find and other_homonyms_info methods
+    """
+    sources = []
+    fallback = None
+
+    if path:
+        try:
+            sources.append(SQLiteHomonymDictionary(path))
+            logger.info(f"Using external homonym database: {path}")
+        except Exception as e:
+            logger.error(f"Failed to open homonym database '{path}', using built-in database: {e}")
+
+    if sources:
+        # 외부 파일 조회가 실패할 때만 내장 사전 인덱스 생성
+        def fallback():
+            return HomonymIndex(builtin_database)
+    else:
+        sources.append(HomonymIndex(builtin_database))
+
+    if learned is not None:
+        sources.append(learned)
+
+    if len(sources) == 1 and fallback is None:
+        return sources[0]
+    return ChainedHomonymDictionary(sources, fallback)
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command-line interface for building the external homonym database.
+
+    Usage:
+        python homonym_store.py build homonyms.sqlite3 [--source homonyms.json]
+        python homonym_store.py export-learned learned.json [--store learned.sqlite3] [--records]
+
+    Without --source the built-in Config.HOMONYM_DATABASE is exported.
+    The JSON source uses the same level -> reading -> homonym list layout.
+
+    export-learned writes the LLM-discovered homonyms in that layout (ready
+    for review and ``build --source``), or with --records one entry per
+    homonym with its provenance and timestamps.
+    """
+    parser = argparse.ArgumentParser(description="Homonym dictionary tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Build a SQLite homonym dictionary")
+    build_parser.add_argument("output", help="Output SQLite file")
+    build_parser.add_argument("--source", help="JSON file in the HOMONYM_DATABASE layout")
+
+    export_parser = subparsers.add_parser("export-learned", help="Export homonyms learned from the LLM")
+    export_parser.add_argument("output", help="Output JSON file")
+    export_parser.add_argument("--store", help="Learned homonym store (default: LEARNED_HOMONYMS_PATH)")
+    export_parser.add_argument("--records", action="store_true", help="One record per homonym with provenance")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if args.source:
+            with open(args.source, encoding="utf-8") as f:
+                database = json.load(f)
+        else:
+            from homonym_processor import Config
+            database = Config.HOMONYM_DATABASE
+
+        unknown_levels = [level for level in database if level not in LEVEL_ORDER]
+        if unknown_levels:
+            print(f"⚠️ 알 수 없는 레벨은 검색되지 않습니다: {', '.join(unknown_levels)}")
+
+        counts = build_homonym_db(database, args.output)
+        print(f"✅ {args.output}: {counts['readings']} readings, {counts['homonyms']} homonyms")
+
+    elif args.command == "export-learned":
+        store_path = args.store
+        if not store_path:
+            from homonym_processor import Config
+            store_path = Config.LEARNED_HOMONYMS_PATH
+
+        if not os.path.exists(store_path):
+            print(f"❌ 학습된 동음이의어 저장소가 없습니다: {store_path}")
+            sys.exit(1)
+
+        store = LearnedHomonymStore(store_path)
+        data = store.export_records() if args.records else store.export_database()
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+        counts = store.stats()
+        print(f"✅ {args.output}: {counts['words']} words, {counts['homonyms']} homonyms")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
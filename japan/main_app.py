@@ -1,7 +1,9 @@
 import os
 import sys
-from flask import Flask, request, jsonify
-from typing import Dict, List
+import json
+import asyncio
+from flask import Flask, Response, request, jsonify, stream_with_context
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 # 필수 모듈 가져오기 및 검증
 HomonymExampleGenerator = None
@@ -11,7 +13,10 @@ ExampleConfig = None
 
 # 첫 번째 파일에서 HomonymExampleGenerator 가져오기
 try:
-    from homonym_processor import HomonymExampleGenerator, Config as HomonymConfig
+    from homonym_processor import (
+        HomonymExampleGenerator, Config as HomonymConfig, LLMService as HomonymLLMService, homonym_index,
+        learned_homonyms
+    )
 except ImportError as e:
     print(f"❌ homonym_processor.py 파일을 찾을 수 없습니다: {e}")
     print("📝 첫 번째 파일을 homonym_processor.py로 저장하고 Flask 라우트 부분을 제거해주세요")
@@ -20,7 +25,9 @@ except ImportError as e:
 
 # 두 번째 파일에서 JapaneseExampleGenerator 가져오기
 try:
-    from example_generator import JapaneseExampleGenerator, Config as ExampleConfig
+    from example_generator import (
+        JapaneseExampleGenerator, Config as ExampleConfig, LLMService as ExampleLLMService, example_pool
+    )
 except ImportError as e:
     print(f"❌ example_generator.py 파일을 찾을 수 없습니다: {e}")
     print("📝 두 번째 파일을 example_generator.py로 저장하고 Flask 라우트 부분을 제거해주세요")
@@ -39,6 +46,13 @@ if missing_modules:
     print("서비스를 시작할 수 없습니다. 누락된 파일들을 준비한 후 다시 실행해주세요.")
     sys.exit(1)
 
+from gemini_client import gemini_clients
+from async_runtime import background_loop, run_sync
+from single_flight import SingleFlight, request_flights
+from request_budget import request_budget
+from rate_limiter import llm_rate_limiter
+from circuit_breaker import DegradedState, llm_circuit_breaker, track_degraded
+
 app = Flask(__name__)
 
 
@@ -48,6 +62,10 @@ class MainConfig:
     DEFAULT_HOST = '0.0.0.0'
     DEBUG_MODE = False
 
+    # 실행 모드: development (Flask 개발 서버) | production (gunicorn, gunicorn_conf.py)
+    VALID_SERVE_MODES = ["development", "production"]
+    SERVE_MODE = os.getenv("SERVE_MODE", "development").lower()
+
     # 지원되는 JLPT 레벨
     VALID_LEVELS = ["n5", "n4", "n3", "n2", "n1", "standard"]
     DEFAULT_LEVEL = "n3"
@@ -56,6 +74,13 @@ class MainConfig:
     VALID_FORMATS = ["simple", "with_context", "with_hiragana"]
     DEFAULT_FORMAT = "simple"
 
+    # 배치 API: 요청당 최대 항목 수와 동시에 생성하는 항목 수
+    BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", 200))
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 8))
+
+    # Gemini 장애(회로 차단) 중 데이터베이스/캐시/예문 풀만으로 만든 응답에 붙는 안내
+    DEGRADED_NOTICE = "AI 서비스 장애로 저장된 데이터만으로 응답했습니다. 일부 예문이 기본 예시이거나 적을 수 있습니다."
+
 
 def format_examples_by_type(examples: List[Dict], format_type: str) -> List[Dict]:
     """
@@ -113,6 +138,263 @@ def format_examples_by_type(examples: List[Dict], format_type: str) -> List[Dict
         return []
 
 
+def parse_item_params(data: Any) -> Tuple[Optional[Tuple[str, str, str]], Optional[Dict]]:
+    """
+    요청 항목에서 word, level, format을 추출하고 검증
+
+    Args:
+        data: 단일 요청 본문 또는 배치 요청의 한 항목
+
+    Returns:
+        ((word, level, format_type), None) 또는 검증 실패 시 (None, 오류 응답)
+    """
+    if not data or not isinstance(data, dict):
+        return None, {
+            "error": "JSON 데이터가 필요합니다.",
+            "message": "요청 본문에 유효한 JSON 데이터를 포함해주세요."
+        }
+
+    word = data.get('word')
+    if not word or not isinstance(word, str):
+        return None, {
+            "error": "단어가 필요합니다.",
+            "message": "'word' 필드에 일본어 단어를 입력해주세요."
+        }
+
+    # 파라미터 검증 및 기본값 설정
+    level = str(data.get('level', MainConfig.DEFAULT_LEVEL)).lower()
+    if level not in MainConfig.VALID_LEVELS:
+        level = MainConfig.DEFAULT_LEVEL
+
+    format_type = str(data.get('format', MainConfig.DEFAULT_FORMAT)).lower()
+    if format_type not in MainConfig.VALID_FORMATS:
+        format_type = MainConfig.DEFAULT_FORMAT
+
+    return (word, level, format_type), None
+
+
+def add_degraded_notice(payload: Dict, degraded: DegradedState) -> Dict:
+    """Gemini 호출 없이 대체 경로로 만든 응답이면 degraded 표시와 안내 문구 추가"""
+    if degraded.degraded:
+        payload["degraded"] = True
+        payload["notice"] = MainConfig.DEGRADED_NOTICE
+    return payload
+
+
+async def build_homonym_payload_async(word: str, level: str, format_type: str) -> Dict:
+    """
+    동음이의어 분석 결과 생성 (/api/homonym 응답 본문)
+
+    같은 (word, level) 요청이 동시에 여러 개 들어오면 하나의 생성 결과를 공유합니다.
+    생성은 요청 예산(LLM 호출 수, 토큰, 시간) 안에서만 재시도합니다.
+    Gemini 회로가 열려 있어 대체 결과로 응답하면 "degraded": true가 포함됩니다.
+
+    Args:
+        word: 일본어 단어
+        level: JLPT 레벨
+        format_type: 응답 형식 (동음이의어 응답에는 사용되지 않음)
+
+    Returns:
+        동음이의어 응답 딕셔너리
+    """
+    async def generate() -> Dict:
+        with request_budget(), track_degraded() as degraded:
+            result = await HomonymExampleGenerator.generate_homonym_examples_async(word, level)
+        return add_degraded_notice(result, degraded)
+
+    return await request_flights.run(SingleFlight.make_key("homonym", word.strip(), level), generate)
+
+
+async def build_generate_payload_async(word: str, level: str, format_type: str) -> Dict:
+    """
+    일반 예문 생성 결과 생성 (/api/generate 응답 본문)
+
+    같은 (word, level, format) 요청이 동시에 여러 개 들어오면 (예: 수업 중 같은 단어
+    조회) 진행 중인 하나의 생성에 합류하여 결과를 공유합니다. 생성은 요청 예산
+    (LLM 호출 수, 토큰, 시간) 안에서만 재시도하고, 소진되면 그때까지의 예문을 반환합니다.
+    Gemini 회로가 열려 있으면 예문 풀에 있는 예문만으로 응답하고 "degraded": true를 포함합니다.
+
+    Args:
+        word: 일본어 단어
+        level: JLPT 레벨
+        format_type: 응답 형식 (simple, with_context, with_hiragana)
+
+    Returns:
+        {"examples": [...]} 형식의 응답 딕셔너리
+    """
+    async def generate() -> Dict:
+        with request_budget(), track_degraded() as degraded:
+            examples = await JapaneseExampleGenerator.generate_examples_async(
+                word=word,
+                difficulty=level,
+                num_examples=5,  # 기본 5개 예문 생성
+                max_retries=2
+            )
+
+        # 응답 형식에 따라 데이터 구성
+        return add_degraded_notice({"examples": format_examples_by_type(examples, format_type)}, degraded)
+
+    return await request_flights.run(SingleFlight.make_key("generate", word.strip(), level, format_type), generate)
+
+
+async def run_batch_async(
+        items: List[Any],
+        build_payload: Callable[[str, str, str], Awaitable[Dict]],
+        uses_format: bool = True
+) -> Dict[str, Any]:
+    """
+    배치 항목들을 중복 제거 후 동시에 처리
+
+    같은 (word, level, format) 항목은 한 번만 생성하고, 동시 생성 수는
+    MainConfig.BATCH_CONCURRENCY로 제한합니다. 결과는 입력 순서대로 반환하며
+    실패한 항목은 해당 항목에만 오류를 기록합니다.
+
+    Args:
+        items: 요청 항목 리스트 ({word, level, format})
+        build_payload: 항목 하나의 응답 본문을 만드는 코루틴 함수
+        uses_format: False면 format이 다른 항목도 같은 결과를 공유 (동음이의어)
+
+    Returns:
+        {"results": [...], "summary": {...}} 형식의 응답 딕셔너리
+    """
+    results = [None] * len(items)
+    pending = {}  # 중복 제거 키 -> (파라미터, 입력 인덱스 리스트)
+
+    for index, item in enumerate(items):
+        params, error = parse_item_params(item)
+        if error:
+            results[index] = {"index": index, "success": False, **error}
+            continue
+
+        word, level, format_type = params
+        key = (word.strip(), level, format_type if uses_format else None)
+        pending.setdefault(key, (params, []))[1].append(index)
+
+    semaphore = asyncio.Semaphore(MainConfig.BATCH_CONCURRENCY)
+
+    async def generate(params: Tuple[str, str, str]) -> Dict:
+        async with semaphore:
+            return await build_payload(*params)
+
+    groups = list(pending.values())
+    outcomes = await asyncio.gather(*(generate(params) for params, _ in groups), return_exceptions=True)
+
+    for (params, indexes), outcome in zip(groups, outcomes):
+        word, level, format_type = params
+        if isinstance(outcome, BaseException):
+            app.logger.error(f"배치 항목 처리 오류 (word={word}): {str(outcome)}")
+
+        for index in indexes:
+            entry = {"index": index, "word": word, "level": level, "format": format_type}
+            if isinstance(outcome, BaseException):
+                entry.update({
+                    "success": False,
+                    "error": "항목 처리 중 오류가 발생했습니다.",
+                    "message": str(outcome)
+                })
+            else:
+                entry.update({"success": True, "result": outcome})
+            results[index] = entry
+
+    succeeded = sum(1 for entry in results if entry["success"])
+    return {
+        "results": results,
+        "summary": {
+            "total": len(items),
+            "unique": len(groups),
+            "succeeded": succeeded,
+            "failed": len(items) - succeeded
+        }
+    }
+
+
+def handle_batch_request(
+        build_payload: Callable[[str, str, str], Awaitable[Dict]],
+        uses_format: bool = True
+):
+    """배치 요청 본문 검증 후 run_batch_async 실행"""
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else data
+
+    if not isinstance(items, list) or not items:
+        return jsonify({
+            "error": "항목 리스트가 필요합니다.",
+            "message": "'items' 필드에 {word, level, format} 항목 리스트를 입력해주세요."
+        }), 400
+
+    if len(items) > MainConfig.BATCH_MAX_ITEMS:
+        return jsonify({
+            "error": "항목이 너무 많습니다.",
+            "message": f"한 번에 최대 {MainConfig.BATCH_MAX_ITEMS}개 항목까지 처리할 수 있습니다."
+        }), 400
+
+    app.logger.info(f"배치 요청: {len(items)}개 항목")
+    return jsonify(run_sync(run_batch_async(items, build_payload, uses_format)))
+
+
+def format_sse(event: str, data: Dict) -> str:
+    """Server-Sent Events 한 건을 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def stream_events(events: AsyncIterator[Tuple[str, Dict]]) -> Response:
+    """
+    (event, data) 비동기 이터레이터를 SSE 응답으로 변환
+
+    이벤트는 공유 이벤트 루프에서 생성되는 즉시 전송되며, 클라이언트가
+    연결을 끊으면 생성 중인 LLM 호출도 함께 정리됩니다. 스트림 전체가 하나의
+    요청 예산을 사용하며, 대체 경로로 응답한 경우 done 이벤트에 degraded 표시가 붙습니다.
+    """
+    def generate():
+        try:
+            with request_budget(), track_degraded() as degraded:
+                for event, data in background_loop.iterate(events):
+                    if event == "done":
+                        data = add_degraded_notice(dict(data), degraded)
+                    yield format_sse(event, data)
+        except Exception as e:
+            app.logger.error(f"스트리밍 중 오류: {str(e)}")
+            yield format_sse("error", {
+                "error": "스트리밍 중 오류가 발생했습니다.",
+                "message": f"처리 중 예상치 못한 오류가 발생했습니다: {str(e)}"
+            })
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # 프록시(nginx) 버퍼링 비활성화
+        }
+    )
+
+
+def get_request_data() -> Any:
+    """POST는 JSON 본문, GET(EventSource)은 쿼리 문자열에서 요청 데이터 읽기"""
+    if request.method == 'GET':
+        return request.args.to_dict()
+    return request.get_json(silent=True)
+
+
+async def stream_generate_events(
+        word: str,
+        level: str,
+        format_type: str
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """일반 예문 스트림: 검증된 예문을 응답 형식에 맞게 변환하여 전달"""
+    async for event, data in JapaneseExampleGenerator.stream_examples_async(
+            word=word,
+            difficulty=level,
+            num_examples=5,  # 기본 5개 예문 생성
+            max_retries=2):
+        if event == "example":
+            formatted = format_examples_by_type([data], format_type)
+            if not formatted:
+                continue
+            data = {"index": data["index"], **formatted[0]}
+        yield event, data
+
+
 @app.route('/api/homonym', methods=['POST'])
 def api_homonym():
     """
@@ -134,35 +416,15 @@ def api_homonym():
             }), 503
 
         # 요청 데이터 검증
-        data = request.get_json()
-        if not data:
-            return jsonify({
-                "error": "JSON 데이터가 필요합니다.",
-                "message": "요청 본문에 유효한 JSON 데이터를 포함해주세요."
-            }), 400
-
-        word = data.get('word')
-        if not word:
-            return jsonify({
-                "error": "단어가 필요합니다.",
-                "message": "'word' 필드에 일본어 단어를 입력해주세요."
-            }), 400
-
-        # 파라미터 검증 및 기본값 설정
-        level = data.get('level', MainConfig.DEFAULT_LEVEL).lower()
-        if level not in MainConfig.VALID_LEVELS:
-            level = MainConfig.DEFAULT_LEVEL
-
-        format_type = data.get('format', MainConfig.DEFAULT_FORMAT).lower()
-        if format_type not in MainConfig.VALID_FORMATS:
-            format_type = MainConfig.DEFAULT_FORMAT
+        params, error = parse_item_params(request.get_json())
+        if error:
+            return jsonify(error), 400
 
+        word, level, format_type = params
         app.logger.info(f"동음이의어 요청: word={word}, level={level}, format={format_type}")
 
         # HomonymExampleGenerator를 사용하여 동음이의어 분석
-        examples = HomonymExampleGenerator.generate_homonym_examples(word, level.lower())
-
-        return jsonify(examples)
+        return jsonify(run_sync(build_homonym_payload_async(word, level, format_type)))
 
     except Exception as e:
         app.logger.error(f"동음이의어 API 오류: {str(e)}")
@@ -193,53 +455,233 @@ def api_generate():
             }), 503
 
         # 요청 데이터 검증
-        data = request.get_json()
-        if not data:
+        params, error = parse_item_params(request.get_json())
+        if error:
+            return jsonify(error), 400
+
+        word, level, format_type = params
+        app.logger.info(f"예문 생성 요청: word={word}, level={level}, format={format_type}")
+
+        # JapaneseExampleGenerator를 사용하여 예문 생성
+        return jsonify(run_sync(build_generate_payload_async(word, level, format_type)))
+
+    except Exception as e:
+        app.logger.error(f"예문 생성 API 오류: {str(e)}")
+        return jsonify({
+            "error": "예문 생성 중 오류가 발생했습니다.",
+            "message": f"처리 중 예상치 못한 오류가 발생했습니다: {str(e)}"
+        }), 500
+
+
+@app.route('/api/homonym/batch', methods=['POST'])
+def api_homonym_batch():
+    """
+    동음이의어 배치 API 엔드포인트
+
+    요청 형식:
+    {
+        "items": [
+            {"word": "きく", "level": "n3", "format": "simple"},
+            ...
+        ]
+    }
+
+    응답의 results는 입력 순서를 따르며, 각 항목에 success와
+    result(/api/homonym 응답) 또는 error가 포함됩니다.
+    """
+    try:
+        if HomonymExampleGenerator is None:
             return jsonify({
-                "error": "JSON 데이터가 필요합니다.",
-                "message": "요청 본문에 유효한 JSON 데이터를 포함해주세요."
-            }), 400
+                "success": False,
+                "error": "동음이의어 처리 모듈이 로드되지 않았습니다. homonym_processor.py 파일을 확인해주세요."
+            }), 503
+
+        # 동음이의어 응답은 format과 무관하므로 format만 다른 항목도 한 번만 생성
+        return handle_batch_request(build_homonym_payload_async, uses_format=False)
+
+    except Exception as e:
+        app.logger.error(f"동음이의어 배치 API 오류: {str(e)}")
+        return jsonify({
+            "error": "동음이의어 배치 처리 중 오류가 발생했습니다.",
+            "message": f"처리 중 예상치 못한 오류가 발생했습니다: {str(e)}"
+        }), 500
 
-        word = data.get('word')
-        if not word:
+
+@app.route('/api/generate/batch', methods=['POST'])
+def api_generate_batch():
+    """
+    일반 예문 생성 배치 API 엔드포인트
+
+    요청 형식:
+    {
+        "items": [
+            {"word": "食べる", "level": "n3", "format": "with_context"},
+            ...
+        ]
+    }
+
+    응답의 results는 입력 순서를 따르며, 각 항목에 success와
+    result(/api/generate 응답) 또는 error가 포함됩니다.
+    """
+    try:
+        if JapaneseExampleGenerator is None:
             return jsonify({
-                "error": "단어가 필요합니다.",
-                "message": "'word' 필드에 일본어 단어를 입력해주세요."
-            }), 400
+                "success": False,
+                "error": "예문 생성 모듈이 로드되지 않았습니다. example_generator.py 파일을 확인해주세요."
+            }), 503
 
-        # 파라미터 검증 및 기본값 설정
-        level = data.get('level', MainConfig.DEFAULT_LEVEL).lower()
-        if level not in MainConfig.VALID_LEVELS:
-            level = MainConfig.DEFAULT_LEVEL
+        return handle_batch_request(build_generate_payload_async)
 
-        format_type = data.get('format', MainConfig.DEFAULT_FORMAT).lower()
-        if format_type not in MainConfig.VALID_FORMATS:
-            format_type = MainConfig.DEFAULT_FORMAT
+    except Exception as e:
+        app.logger.error(f"예문 생성 배치 API 오류: {str(e)}")
+        return jsonify({
+            "error": "예문 생성 배치 처리 중 오류가 발생했습니다.",
+            "message": f"처리 중 예상치 못한 오류가 발생했습니다: {str(e)}"
+        }), 500
 
-        app.logger.info(f"예문 생성 요청: word={word}, level={level}, format={format_type}")
 
-        # JapaneseExampleGenerator를 사용하여 예문 생성
-        examples = JapaneseExampleGenerator.generate_examples(
-            word=word,
-            difficulty=level,
-            num_examples=5,  # 기본 5개 예문 생성
-            max_retries=2
-        )
+@app.route('/api/homonym/stream', methods=['GET', 'POST'])
+def api_homonym_stream():
+    """
+    동음이의어 스트리밍 API 엔드포인트 (Server-Sent Events)
 
-        # 응답 형식에 따라 데이터 구성
-        formatted_examples = format_examples_by_type(examples, format_type)
+    요청 형식은 /api/homonym과 같으며 GET 쿼리 문자열(EventSource)도 지원합니다.
 
-        # Return examples
-        return jsonify({"examples": formatted_examples})
+    이벤트:
+        meanings: 의미 목록 (데이터베이스 결과는 즉시 전송, 예문 없음)
+        meaning: 각 의미의 예문 (완료되는 순서대로, index 포함)
+        done: 완료 여부 {"complete", "cached"} (Gemini 장애 시 "degraded", "notice" 포함)
+        error: 처리 중 오류
+    """
+    try:
+        if HomonymExampleGenerator is None:
+            return jsonify({
+                "success": False,
+                "error": "동음이의어 처리 모듈이 로드되지 않았습니다. homonym_processor.py 파일을 확인해주세요."
+            }), 503
+
+        params, error = parse_item_params(get_request_data())
+        if error:
+            return jsonify(error), 400
+
+        word, level, format_type = params
+        app.logger.info(f"동음이의어 스트리밍 요청: word={word}, level={level}")
+
+        return stream_events(HomonymExampleGenerator.stream_homonym_examples_async(word, level))
 
     except Exception as e:
-        app.logger.error(f"예문 생성 API 오류: {str(e)}")
+        app.logger.error(f"동음이의어 스트리밍 API 오류: {str(e)}")
+        return jsonify({
+            "error": "동음이의어 분석 중 오류가 발생했습니다.",
+            "message": f"처리 중 예상치 못한 오류가 발생했습니다: {str(e)}"
+        }), 500
+
+
+@app.route('/api/generate/stream', methods=['GET', 'POST'])
+def api_generate_stream():
+    """
+    일반 예문 스트리밍 API 엔드포인트 (Server-Sent Events)
+
+    요청 형식은 /api/generate와 같으며 GET 쿼리 문자열(EventSource)도 지원합니다.
+
+    이벤트:
+        example: 검증을 통과한 예문 하나 (format 적용, index 포함)
+        done: {"count", "requested", "complete"} (실패 시 "error", Gemini 장애 시 "degraded", "notice" 포함)
+        error: 처리 중 오류
+    """
+    try:
+        if JapaneseExampleGenerator is None:
+            return jsonify({
+                "success": False,
+                "error": "예문 생성 모듈이 로드되지 않았습니다. example_generator.py 파일을 확인해주세요."
+            }), 503
+
+        params, error = parse_item_params(get_request_data())
+        if error:
+            return jsonify(error), 400
+
+        word, level, format_type = params
+        app.logger.info(f"예문 스트리밍 요청: word={word}, level={level}, format={format_type}")
+
+        return stream_events(stream_generate_events(word, level, format_type))
+
+    except Exception as e:
+        app.logger.error(f"예문 스트리밍 API 오류: {str(e)}")
         return jsonify({
             "error": "예문 생성 중 오류가 발생했습니다.",
             "message": f"처리 중 예상치 못한 오류가 발생했습니다: {str(e)}"
         }), 500
 
 
+@app.route('/api/stats', methods=['GET'])
+def api_stats():
+    """
+    서비스 내부 통계 API 엔드포인트 (현재 워커 프로세스 기준)
+
+    캐시 적중률, 예문 풀, 동시 요청 병합, Gemini 속도 제한/회로 차단기 상태와
+    헤징으로 추가된 호출 비율(extra_call_rate)을 반환합니다.
+    """
+    try:
+        return jsonify({
+            "pid": os.getpid(),
+            "llm_cache": HomonymLLMService.get_cache_stats(),
+            "homonym_result_cache": HomonymExampleGenerator.get_result_cache_stats(),
+            "homonym_negative_cache": HomonymExampleGenerator.get_negative_cache_stats(),
+            "learned_homonyms": learned_homonyms.stats() if learned_homonyms is not None else None,
+            "example_pool": example_pool.stats(),
+            "single_flight": request_flights.stats(),
+            "rate_limiter": llm_rate_limiter.stats(),
+            "circuit_breaker": llm_circuit_breaker.stats(),
+            "hedging": {
+                "homonym": HomonymLLMService.get_hedge_stats(),
+                "generate": ExampleLLMService.get_hedge_stats()
+            }
+        })
+
+    except Exception as e:
+        app.logger.error(f"통계 API 오류: {str(e)}")
+        return jsonify({
+            "error": "통계 조회 중 오류가 발생했습니다.",
+            "message": str(e)
+        }), 500
+
+
+def create_app() -> Flask:
+    """
+    Application factory for production servers (``main_app:create_app()``).
+
+    Loads everything that is shared by all requests of a process: the
+    homonym indexes (built when homonym_processor is imported), the Gemini
+    SDK configuration and the LLM response cache. With gunicorn's
+    preload_app this runs once in the master and forked workers inherit the
+    result; per-process state such as SQLite connections, model transports
+    and the asyncio loop is recreated lazily in each worker.
+
+    Returns:
+        The configured Flask application
+    """
+    gemini_clients.configure(HomonymConfig.GEMINI_API_KEY)
+    app.logger.info(f"Application loaded (homonym dictionary: {type(homonym_index).__name__})")
+    return app
+
+
+def run_production_server():
+    """Serve create_app() with gunicorn using the settings in gunicorn_conf.py."""
+    from gunicorn.app.base import BaseApplication
+    import gunicorn_conf
+
+    class ProductionServer(BaseApplication):
+        def load_config(self):
+            for key, value in vars(gunicorn_conf).items():
+                if key in self.cfg.settings and value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            return create_app()
+
+    ProductionServer().run()
+
+
 def main():
     """메인 실행 함수"""
     # 환경 변수에서 설정 읽기
@@ -247,15 +689,26 @@ def main():
     host = os.environ.get("HOST", MainConfig.DEFAULT_HOST)
     debug = os.environ.get("DEBUG", "false").lower() == "true"
 
+    serve_mode = MainConfig.SERVE_MODE
+    if serve_mode not in MainConfig.VALID_SERVE_MODES:
+        print(f"⚠️ 알 수 없는 SERVE_MODE '{serve_mode}', development 모드로 실행합니다")
+        serve_mode = "development"
+
     print("\n" + "=" * 70)
     print("🇯🇵 일본어 예문 생성 통합 서비스 🇯🇵")
     print("=" * 70)
-    print(f"🚀 서버 시작: http://{host}:{port}")
+    print(f"🚀 서버 시작: http://{host}:{port} ({serve_mode})")
     print("=" * 70)
     print("🔧 API 엔드포인트:")
     print("  • 전용 모드:")
     print(f"    - POST http://{host}:{port}/api/homonym (동음이의어)")
     print(f"    - POST http://{host}:{port}/api/generate (일반 예문)")
+    print("  • 배치 모드:")
+    print(f"    - POST http://{host}:{port}/api/homonym/batch (동음이의어 여러 단어)")
+    print(f"    - POST http://{host}:{port}/api/generate/batch (일반 예문 여러 단어)")
+    print("  • 스트리밍 모드 (Server-Sent Events):")
+    print(f"    - GET/POST http://{host}:{port}/api/homonym/stream (동음이의어)")
+    print(f"    - GET/POST http://{host}:{port}/api/generate/stream (일반 예문)")
     print("=" * 70)
     print("📋 기능:")
     print("  • 동음이의어 분석 및 구별 예문 생성")
@@ -274,7 +727,12 @@ def main():
     print("=" * 70 + "\n")
 
     try:
-        app.run(host=host, port=port, debug=debug)
+        if serve_mode == "production":
+            # 워커/스레드 수, preload, keep-alive 등은 gunicorn_conf.py에서 설정
+            run_production_server()
+        else:
+            # Gemini SDK는 시작 시 한 번만 설정하고 모델 객체는 요청 간에 재사용
+            create_app().run(host=host, port=port, debug=debug)
     except KeyboardInterrupt:
         print("\n👋 서비스를 종료합니다. 안녕히 가세요!")
     except Exception as e:
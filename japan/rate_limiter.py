@@ -0,0 +1,390 @@
+import os
+import time
+import asyncio
+import logging
+import sqlite3
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from cache_store import BASE_DIR
+from request_budget import estimate_tokens
+from retry_policy import ERROR_QUOTA, classify_error, retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitConfig:
+    """Gemini 호출 속도 제한 설정 (토큰 버킷 + AIMD 동시 실행 수)"""
+    # 기본값은 비활성화: 실제 할당량에 맞춰 RPM/TPM을 지정할 때만 켜기
+    ENABLED = os.getenv("LLM_RATE_LIMIT_ENABLED", "false").lower() == "true"
+
+    # 분당 요청 수 / 분당 토큰 수 (0이면 제한 없음, 여러 워커라면 CROSS_PROCESS와 함께 사용)
+    RPM = float(os.getenv("LLM_RATE_LIMIT_RPM", 0))
+    TPM = float(os.getenv("LLM_RATE_LIMIT_TPM", 0))
+
+    # 버킷 크기: 몇 초 분량까지 한 번에 보낼 수 있는지
+    BURST_SECONDS = float(os.getenv("LLM_RATE_LIMIT_BURST_SECONDS", 10))
+
+    # 적응형 동시 실행 수 (429 응답 시 절반으로, 성공할 때마다 조금씩 증가)
+    MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", 1))
+    MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 16))
+    INITIAL_CONCURRENCY = int(os.getenv("LLM_INITIAL_CONCURRENCY", 8))
+    DECREASE_FACTOR = float(os.getenv("LLM_CONCURRENCY_DECREASE_FACTOR", 0.5))
+    DECREASE_COOLDOWN = 1.0  # seconds (동시에 받은 429는 한 번만 반영)
+
+    # 429 응답 후 모든 호출을 멈추는 시간 (Retry-After가 없을 때)
+    THROTTLE_PAUSE = float(os.getenv("LLM_RATE_LIMIT_THROTTLE_PAUSE", 2.0))  # seconds
+
+    # 여러 워커 프로세스가 버킷과 일시 정지 상태를 공유 (SQLite)
+    CROSS_PROCESS = os.getenv("LLM_RATE_LIMIT_CROSS_PROCESS", "false").lower() == "true"
+    STATE_PATH = os.getenv("LLM_RATE_LIMIT_STATE_PATH", os.path.join(BASE_DIR, ".cache", "rate_limit.sqlite3"))
+
+    POLL_INTERVAL = 0.02  # seconds
+    MAX_POLL_INTERVAL = 0.25  # seconds
+
+
+class _LocalBuckets:
+    """Token buckets and the throttle pause kept in process memory."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # name -> (tokens, updated_at)
+        self._paused_until = 0.0
+
+    def take(self, requests: Dict[str, Tuple[float, float, float]]) -> float:
+        """
+        Take from every bucket at once, or from none.
+
+        Args:
+            requests: name -> (amount, refill per second, capacity)
+
+        Returns:
+            0 if taken, otherwise seconds until the request could succeed
+        """
+        with self._lock:
+            now = time.time()
+            if now < self._paused_until:
+                return self._paused_until - now
+
+            levels = {}
+            wait = 0.0
+            for name, (amount, rate, capacity) in requests.items():
+                tokens, updated_at = self._buckets.get(name, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated_at) * rate)
+                levels[name] = tokens
+                if tokens < amount:
+                    wait = max(wait, (amount - tokens) / rate)
+
+            if wait == 0.0:
+                for name, (amount, _, _) in requests.items():
+                    levels[name] -= amount
+            for name, tokens in levels.items():
+                self._buckets[name] = (tokens, now)
+            return wait
+
+    def debit(self, name: str, amount: float):
+        """Charge tokens after the fact (the bucket may go negative)."""
+        with self._lock:
+            if name in self._buckets:
+                tokens, updated_at = self._buckets[name]
+                self._buckets[name] = (tokens - amount, updated_at)
+
+    def pause(self, until: float):
+        with self._lock:
+            self._paused_until = max(self._paused_until, until)
+
+
+class _SQLiteBuckets:
+    """
+    Token buckets and the throttle pause shared by the processes of one host.
+
+    State lives in a small SQLite table updated in IMMEDIATE transactions,
+    so gunicorn workers draw from the same RPM/TPM allowance.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_state ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _transaction(self, work):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = work(conn)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def take(self, requests: Dict[str, Tuple[float, float, float]]) -> float:
+        def work(conn: sqlite3.Connection) -> float:
+            now = time.time()
+            rows = dict(
+                (name, (tokens, updated_at))
+                for name, tokens, updated_at in conn.execute("SELECT name, tokens, updated_at FROM rate_limit_state")
+            )
+
+            paused_until = rows.get("paused_until", (0.0, 0.0))[0]
+            if now < paused_until:
+                return paused_until - now
+
+            levels = {}
+            wait = 0.0
+            for name, (amount, rate, capacity) in requests.items():
+                tokens, updated_at = rows.get(name, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated_at) * rate)
+                levels[name] = tokens
+                if tokens < amount:
+                    wait = max(wait, (amount - tokens) / rate)
+
+            if wait == 0.0:
+                for name, (amount, _, _) in requests.items():
+                    levels[name] -= amount
+            conn.executemany(
+                "INSERT OR REPLACE INTO rate_limit_state (name, tokens, updated_at) VALUES (?, ?, ?)",
+                [(name, tokens, now) for name, tokens in levels.items()]
+            )
+            return wait
+
+        return self._transaction(work)
+
+    def debit(self, name: str, amount: float):
+        self._transaction(lambda conn: conn.execute(
+            "UPDATE rate_limit_state SET tokens = tokens - ? WHERE name = ?", (amount, name)
+        ))
+
+    def pause(self, until: float):
+        self._transaction(lambda conn: conn.execute(
+            "INSERT INTO rate_limit_state (name, tokens, updated_at) VALUES ('paused_until', ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET tokens = MAX(tokens, excluded.tokens), updated_at = excluded.updated_at",
+            (until, time.time())
+        ))
+
+
+class LLMRateLimiter:
+    """
+    Client-side limiter placed in front of every Gemini call.
+
+    Two mechanisms combine:
+    - Token buckets for requests per minute and (estimated) tokens per
+      minute, so bursts are smoothed to the configured quota instead of
+      being rejected by the API.
+    - An AIMD concurrency limit: each success raises the number of calls
+      allowed in flight by 1/limit (about +1 per round of calls), a 429
+      halves it (at most once per DECREASE_COOLDOWN) and pauses every
+      caller for the Retry-After time, so the limit settles just under
+      the point where the quota starts rejecting.
+
+    The limiter is thread-safe. With ``cross_process`` the buckets and the
+    pause live in a SQLite file shared by all worker processes (its
+    transactions run in a worker thread, never on the event loop); the
+    concurrency limit stays per process. Waiting never blocks the event
+    loop and is bounded by the caller's timeout.
+
+    Off unless RateLimitConfig.ENABLED; the buckets only apply once RPM
+    or TPM is configured.
+    """
+
+    def __init__(
+            self,
+            rpm: float = RateLimitConfig.RPM,
+            tpm: float = RateLimitConfig.TPM,
+            cross_process: bool = False,
+            state_path: str = RateLimitConfig.STATE_PATH
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.cross_process = cross_process
+        self._buckets = _SQLiteBuckets(state_path) if cross_process else _LocalBuckets()
+
+        self._lock = threading.Lock()
+        self._limit = float(min(RateLimitConfig.MAX_CONCURRENCY, max(
+            RateLimitConfig.MIN_CONCURRENCY, RateLimitConfig.INITIAL_CONCURRENCY)))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+
+        self._acquired = 0
+        self._throttled = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+
+    def _bucket_requests(self, tokens: int) -> Dict[str, Tuple[float, float, float]]:
+        requests = {}
+        for name, per_minute, amount in (("requests", self.rpm, 1.0), ("tokens", self.tpm, float(tokens))):
+            if per_minute > 0:
+                rate = per_minute / 60
+                capacity = max(1.0, rate * RateLimitConfig.BURST_SECONDS)
+                # 버킷보다 큰 요청도 언젠가는 통과하도록 크기로 제한
+                requests[name] = (min(amount, capacity), rate, capacity)
+        return requests
+
+    async def _call_buckets(self, method, *args):
+        """Run a bucket operation; SQLite transactions go to a thread so the event loop never waits on the lock."""
+        if self.cross_process:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def _try_acquire(self, tokens: int) -> float:
+        """Take a concurrency slot and the bucket tokens, or return how long to wait."""
+        with self._lock:
+            if self._in_flight >= int(self._limit):
+                return RateLimitConfig.POLL_INTERVAL
+            self._in_flight += 1
+
+        try:
+            requests = self._bucket_requests(tokens)
+            wait = await self._call_buckets(self._buckets.take, requests) if requests else 0.0
+        except Exception as e:
+            # 공유 상태를 읽을 수 없으면 버킷 없이 진행 (동시 실행 수 제한은 유지)
+            logger.warning(f"Rate limiter state unavailable, skipping buckets: {e}")
+            wait = 0.0
+        except BaseException:
+            self._release_slot()
+            raise
+
+        if wait > 0:
+            self._release_slot()
+        return wait
+
+    def _release_slot(self):
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    async def _release(self, throttled: bool = False, succeeded: bool = False, retry_after: Optional[float] = None):
+        now = time.monotonic()
+        self._release_slot()
+        with self._lock:
+            if throttled:
+                self._throttled += 1
+                if now - self._last_decrease >= RateLimitConfig.DECREASE_COOLDOWN:
+                    self._limit = max(float(RateLimitConfig.MIN_CONCURRENCY),
+                                      self._limit * RateLimitConfig.DECREASE_FACTOR)
+                    self._last_decrease = now
+                    logger.warning(f"Gemini quota hit, concurrency limit lowered to {int(self._limit)}")
+            elif succeeded:
+                self._limit = min(float(RateLimitConfig.MAX_CONCURRENCY), self._limit + 1 / self._limit)
+
+        if throttled:
+            pause = retry_after if retry_after is not None else RateLimitConfig.THROTTLE_PAUSE
+            try:
+                await self._call_buckets(self._buckets.pause, time.time() + pause)
+            except Exception as e:
+                logger.warning(f"Rate limiter state unavailable, pause not shared: {e}")
+
+    async def acquire(self, tokens: int, timeout: float):
+        """
+        Wait for a concurrency slot and bucket tokens.
+
+        Args:
+            tokens: Estimated tokens of the prompt
+            timeout: Maximum seconds to wait
+
+        Raises:
+            asyncio.TimeoutError: No capacity within ``timeout``
+        """
+        started = time.monotonic()
+        deadline = started + timeout
+        while True:
+            wait = await self._try_acquire(tokens)
+            if wait <= 0:
+                with self._lock:
+                    self._acquired += 1
+                    self._wait_time += time.monotonic() - started
+                return
+
+            now = time.monotonic()
+            if now + min(wait, RateLimitConfig.POLL_INTERVAL) > deadline:
+                with self._lock:
+                    self._timeouts += 1
+                raise asyncio.TimeoutError("No Gemini capacity before the deadline")
+            await asyncio.sleep(min(wait, RateLimitConfig.MAX_POLL_INTERVAL, deadline - now))
+
+    @asynccontextmanager
+    async def limit(self, prompt: Optional[str], timeout: float) -> AsyncIterator[None]:
+        """
+        Hold a slot for one Gemini attempt (including a streamed answer).
+
+        A quota error raised inside the block lowers the concurrency limit
+        and pauses all callers; a normal exit counts as a success.
+
+        Args:
+            prompt: Prompt of the attempt (for the token bucket)
+            timeout: Maximum seconds to wait for capacity
+
+        Raises:
+            asyncio.TimeoutError: No capacity within ``timeout``
+        """
+        if not RateLimitConfig.ENABLED:
+            yield
+            return
+
+        await self.acquire(estimate_tokens(prompt), timeout)
+        try:
+            yield
+        except Exception as e:
+            if classify_error(e) == ERROR_QUOTA:
+                await self._release(throttled=True, retry_after=retry_after_seconds(e))
+            else:
+                await self._release()
+            raise
+        except BaseException:
+            self._release_slot()
+            raise
+        else:
+            await self._release(succeeded=True)
+
+    async def record_response(self, text: Optional[str]):
+        """Charge the estimated tokens of an answer to the tokens-per-minute bucket."""
+        if RateLimitConfig.ENABLED and self.tpm > 0 and text:
+            try:
+                await self._call_buckets(self._buckets.debit, "tokens", estimate_tokens(text))
+            except Exception as e:
+                logger.warning(f"Rate limiter state unavailable: {e}")
+
+    def stats(self) -> Dict:
+        """
+        Report the limiter state.
+
+        Returns:
+            Dictionary with the concurrency limit, calls in flight and counters
+        """
+        with self._lock:
+            return {
+                "enabled": RateLimitConfig.ENABLED,
+                "cross_process": self.cross_process,
+                "rpm": self.rpm,
+                "tpm": self.tpm,
+                "concurrency_limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "acquired": self._acquired,
+                "throttled": self._throttled,
+                "timeouts": self._timeouts,
+                "avg_wait": round(self._wait_time / self._acquired, 4) if self._acquired else 0.0
+            }
+
+
+# 두 서비스(homonym_processor, example_generator)의 모든 Gemini 호출이 공유
+llm_rate_limiter = LLMRateLimiter(cross_process=RateLimitConfig.CROSS_PROCESS)
@@ -0,0 +1,177 @@
+import os
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RequestBudgetConfig:
+    """요청 단위 LLM 사용량 예산 설정"""
+    ENABLED = os.getenv("REQUEST_BUDGET_ENABLED", "true").lower() == "true"
+
+    # 요청 하나가 사용할 수 있는 Gemini 호출 수 (재시도 포함), 추정 토큰 수, 전체 시간
+    MAX_LLM_CALLS = int(os.getenv("REQUEST_BUDGET_MAX_LLM_CALLS", 16))
+    MAX_TOKENS = int(os.getenv("REQUEST_BUDGET_MAX_TOKENS", 100000))
+    MAX_SECONDS = float(os.getenv("REQUEST_BUDGET_MAX_SECONDS", 60))
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Rough token count of a prompt or answer.
+
+    About four UTF-8 bytes per token: four ASCII characters, or a little
+    more than one Japanese/Korean character.
+
+    Args:
+        text: Prompt or response text
+
+    Returns:
+        Estimated number of tokens
+    """
+    if not text:
+        return 0
+    return max(1, len(text.encode("utf-8")) // 4)
+
+
+class RequestBudget:
+    """
+    LLM attempts, tokens and wall-clock time one request may spend.
+
+    Shared by every layer that handles the request (generator retry loops,
+    per-meaning generation, the retry schedule of each Gemini call) through
+    a context variable, so nested retries draw from one budget instead of
+    multiplying. Once any limit is reached no new Gemini attempt is started
+    and the generators return what they have.
+    """
+
+    def __init__(
+            self,
+            max_calls: int = RequestBudgetConfig.MAX_LLM_CALLS,
+            max_tokens: int = RequestBudgetConfig.MAX_TOKENS,
+            max_seconds: float = RequestBudgetConfig.MAX_SECONDS
+    ):
+        self.max_calls = max_calls
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + max_seconds
+
+        self.calls = 0
+        self.tokens = 0
+        self.exhausted_reason: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def remaining_time(self) -> float:
+        """Seconds left before the request's deadline."""
+        return max(0.0, self.deadline - time.monotonic())
+
+    def _check(self) -> Optional[str]:
+        if self.calls >= self.max_calls:
+            return f"{self.calls} LLM calls"
+        if self.tokens >= self.max_tokens:
+            return f"~{self.tokens} tokens"
+        if time.monotonic() >= self.deadline:
+            return f"{self.max_seconds:.0f}s"
+        return None
+
+    def _exhaust(self, reason: str):
+        if self.exhausted_reason is None:
+            self.exhausted_reason = reason
+            logger.warning(f"Request budget exhausted ({reason}), no further LLM attempts")
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether no further LLM attempt may be started."""
+        with self._lock:
+            reason = self._check()
+            if reason:
+                self._exhaust(reason)
+            return reason is not None
+
+    def try_spend_call(self, prompt_tokens: int = 0) -> bool:
+        """
+        Reserve one LLM attempt and its prompt tokens.
+
+        Args:
+            prompt_tokens: Estimated tokens of the prompt
+
+        Returns:
+            False (and nothing is spent) if the budget is exhausted
+        """
+        with self._lock:
+            reason = self._check()
+            if reason:
+                self._exhaust(reason)
+                return False
+            self.calls += 1
+            self.tokens += prompt_tokens
+            return True
+
+    def spend_tokens(self, tokens: int):
+        """Add the tokens of an answer."""
+        with self._lock:
+            self.tokens += tokens
+
+    def stats(self) -> Dict:
+        """Usage so far."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "tokens": self.tokens,
+                "elapsed": round(time.monotonic() - self.started_at, 3),
+                "exhausted": self.exhausted_reason
+            }
+
+
+_current_budget: contextvars.ContextVar = contextvars.ContextVar("request_budget", default=None)
+
+
+def current_budget() -> Optional[RequestBudget]:
+    """Budget of the request being handled, or None outside a request."""
+    return _current_budget.get()
+
+
+def budget_exhausted() -> bool:
+    """Whether the current request has used up its budget (False without a budget)."""
+    budget = _current_budget.get()
+    return budget is not None and budget.exhausted
+
+
+def spend_response_tokens(text: Optional[str]):
+    """Charge the estimated tokens of an answer to the current request's budget."""
+    budget = _current_budget.get()
+    if budget is not None and text:
+        budget.spend_tokens(estimate_tokens(text))
+
+
+@contextmanager
+def request_budget(budget: Optional[RequestBudget] = None) -> Iterator[Optional[RequestBudget]]:
+    """
+    Give the enclosed work its own request budget.
+
+    Usable in synchronous code and inside a coroutine; tasks started inside
+    (asyncio.gather, run_sync) inherit the budget. Does nothing when
+    RequestBudgetConfig.ENABLED is false.
+
+    Args:
+        budget: Budget to install (a new one with the configured limits by default)
+
+    Yields:
+        The installed budget, or None when budgets are disabled
+    """
+    if not RequestBudgetConfig.ENABLED:
+        yield None
+        return
+
+    budget = budget or RequestBudget()
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+        if budget.exhausted_reason:
+            logger.info(f"Request finished over budget: {budget.stats()}")
@@ -0,0 +1,242 @@
+import os
+import re
+import time
+import random
+import asyncio
+import logging
+from typing import Any, Optional
+
+from request_budget import current_budget, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class RetryConfig:
+    """LLM 호출 재시도 설정"""
+    # decorrelated jitter 대기 시간의 하한과 상한
+    BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", 1.0))  # seconds
+    MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", 10.0))  # seconds
+
+    # 서버 오류(5xx)와 할당량 초과(429) 후 최소 대기 시간 (Retry-After가 없을 때)
+    SERVER_ERROR_DELAY = float(os.getenv("LLM_RETRY_SERVER_ERROR_DELAY", 5.0))  # seconds
+    QUOTA_DELAY = float(os.getenv("LLM_RETRY_QUOTA_DELAY", 10.0))  # seconds
+
+    # 대기 후 남은 시간이 이보다 짧으면 재시도하지 않음
+    MIN_ATTEMPT_TIME = float(os.getenv("LLM_RETRY_MIN_ATTEMPT_TIME", 1.0))  # seconds
+
+
+# 오류 분류
+ERROR_QUOTA = "quota"
+ERROR_SERVER = "server"
+ERROR_OTHER = "other"
+
+# "rate" 단독으로는 "generate" 등과 구분되지 않으므로 "rate limit" 형태만 인식
+_RATE_LIMIT_TEXT = re.compile(r'rate[ _-]?limit')
+
+_RETRY_AFTER_TEXT = re.compile(
+    r'retry(?:[ _-]?after|[ _-]?delay| in)\D{0,20}?(\d+(?:\.\d+)?)\s*(ms|s)?',
+    re.IGNORECASE
+)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """HTTP status of a google.api_core / HTTP error, if it has one."""
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return int(code)
+    return None
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Classify an LLM call error for the retry delay.
+
+    Args:
+        error: Exception raised by the call
+
+    Returns:
+        ERROR_QUOTA (429 / quota / rate limit), ERROR_SERVER (5xx) or ERROR_OTHER
+    """
+    status = _status_code(error)
+    message = str(error).lower()
+
+    if status == 429 or "quota" in message or "resource exhausted" in message or _RATE_LIMIT_TEXT.search(message):
+        return ERROR_QUOTA
+    if (status is not None and 500 <= status < 600) or "500" in message or "internal error" in message:
+        return ERROR_SERVER
+    return ERROR_OTHER
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Server-provided retry delay of an error, if any.
+
+    Looks at a Retry-After response header, a google.rpc RetryInfo detail
+    (``retry_delay``) and, last, a "retry in/after N s" hint in the message.
+
+    Args:
+        error: Exception raised by the call
+
+    Returns:
+        Delay in seconds, or None if the error carries no hint
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        try:
+            value = headers.get("Retry-After") or headers.get("retry-after")
+            if value is not None:
+                return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+
+    for detail in getattr(error, "details", None) or []:
+        retry_delay = getattr(detail, "retry_delay", None)
+        if retry_delay is not None:
+            seconds = getattr(retry_delay, "seconds", 0) + getattr(retry_delay, "nanos", 0) / 1e9
+            if seconds > 0:
+                return seconds
+
+    match = _RETRY_AFTER_TEXT.search(str(error))
+    if match:
+        seconds = float(match.group(1))
+        return seconds / 1000 if (match.group(2) or "").lower() == "ms" else seconds
+
+    return None
+
+
+class RetrySchedule:
+    """
+    Attempt counter, backoff state and deadline of one LLM call.
+
+    Created by RetryPolicy.begin(); not shared between calls. Inside a
+    request with a RequestBudget every attempt is also charged to that
+    budget, and the request's deadline caps the call's own.
+    """
+
+    def __init__(self, policy: "RetryPolicy"):
+        self.policy = policy
+        self.deadline = time.monotonic() + policy.deadline
+        self.attempts = 0
+        self.budget = current_budget()
+        self._previous_delay = policy.base_delay
+
+    def remaining(self) -> float:
+        """Seconds left until the call's (or the request's) deadline."""
+        remaining = max(0.0, self.deadline - time.monotonic())
+        if self.budget is not None:
+            remaining = min(remaining, self.budget.remaining_time())
+        return remaining
+
+    def start_attempt(self, prompt: Optional[str] = None) -> bool:
+        """
+        Count a new attempt.
+
+        Args:
+            prompt: Prompt of the attempt, charged to the request budget
+
+        Returns:
+            False if the attempts are used up, the deadline has passed or the
+            request budget is exhausted
+        """
+        if self.attempts >= self.policy.max_attempts or self.remaining() <= 0:
+            return False
+        if self.budget is not None and not self.budget.try_spend_call(estimate_tokens(prompt)):
+            return False
+        self.attempts += 1
+        return True
+
+    def next_delay(self, error: Optional[BaseException] = None) -> Optional[float]:
+        """
+        Delay before the next attempt (decorrelated jitter, raised to the error's floor).
+
+        Args:
+            error: Exception of the failed attempt (None for an unusable answer)
+
+        Returns:
+            Seconds to wait, or None if no further attempt fits in the budget
+        """
+        if self.attempts >= self.policy.max_attempts:
+            return None
+
+        # decorrelated jitter: base ~ 이전 대기 시간의 3배 사이에서 무작위
+        delay = min(self.policy.max_delay, random.uniform(self.policy.base_delay, self._previous_delay * 3))
+        self._previous_delay = delay
+
+        if error is not None:
+            kind = classify_error(error)
+            hint = retry_after_seconds(error)
+            if hint is not None:
+                delay = max(delay, hint)
+            elif kind == ERROR_QUOTA:
+                delay = max(delay, RetryConfig.QUOTA_DELAY)
+            elif kind == ERROR_SERVER:
+                delay = max(delay, RetryConfig.SERVER_ERROR_DELAY)
+
+        if delay + RetryConfig.MIN_ATTEMPT_TIME > self.remaining():
+            return None
+        return delay
+
+    async def backoff(self, error: Optional[BaseException] = None) -> bool:
+        """
+        Wait before the next attempt without blocking the event loop.
+
+        Args:
+            error: Exception of the failed attempt (None for an unusable answer)
+
+        Returns:
+            False if the call should give up instead (attempts or deadline exhausted)
+        """
+        delay = self.next_delay(error)
+        if delay is None:
+            if self.attempts < self.policy.max_attempts and not (self.budget and self.budget.exhausted_reason):
+                logger.warning(f"LLM call deadline reached after {self.attempts} attempts, giving up")
+            return False
+
+        logger.info(f"Retrying LLM call in {delay:.1f}s (attempt {self.attempts + 1}/{self.policy.max_attempts})")
+        await asyncio.sleep(delay)
+        return True
+
+
+class RetryPolicy:
+    """
+    Retry policy for one kind of LLM call.
+
+    Waits between attempts use decorrelated jitter (each delay is random
+    between ``base_delay`` and three times the previous one, capped at
+    ``max_delay``) so workers that failed together do not retry together.
+    A Retry-After hint from the server, or else a minimum delay for quota
+    and server errors, raises the delay. Every call has a hard ``deadline``
+    covering all attempts and waits: a retry that would not fit is not
+    started, and each attempt is given only the time that is left.
+    """
+
+    def __init__(
+            self,
+            max_attempts: int,
+            deadline: float,
+            base_delay: float = RetryConfig.BASE_DELAY,
+            max_delay: float = RetryConfig.MAX_DELAY
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.deadline = deadline
+        self.base_delay = base_delay
+        self.max_delay = max(base_delay, max_delay)
+
+    def begin(self) -> RetrySchedule:
+        """Start the schedule of a new call."""
+        return RetrySchedule(self)
+
+
+async def wait_for_attempt(awaitable: Any, schedule: RetrySchedule) -> Any:
+    """
+    Await one attempt, cancelling it when the call's deadline passes.
+
+    Args:
+        awaitable: The attempt (e.g. generate_content_async(...))
+        schedule: Schedule of the call
+
+    Returns:
+        The attempt's result (asyncio.TimeoutError once the deadline passes)
+    """
+    return await asyncio.wait_for(awaitable, timeout=schedule.remaining())
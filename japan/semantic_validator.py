@@ -0,0 +1,221 @@
+import os
+import re
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Pattern
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticValidatorConfig:
+    """의미 검증 규칙 설정"""
+    RULES_PATH = os.getenv(
+        "SEMANTIC_RULES_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "semantic_rules.json")
+    )
+
+
+# 아무 것과도 매칭되지 않는 패턴 (규칙이 없는 경우)
+_NEVER = re.compile(r'(?!)')
+
+_MULTIPLE_NEWLINES = re.compile(r'\n{2,}')
+_JAPANESE_CHARS = re.compile(r'[ぁ-んァ-ン一-龥]')
+
+
+def literal_alternation(phrases: Iterable[str]) -> str:
+    """
+    Build a regex matching any of the given literal phrases, factored as a trie.
+
+    Phrases sharing a prefix share one branch, so matching at a position costs
+    at most the length of the longest phrase instead of one attempt per phrase.
+
+    Args:
+        phrases: Literal strings
+
+    Returns:
+        Regex source (empty string if there are no phrases)
+    """
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        if not phrase:
+            continue
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = None  # 구절의 끝
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # 더 짧은 구절도 여기서 끝날 수 있음
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+def _combine(sources: Iterable[str]) -> Pattern:
+    """Compile one alternation of regex sources (a never-matching pattern if empty)."""
+    sources = [source for source in sources if source]
+    if not sources:
+        return _NEVER
+    return re.compile("|".join(f"(?:{source})" for source in sources))
+
+
+class SemanticValidator:
+    """
+    Semantic and formatting checks for generated examples.
+
+    All rules are compiled once when the validator is built: for every verb in
+    the constraint table its invalid objects (as a trie-factored alternation),
+    its own invalid patterns and the general unnatural patterns become one
+    regex, so checking a Japanese sentence is a single search whatever the
+    number of rules. The Korean formatting checks are one more regex.
+    """
+
+    def __init__(self, rules: Dict[str, Any]):
+        """
+        Args:
+            rules: Rule tables in the data/semantic_rules.json layout
+        """
+        self.rules = rules
+
+        unnatural_sources = list(rules.get("unnatural_patterns", []))
+        self._unnatural = _combine(unnatural_sources)
+
+        # 동사별 규칙 + 일반 부자연스러운 패턴을 하나의 정규식으로
+        self._constraints: Dict[str, Pattern] = {}
+        self._by_word: Dict[str, Pattern] = {}
+        for word, constraints in rules.get("verb_object_constraints", {}).items():
+            sources = list(constraints.get("invalid_patterns", []))
+
+            invalid_objects = constraints.get("invalid_objects", [])
+            template = constraints.get("object_template")
+            if invalid_objects and template and "{obj}" in template:
+                prefix, suffix = template.split("{obj}", 1)
+                sources.append(re.escape(prefix) + literal_alternation(invalid_objects) + re.escape(suffix))
+
+            self._constraints[word] = _combine(sources)
+            self._by_word[word] = _combine(sources + unnatural_sources)
+
+        self._korean_issues = _combine(rules.get("korean_formatting_issues", []))
+
+        logger.info(
+            f"Semantic rules loaded: {len(self._constraints)} verbs, "
+            f"{sum(len(c.get('invalid_objects', [])) for c in rules.get('verb_object_constraints', {}).values())} "
+            f"invalid objects, {len(unnatural_sources)} unnatural patterns"
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "SemanticValidator":
+        """
+        Load the rule tables from a JSON file.
+
+        A missing or unreadable file is logged and leaves the validator without
+        rules, so example generation keeps working.
+
+        Args:
+            path: Path to a JSON file in the data/semantic_rules.json layout
+
+        Returns:
+            SemanticValidator instance
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                rules = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load semantic rules from {path}: {str(e)}")
+            rules = {}
+        return cls(rules)
+
+    def has_semantic_violation(self, japanese_text: str, target_word: str) -> bool:
+        """Check if the sentence has semantic violations for the target word"""
+        pattern = self._constraints.get(target_word)
+        return pattern is not None and pattern.search(japanese_text) is not None
+
+    def has_unnatural_patterns(self, japanese_text: str) -> bool:
+        """Check for general unnatural patterns in Japanese text"""
+        return self._unnatural.search(japanese_text) is not None
+
+    def has_japanese_issues(self, japanese_text: str, target_word: str) -> bool:
+        """Semantic violations or unnatural patterns, checked with a single search"""
+        return self._by_word.get(target_word, self._unnatural).search(japanese_text) is not None
+
+    def has_korean_formatting_issues(self, korean_text: str) -> bool:
+        """Check for formatting issues in Korean translation"""
+        return self._korean_issues.search(korean_text) is not None
+
+    @staticmethod
+    def clean_korean_text(korean_text: str) -> str:
+        """Clean and normalize Korean text"""
+        # Remove multiple consecutive newlines
+        cleaned = _MULTIPLE_NEWLINES.sub('\n', korean_text)
+        # Remove any remaining Japanese characters
+        cleaned = _JAPANESE_CHARS.sub('', cleaned)
+        return cleaned.strip()
+
+    def is_valid_example(self, example: Dict[str, str], word: str) -> bool:
+        """
+        Validate a single example for basic requirements and semantic correctness
+
+        Args:
+            example: Dictionary containing 'japanese' and 'korean' keys
+            word: Target Japanese word
+
+        Returns:
+            bool: True if example passes all validation checks
+        """
+        japanese_text = example.get('japanese', '').strip()
+        korean_text = example.get('korean', '').strip()
+
+        # Basic validation: both texts must exist and have minimum length
+        if not japanese_text or not korean_text:
+            return False
+
+        if len(japanese_text) < 5 or len(korean_text) < 5:
+            return False
+
+        # Target word must be present in Japanese sentence
+        if word not in japanese_text:
+            return False
+
+        # Semantic violations and unnatural patterns
+        if self.has_japanese_issues(japanese_text, word):
+            return False
+
+        # Check Korean formatting issues
+        if self.has_korean_formatting_issues(korean_text):
+            return False
+
+        return True
+
+    def filter_examples(self, examples: List[Dict[str, str]], word: str) -> List[Dict[str, str]]:
+        """
+        Keep the valid examples, with their Korean text cleaned.
+
+        Args:
+            examples: List of example dictionaries generated by LLM
+            word: Target Japanese word
+
+        Returns:
+            Valid examples (possibly empty)
+        """
+        validated_examples = []
+        for example in examples:
+            if self.is_valid_example(example, word):
+                # Clean Korean text before adding to validated list
+                example['korean'] = self.clean_korean_text(example['korean'])
+                validated_examples.append(example)
+        return validated_examples
+
+
+def load_semantic_validator(path: Optional[str] = None) -> SemanticValidator:
+    """Build the validator from SemanticValidatorConfig.RULES_PATH (or ``path``)."""
+    return SemanticValidator.from_file(path or SemanticValidatorConfig.RULES_PATH)
+
+
+# 모듈 로드 시 한 번만 규칙을 읽고 컴파일
+semantic_validator = load_semantic_validator()
@@ -0,0 +1,251 @@
+import os
+import time
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from cache_store import BASE_DIR, SQLiteTTLCache
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 병합은 사용할 수 없음
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightConfig:
+    """동일 요청 병합(single-flight) 설정"""
+    ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+    # gunicorn 워커 등 여러 프로세스 사이에서도 병합 (파일 잠금 + 결과 공유 테이블)
+    CROSS_PROCESS = os.getenv("SINGLE_FLIGHT_CROSS_PROCESS", "false").lower() == "true"
+    LOCK_DIR = os.getenv("SINGLE_FLIGHT_LOCK_DIR", os.path.join(BASE_DIR, ".cache", "single_flight"))
+    LOCK_STRIPES = int(os.getenv("SINGLE_FLIGHT_LOCK_STRIPES", 1024))
+    RESULT_PATH = os.getenv("SINGLE_FLIGHT_RESULT_PATH", os.path.join(BASE_DIR, ".cache", "single_flight.sqlite3"))
+
+    # 다른 프로세스가 결과를 가져갈 수 있도록 보관하는 시간과 최대 항목 수
+    RESULT_TTL = int(os.getenv("SINGLE_FLIGHT_RESULT_TTL", 30))  # seconds
+    RESULT_MAX_ENTRIES = int(os.getenv("SINGLE_FLIGHT_RESULT_MAX_ENTRIES", 1000))
+
+    # 다른 프로세스의 생성을 기다리는 최대 시간 (초과 시 직접 생성)
+    WAIT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_WAIT_TIMEOUT", 120))
+    POLL_INTERVAL = 0.05  # seconds
+
+
+class FileLockStripes:
+    """
+    Non-blocking exclusive file locks shared by every process on the host.
+
+    Keys are hashed onto a fixed number of lock files, so the directory never
+    grows; two keys sharing a stripe only means one of them may wait for
+    the other and then generate on its own.
+    """
+
+    def __init__(self, directory: str, stripes: int):
+        self.directory = directory
+        self.stripes = max(1, stripes)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{int(digest[:8], 16) % self.stripes:04d}.lock")
+
+    def try_acquire(self, key: str) -> Optional[int]:
+        """Return a locked file descriptor, or None if another process holds the lock."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd = os.open(self._path(key), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return fd
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        except Exception:
+            os.close(fd)
+            raise
+
+    @staticmethod
+    def release(fd: int):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+
+    The first caller for a key (the leader) runs the work; callers that
+    arrive while it is in flight await the leader's result instead of
+    starting their own. Nothing is kept once the call finishes, so this is
+    not a cache: a later request generates again. All callers share the same
+    result object and must not mutate it.
+
+    With ``cross_process`` the leader also holds a file lock for the key and
+    publishes its result to a short-lived SQLite table. A leader in another
+    process that finds the lock taken waits for it and, if the result was
+    published meanwhile, returns it without generating.
+
+    Must be used from a single event loop per process (the shared background
+    loop); calls from another loop are not coalesced.
+    """
+
+    def __init__(
+            self,
+            cross_process: bool = False,
+            lock_dir: str = SingleFlightConfig.LOCK_DIR,
+            result_path: str = SingleFlightConfig.RESULT_PATH
+    ):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._leaders = 0
+        self._coalesced = 0
+        self._shared = 0
+
+        if cross_process and fcntl is None:
+            logger.warning("Cross-process single-flight needs fcntl; coalescing within the process only")
+            cross_process = False
+
+        self.cross_process = cross_process
+        self._locks = FileLockStripes(lock_dir, SingleFlightConfig.LOCK_STRIPES) if cross_process else None
+        self._results = SQLiteTTLCache(
+            result_path,
+            table="single_flight_results",
+            ttl=SingleFlightConfig.RESULT_TTL,
+            max_entries=SingleFlightConfig.RESULT_MAX_ENTRIES
+        ) if cross_process else None
+
+    @staticmethod
+    def make_key(*parts: Hashable) -> str:
+        """Stable string key for a tuple of request parameters."""
+        return json.dumps(parts, ensure_ascii=False, default=str)
+
+    def _count(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    async def run(self, key: str, work: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``work()`` once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the request (see make_key)
+            work: Coroutine function producing the result
+
+        Returns:
+            The result of the leader's call (its exception is raised for every caller)
+        """
+        if not SingleFlightConfig.ENABLED:
+            return await work()
+
+        if self._pid != os.getpid():
+            # fork 이후 부모 프로세스의 진행 중 목록은 의미 없음
+            self._inflight = {}
+            self._pid = os.getpid()
+
+        loop = asyncio.get_running_loop()
+        future = self._inflight.get(key)
+        if future is not None and future.get_loop() is loop:
+            self._count("_coalesced")
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # 리더가 취소된 경우 (예: 스트림 연결 종료) 직접 생성
+                return await work()
+
+        future = loop.create_future()
+        # 기다리는 호출이 없을 때 "exception was never retrieved" 경고 방지
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[key] = future
+        self._count("_leaders")
+
+        try:
+            result = await self._run_leader(key, work)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def _run_leader(self, key: str, work: Callable[[], Awaitable[Any]]) -> Any:
+        """Run the work, holding the cross-process lock for the key when enabled."""
+        if self._locks is None:
+            return await work()
+
+        fd, waited = await self._acquire_file_lock(key)
+        try:
+            if waited:
+                # 다른 프로세스가 같은 요청을 처리하는 동안 기다렸으면 그 결과 사용
+                shared = await self._results.get_async(key)
+                if shared is not None:
+                    self._count("_shared")
+                    return shared
+
+            result = await work()
+            if fd is not None:
+                await self._results.set_async(key, result)
+            return result
+        finally:
+            if fd is not None:
+                FileLockStripes.release(fd)
+
+    async def _acquire_file_lock(self, key: str) -> tuple:
+        """
+        Poll the key's file lock without blocking the event loop.
+
+        Returns:
+            (file descriptor or None if the wait timed out or locking failed,
+             whether another process held the lock)
+        """
+        deadline = time.monotonic() + SingleFlightConfig.WAIT_TIMEOUT
+        waited = False
+        while True:
+            try:
+                fd = self._locks.try_acquire(key)
+            except OSError as e:
+                logger.warning(f"Single-flight lock failed, generating without it: {e}")
+                return None, waited
+
+            if fd is not None:
+                return fd, waited
+
+            waited = True
+            if time.monotonic() >= deadline:
+                logger.warning("Timed out waiting for another process's generation, generating without the lock")
+                return None, waited
+            await asyncio.sleep(SingleFlightConfig.POLL_INTERVAL)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report how many calls ran and how many were served by another call.
+
+        Returns:
+            Dictionary with leaders, coalesced, shared_across_processes and in_flight
+        """
+        with self._lock:
+            return {
+                "enabled": SingleFlightConfig.ENABLED,
+                "cross_process": self.cross_process,
+                "leaders": self._leaders,
+                "coalesced": self._coalesced,
+                "shared_across_processes": self._shared,
+                "in_flight": len(self._inflight)
+            }
+
+
+# /api/generate, /api/homonym (및 배치) 요청 병합용 공용 인스턴스
+request_flights = SingleFlight(cross_process=SingleFlightConfig.CROSS_PROCESS)
@@ -0,0 +1,212 @@
+import re
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson은 선택 의존성 (없으면 표준 json 사용)
+    orjson = None
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+
+def _generation_config_fields() -> set:
+    """Fields accepted by the installed SDK's GenerationConfig."""
+    try:
+        from google.ai import generativelanguage as glm
+        return set(glm.GenerationConfig.meta.fields)
+    except Exception:
+        return set()
+
+
+# 설치된 SDK가 JSON 응답 모드를 지원하는지 (지원하지 않으면 프롬프트의 스키마만 사용)
+SUPPORTS_JSON_MIME_TYPE = "response_mime_type" in _generation_config_fields()
+
+
+def example_list_schema(fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    JSON schema for {"examples": [{field: string, ...}, ...]}.
+
+    Args:
+        fields: Required string fields of each example, in output order
+
+    Returns:
+        JSON schema dictionary
+    """
+    return {
+        "type": "object",
+        "properties": {
+            "examples": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {field: {"type": "string"} for field in fields},
+                    "required": list(fields)
+                }
+            }
+        },
+        "required": ["examples"]
+    }
+
+
+# 일반 예문 (example_generator)
+EXAMPLES_SCHEMA = example_list_schema(["context", "japanese", "korean"])
+
+# 동음이의어 의미별 예문 (homonym_processor)
+HOMONYM_EXAMPLES_SCHEMA = example_list_schema(["context", "japanese", "korean", "explanation"])
+
+# 동음이의어 통합 프롬프트: 한자별 섹션
+COMBINED_HOMONYM_EXAMPLES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "sections": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "kanji": {"type": "string"},
+                    "examples": HOMONYM_EXAMPLES_SCHEMA["properties"]["examples"]
+                },
+                "required": ["kanji", "examples"]
+            }
+        }
+    },
+    "required": ["sections"]
+}
+
+# 동음이의어 의미 검색 (_find_from_llm)
+HOMONYM_MEANINGS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "homonyms_found": {"type": "boolean"},
+        "meanings": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "kanji": {"type": "string"},
+                    "pos": {"type": "string"},
+                    "meaning": {"type": "string"},
+                    "contexts": {"type": "array", "items": {"type": "string"}}
+                },
+                "required": ["kanji", "pos", "meaning"]
+            }
+        }
+    },
+    "required": ["homonyms_found", "meanings"]
+}
+
+JSON_OUTPUT_MARKER = "Return ONLY one JSON object"
+
+_OUTPUT_FORMAT_SECTION = re.compile(r'^[ \t]*## Output Format.*?(?=^[ \t]*## |\Z)', re.MULTILINE | re.DOTALL)
+
+
+def json_output_instruction(schema: Dict[str, Any]) -> str:
+    """Prompt section asking for a single JSON object matching ``schema``."""
+    return (
+        "## Output Format\n"
+        f"{JSON_OUTPUT_MARKER} (no markdown fences, no text before or after it) "
+        "that matches this JSON schema:\n"
+        f"{json.dumps(schema, ensure_ascii=False)}\n\n"
+    )
+
+
+def with_json_output(prompt: str, schema: Dict[str, Any]) -> str:
+    """
+    Replace the free-text "## Output Format" section of a prompt with a JSON schema.
+
+    Args:
+        prompt: Prompt built for the free-text format
+        schema: JSON schema the answer must follow
+
+    Returns:
+        Prompt asking for JSON output (the section is appended if the prompt has none)
+    """
+    instruction = json_output_instruction(schema)
+    if _OUTPUT_FORMAT_SECTION.search(prompt):
+        return _OUTPUT_FORMAT_SECTION.sub(lambda _: instruction, prompt, count=1)
+    return f"{prompt}\n\n{instruction}".strip()
+
+
+def json_generation_config(generation_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add the SDK's JSON response mode to a generation config when it is available.
+
+    Args:
+        generation_config: Generation parameters for a free-text call
+
+    Returns:
+        Generation parameters for a JSON call
+    """
+    if SUPPORTS_JSON_MIME_TYPE:
+        return {**generation_config, "response_mime_type": "application/json"}
+    return dict(generation_config)
+
+
+def loads_json(text: Optional[str]) -> Optional[Any]:
+    """
+    Decode a JSON answer, tolerating markdown fences and surrounding text.
+
+    Args:
+        text: Raw model answer
+
+    Returns:
+        Decoded JSON value, or None if no JSON could be decoded
+    """
+    if not text:
+        return None
+
+    text = text.strip()
+    if text.startswith("```"):
+        # ```json ... ``` 펜스 제거
+        newline = text.find("\n")
+        text = text[newline + 1:] if newline >= 0 else ""
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+
+    try:
+        return _loads(text)
+    except ValueError:
+        pass
+
+    # 앞뒤에 설명이 붙은 경우 첫 '{'부터 마지막 '}'까지만 디코딩
+    start, end = text.find("{"), text.rfind("}")
+    if 0 <= start < end:
+        try:
+            return _loads(text[start:end + 1])
+        except ValueError:
+            pass
+
+    logger.debug("Structured output could not be decoded as JSON")
+    return None
+
+
+def extract_examples(data: Any, fields: Sequence[str], key: str = "examples") -> Optional[List[Dict[str, str]]]:
+    """
+    Read a list of example objects from decoded JSON.
+
+    Args:
+        data: Decoded JSON ({key: [...]} or a bare list)
+        fields: Fields to copy from each example (missing ones become "")
+        key: Name of the list in an object answer
+
+    Returns:
+        List of example dictionaries with string values, or None if the
+        JSON does not have the expected shape
+    """
+    items = data.get(key) if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return None
+
+    examples = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        examples.append({
+            field: item[field].strip() if isinstance(item.get(field), str) else ""
+            for field in fields
+        })
+    return examples
@@ -0,0 +1,201 @@
+import os
+import re
+import time
+import json
+import asyncio
+from typing import Any, Optional
+
+from structured_output import JSON_OUTPUT_MARKER
+
+
+class StubLLMConfig:
+    """스텁 LLM 백엔드 설정 (벤치마크/부하 테스트용)"""
+    # "gemini" (기본값) 또는 "stub"
+    LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+    ENABLED = LLM_BACKEND == "stub"
+
+    # 실제 API 호출 시간을 흉내내는 응답 지연 (초)
+    LATENCY = float(os.getenv("STUB_LLM_LATENCY", 0.5))
+
+
+class StubPart:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubContent:
+    def __init__(self, text: str):
+        self.parts = [StubPart(text)]
+
+
+class StubCandidate:
+    def __init__(self, text: str):
+        self.finish_reason = 1  # STOP
+        self.content = StubContent(text)
+
+
+class StubResponse:
+    """Minimal stand-in for a GenerateContentResponse with one finished candidate."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.candidates = [StubCandidate(text)]
+
+
+def _homonym_examples(kanji: str, count: int = 3) -> list:
+    return [
+        {
+            "context": f"Stub example {number} for {kanji}.",
+            "japanese": f"今日は「{kanji}」を使った練習用の例文その{number}です。",
+            "korean": f"오늘은 연습용 예문 {number}번입니다.",
+            "explanation": "스텁 응답입니다."
+        }
+        for number in range(1, count + 1)
+    ]
+
+
+def _word_examples(word: str, count: int) -> list:
+    return [
+        {
+            "context": f"Stub example {number} for {word}.",
+            "japanese": f"先生は授業で「{word}」という言葉を例{number}として説明しました。",
+            "korean": f"선생님은 수업에서 그 단어를 예시 {number}번으로 설명했습니다."
+        }
+        for number in range(1, count + 1)
+    ]
+
+
+def _format_examples(examples: list) -> str:
+    """Render examples in the numbered "Context: / Japanese: / Korean:" text format."""
+    return "\n\n".join(
+        f"{number}. " + "\n".join(f"{field.capitalize()}: {value}" for field, value in example.items())
+        for number, example in enumerate(examples, start=1)
+    )
+
+
+def _format_json(data: dict) -> str:
+    # 실제 모델처럼 ```json 펜스로 감싸서 응답
+    return f"```json\n{json.dumps(data, ensure_ascii=False, indent=2)}\n```"
+
+
+def build_stub_response(prompt: str) -> str:
+    """
+    Build a well-formed canned answer for one of the application's prompts.
+
+    Prompts that ask for structured output (see structured_output.py) are
+    answered with JSON, all others in the labelled text format.
+
+    Args:
+        prompt: Prompt text sent to the model
+
+    Returns:
+        Response text in the format the prompt asks for
+    """
+    json_output = JSON_OUTPUT_MARKER in prompt
+
+    combined = re.search(r'Provide one "Kanji:" section for each of: (.+)', prompt)
+    if combined:
+        kanji_list = [kanji for kanji in (part.strip() for part in combined.group(1).split(",")) if kanji]
+        if json_output:
+            return _format_json({
+                "sections": [{"kanji": kanji, "examples": _homonym_examples(kanji)} for kanji in kanji_list]
+            })
+        return "\n\n".join(
+            f"Kanji: {kanji}\n{_format_examples(_homonym_examples(kanji))}"
+            for kanji in kanji_list
+        )
+
+    target_kanji = re.search(r'Target Kanji: (\S+)', prompt)
+    if target_kanji:
+        examples = _homonym_examples(target_kanji.group(1))
+        return _format_json({"examples": examples}) if json_output else _format_examples(examples)
+
+    if re.search(r'Find Japanese homonyms for:', prompt):
+        return json.dumps({"homonyms_found": False, "meanings": []})
+
+    word_examples = re.search(r'Generate EXACTLY (\d+) example sentences using the word "(.+?)"', prompt)
+    if word_examples:
+        examples = _word_examples(word_examples.group(2), int(word_examples.group(1)))
+        return _format_json({"examples": examples}) if json_output else _format_examples(examples)
+
+    target_word = re.search(r'## Target Word\s*"(.+?)"', prompt)
+    if target_word:
+        word = target_word.group(1)
+        return "\n\n".join(
+            f"{number}. Japanese: 先生は授業で「{word}」という言葉を例{number}として説明しました。\n"
+            f"Korean: 선생님은 수업에서 그 단어를 예시 {number}번으로 설명했습니다.\n"
+            f"Explanation: 스텁 응답입니다."
+            for number in range(1, 6)
+        )
+
+    return "OK"
+
+
+class StubStreamResponse:
+    """
+    Async-iterable stand-in for a streamed response.
+
+    The canned answer is split into line chunks; the first chunk arrives after
+    a fifth of the latency and the rest are spread over the remainder.
+    """
+
+    def __init__(self, model: "StubGenerativeModel", text: str):
+        self._model = model
+        self._chunks = text.splitlines(keepends=True) or [text]
+
+    async def __aiter__(self):
+        delay = self._model.latency
+        first_delay = delay * 0.2
+        chunk_delay = (delay - first_delay) / max(1, len(self._chunks) - 1)
+
+        for index, chunk in enumerate(self._chunks):
+            wait = first_delay if index == 0 else chunk_delay
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._model.streamed_chunks += 1
+            yield StubResponse(chunk)
+
+
+class StubGenerativeModel:
+    """
+    Drop-in replacement for genai.GenerativeModel that never leaves the process.
+
+    Answers every prompt with a canned, parsable response after a fixed delay,
+    so the serving stack can be load-tested without API keys or quota.
+    Enabled with LLM_BACKEND=stub.
+    """
+
+    def __init__(self, model_name: str, safety_settings: Any = None, latency: Optional[float] = None):
+        self.model_name = model_name
+        self.safety_settings = safety_settings
+        self.latency = StubLLMConfig.LATENCY if latency is None else latency
+        self.calls = 0
+        self.streamed_chunks = 0
+
+    def generate_content(self, prompt: Any, generation_config: Any = None, **kwargs) -> StubResponse:
+        self.calls += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+        return StubResponse(build_stub_response(_prompt_text(prompt)))
+
+    async def generate_content_async(
+            self,
+            prompt: Any,
+            generation_config: Any = None,
+            stream: bool = False,
+            **kwargs
+    ):
+        self.calls += 1
+        if stream:
+            return StubStreamResponse(self, build_stub_response(_prompt_text(prompt)))
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        return StubResponse(build_stub_response(_prompt_text(prompt)))
+
+
+def _prompt_text(prompt: Any) -> str:
+    if isinstance(prompt, str):
+        return prompt
+    if isinstance(prompt, (list, tuple)):
+        return "\n".join(str(part) for part in prompt)
+    return str(prompt)